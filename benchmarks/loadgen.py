@@ -0,0 +1,147 @@
+"""
+Load generator for server.py.
+
+Opens ``--connections`` connections that each keep up to ``--pipeline``
+requests in flight, sends ``--requests`` encrypt requests spread over
+``--keys`` distinct keys, and reports throughput and latency percentiles.
+
+Usage:
+    python server.py --port 8765 &
+    python benchmarks/loadgen.py --port 8765 --requests 20000 --connections 8 --pipeline 32
+    python benchmarks/loadgen.py --unix /tmp/ciphers.sock --cipher hill --key HILL --size 10KB
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.suite import make_text, parse_size
+
+def percentile(values, fraction: float) -> float:
+    """Nearest-rank percentile of a sorted list."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+def request_keys(cipher: str, key: str, count: int):
+    """Distinct keys for the requests; variants of ``key`` for the alphabetic ciphers."""
+    if count == 1:
+        return [key]
+    if cipher == 'caesar':
+        return [str(i % 25 + 1) for i in range(count)]
+    return [key + ''.join(chr(ord('a') + d) for d in _digits(i)) for i in range(count)]
+
+def _digits(i: int):
+    digits = []
+    while True:
+        i, d = divmod(i, 26)
+        digits.append(d)
+        if i == 0:
+            return digits
+
+async def _connection(open_connection, requests, pipeline, latencies, errors):
+    reader, writer = await open_connection()
+    sent = {}
+    answered = 0
+    window = asyncio.Semaphore(pipeline)
+
+    async def receive():
+        nonlocal answered
+        for _ in requests:
+            line = await reader.readline()
+            if not line:
+                return
+            response = json.loads(line)
+            latencies.append(time.perf_counter() - sent.pop(response['id']))
+            answered += 1
+            if 'error' in response:
+                errors.append(response['error'])
+            window.release()
+
+    receiver = asyncio.create_task(receive())
+    try:
+        for request in requests:
+            acquire = asyncio.create_task(window.acquire())
+            await asyncio.wait({acquire, receiver}, return_when=asyncio.FIRST_COMPLETED)
+            if not acquire.done():
+                acquire.cancel()
+                break  # The server closed the connection.
+            sent[request['id']] = time.perf_counter()
+            writer.write(json.dumps(request).encode('utf-8') + b'\n')
+            await writer.drain()
+        await receiver
+    except ConnectionError:
+        receiver.cancel()
+    finally:
+        writer.close()
+    errors.extend(["Connection closed before a response."] * (len(requests) - answered))
+
+async def run_load(open_connection, cipher='caesar', key='3', mode='encrypt', requests=10000, connections=4,
+                   pipeline=16, keys=1, size=100):
+    """
+    Send a load of requests and measure it.
+
+    Args:
+        open_connection: Coroutine function returning (reader, writer).
+        cipher, key, mode (str): What every request asks for.
+        requests (int): Total requests.
+        connections (int): Concurrent connections.
+        pipeline (int): Requests in flight per connection.
+        keys (int): Distinct keys cycled through.
+        size (int): Characters of text per request.
+    Returns:
+        dict: requests, errors, seconds, requests_per_s, p50_ms, p99_ms, max_ms.
+    """
+    text = make_text(size)
+    key_cycle = itertools.cycle(request_keys(cipher, key, keys))
+    all_requests = [{'id': i, 'cipher': cipher, 'mode': mode, 'key': next(key_cycle), 'text': text}
+                    for i in range(requests)]
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(_connection(open_connection, all_requests[c::connections], pipeline, latencies, errors)
+                           for c in range(connections)))
+    seconds = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'seconds': seconds,
+        'requests_per_s': len(latencies) / max(seconds, 1e-9),
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'max_ms': (latencies[-1] if latencies else 0.0) * 1000,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load generator for server.py')
+    parser.add_argument('--host', default='127.0.0.1', help='Server address (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='Server port (default: 8765)')
+    parser.add_argument('--unix', help='Connect to this Unix socket instead of TCP')
+    parser.add_argument('--cipher', default='caesar', help='Cipher to request (default: caesar)')
+    parser.add_argument('--key', default='3', help='Key, or the base of the keys with --keys (default: 3)')
+    parser.add_argument('--mode', choices=['encrypt', 'decrypt'], default='encrypt', help='Mode (default: encrypt)')
+    parser.add_argument('--requests', type=int, default=10000, help='Total requests (default: 10000)')
+    parser.add_argument('--connections', type=int, default=4, help='Concurrent connections (default: 4)')
+    parser.add_argument('--pipeline', type=int, default=16, help='Requests in flight per connection (default: 16)')
+    parser.add_argument('--keys', type=int, default=1, help='Distinct keys cycled through (default: 1)')
+    parser.add_argument('--size', default='100', help='Text size per request, e.g. 100 or 10KB (default: 100)')
+    args = parser.parse_args(argv)
+
+    if args.unix:
+        open_connection = lambda: asyncio.open_unix_connection(args.unix)
+    else:
+        open_connection = lambda: asyncio.open_connection(args.host, args.port)
+    result = asyncio.run(run_load(open_connection, args.cipher, args.key, args.mode, args.requests,
+                                  args.connections, args.pipeline, args.keys, parse_size(args.size)))
+    print(f"{result['requests']} requests ({result['errors']} errors) in {result['seconds']:.2f} s: "
+          f"{result['requests_per_s']:.0f} req/s, p50 {result['p50_ms']:.2f} ms, "
+          f"p99 {result['p99_ms']:.2f} ms, max {result['max_ms']:.2f} ms")
+    return 1 if result['errors'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
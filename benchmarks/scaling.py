@@ -0,0 +1,52 @@
+"""
+Scaling benchmark for the translation-table ciphers.
+
+Encrypts inputs from 1 KB up to 100 MB with the Caesar and Substitution
+ciphers and reports time per byte, which stays flat when the cost is linear.
+
+Usage:
+    python benchmarks/scaling.py [--max-size BYTES] [--repeat N]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ciphers.caesar import CaesarCipher
+from ciphers.substitution import SubstitutionCipher
+
+SAMPLE = 'The quick brown fox jumps over the lazy dog, 1234567890! '
+SIZES = [1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000]
+CASES = [
+    ('caesar', CaesarCipher(), '3'),
+    ('substitution', SubstitutionCipher(), 'QWERTYUIOPASDFGHJKLZXCVBNM'),
+]
+
+def make_text(size):
+    return (SAMPLE * (size // len(SAMPLE) + 1))[:size]
+
+def best_time(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description='Caesar/Substitution scaling benchmark')
+    parser.add_argument('--max-size', type=int, default=SIZES[-1], help='Largest input size in bytes')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (best is reported)')
+    args = parser.parse_args()
+
+    print(f"{'cipher':<14}{'size':>12}{'seconds':>12}{'ns/byte':>10}{'MB/s':>10}")
+    for size in [s for s in SIZES if s <= args.max_size]:
+        text = make_text(size)
+        for name, cipher, key in CASES:
+            elapsed = best_time(lambda: cipher.encrypt(text, key), args.repeat)
+            print(f"{name:<14}{size:>12}{elapsed:>12.4f}{elapsed / size * 1e9:>10.2f}{size / elapsed / 1e6:>10.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Startup benchmark for the command line.
+
+Runs one-line ``cli.py`` invocations in fresh interpreters, reporting the
+wall time of each and the heavy modules (NumPy, multiprocessing) it
+imported, as seen by ``python -X importtime``. A Caesar invocation should
+not import NumPy; the exit status is 1 if it does.
+
+Usage:
+    python benchmarks/startup.py [--repeat N]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLI = os.path.join(ROOT, 'cli.py')
+HEAVY_MODULES = ('numpy', 'concurrent.futures.process')
+CASES = [
+    ('python', [sys.executable, '-c', 'pass']),
+    ('caesar', [sys.executable, CLI, 'caesar', 'encrypt', 'Hello', '3']),
+    ('substitution', [sys.executable, CLI, 'substitution', 'encrypt', 'Hello', 'QWERTYUIOPASDFGHJKLZXCVBNM']),
+    ('vigenere', [sys.executable, CLI, 'vigenere', 'encrypt', 'Hello', 'key']),
+    ('hill', [sys.executable, CLI, 'hill', 'encrypt', 'HELP', 'HILL']),
+]
+
+def imported_modules(command):
+    """
+    Run a command under ``-X importtime`` and collect what it imported.
+
+    Returns:
+        dict: Module name -> cumulative import time in microseconds.
+    """
+    result = subprocess.run([command[0], '-X', 'importtime'] + command[1:], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if parts[1].strip().isdigit():
+            modules[parts[2].strip()] = int(parts[1])
+    return modules
+
+def wall_time(command, repeat: int) -> float:
+    """Best wall time in seconds of running the command ``repeat`` times."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def run(repeat, out=sys.stdout):
+    """
+    Time every case and report the heavy modules it imported.
+
+    Returns:
+        dict: Case name -> {'seconds': float, 'heavy': list[str]}.
+    """
+    results = {}
+    print(f"{'case':<14}{'ms':>8}  heavy imports", file=out)
+    for name, command in CASES:
+        modules = imported_modules(command)
+        heavy = [m for m in HEAVY_MODULES if m in modules]
+        results[name] = {'seconds': wall_time(command, repeat), 'heavy': heavy}
+        print(f"{name:<14}{results[name]['seconds'] * 1000:>8.1f}  {', '.join(heavy) or '-'}", file=out)
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='CLI startup benchmark')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per case; the best is kept (default: 5)')
+    args = parser.parse_args(argv)
+    results = run(args.repeat)
+    if 'numpy' in results['caesar']['heavy']:
+        print("REGRESSION caesar: cli.py imports NumPy", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
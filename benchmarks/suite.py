@@ -0,0 +1,178 @@
+"""
+Benchmark suite with regression baselines for all ciphers.
+
+Runs every cipher in both modes over a range of input sizes and key
+variations (Hill n=2..10, several Vigenère key lengths), reporting throughput
+in MB/s and peak memory. Results can be saved as a JSON baseline, and later
+runs fail (exit status 1) when a case is more than ``--max-regression``
+percent slower than its baseline.
+
+Usage:
+    python benchmarks/suite.py --save-baseline benchmarks/baseline.json
+    python benchmarks/suite.py --baseline benchmarks/baseline.json --max-regression 15
+    python benchmarks/suite.py --ciphers hill --max-size 100MB
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ciphers.caesar import CaesarCipher
+from ciphers.hill import HillCipher
+from ciphers.playfair import PlayfairCipher
+from ciphers.substitution import SubstitutionCipher
+from ciphers.vigenere import VigenereCipher
+from ciphers import InvalidKeyError
+
+SAMPLE = 'The quick brown fox jumps over the lazy dog; balloons, 1234567890! '
+SIZES = [100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000]
+UNITS = {'B': 1, 'KB': 1_000, 'MB': 1_000_000, 'GB': 1_000_000_000}
+
+def parse_size(value: str) -> int:
+    """Parse sizes such as '100', '10KB' or '1MB' into bytes."""
+    value = value.strip().upper()
+    for unit in sorted(UNITS, key=len, reverse=True):
+        if value.endswith(unit):
+            return int(float(value[:-len(unit)]) * UNITS[unit])
+    return int(value)
+
+def hill_key(n: int, seed: int = 0) -> str:
+    """Return a deterministic invertible n x n Hill key."""
+    rng = random.Random(seed * 1000 + n)
+    cipher = HillCipher()
+    while True:
+        key = ''.join(rng.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ') for _ in range(n * n))
+        try:
+            cipher.compile(key)
+            return key
+        except InvalidKeyError:
+            continue
+
+def vigenere_key(length: int) -> str:
+    return ('lemonbananacherry' * (length // 17 + 1))[:length]
+
+def cases():
+    """
+    Yield (cipher name, variant, cipher, key) for every benchmark case.
+    """
+    yield 'caesar', 'shift3', CaesarCipher(), '3'
+    yield 'substitution', 'qwerty', SubstitutionCipher(), 'QWERTYUIOPASDFGHJKLZXCVBNM'
+    for length in (1, 5, 26, 100):
+        yield 'vigenere', f'key{length}', VigenereCipher(), vigenere_key(length)
+    yield 'playfair', 'keyword', PlayfairCipher(), 'keyword'
+    for n in range(2, 11):
+        yield 'hill', f'n{n}', HillCipher(), hill_key(n)
+
+def make_text(size: int) -> str:
+    return (SAMPLE * (size // len(SAMPLE) + 1))[:size]
+
+def measure(func, repeat: int):
+    """
+    Time a callable and measure its peak traced memory.
+
+    Returns:
+        tuple: (best seconds over ``repeat`` runs, peak bytes of one traced run).
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+def run(selected, sizes, repeat, out=sys.stdout):
+    """
+    Run the selected benchmark cases.
+
+    Args:
+        selected (set[str] or None): Cipher names to run, None for all.
+        sizes (list[int]): Input sizes in bytes.
+        repeat (int): Timed runs per case.
+        out: Stream for the progress table.
+    Returns:
+        dict: Case id -> {'mb_per_s': float, 'peak_bytes': int}.
+    """
+    results = {}
+    print(f"{'case':<34}{'MB/s':>10}{'peak MB':>10}", file=out)
+    for size in sizes:
+        plaintext = make_text(size)
+        for name, variant, cipher, key in cases():
+            if selected and name not in selected:
+                continue
+            compiled = cipher.compile(key)
+            ciphertext = compiled.encrypt(plaintext)
+            for mode, func, text in (('encrypt', compiled.encrypt, plaintext),
+                                     ('decrypt', compiled.decrypt, ciphertext)):
+                seconds, peak = measure(lambda: func(text), repeat)
+                case_id = f'{name}/{mode}/{variant}/{size}'
+                results[case_id] = {'mb_per_s': size / max(seconds, 1e-9) / 1e6, 'peak_bytes': peak}
+                print(f"{case_id:<34}{results[case_id]['mb_per_s']:>10.1f}{peak / 1e6:>10.1f}", file=out)
+    return results
+
+def compare(results, baseline, max_regression):
+    """
+    Compare results against a baseline.
+
+    Args:
+        results (dict): Output of ``run``.
+        baseline (dict): Previously saved results.
+        max_regression (float): Allowed slowdown in percent.
+    Returns:
+        list[str]: One message per case that regressed beyond the threshold.
+    """
+    failures = []
+    for case_id, result in results.items():
+        reference = baseline.get(case_id)
+        if reference is None:
+            continue
+        floor = reference['mb_per_s'] * (1 - max_regression / 100)
+        if result['mb_per_s'] < floor:
+            slowdown = 100 * (1 - result['mb_per_s'] / reference['mb_per_s'])
+            failures.append(f"{case_id}: {result['mb_per_s']:.1f} MB/s is {slowdown:.0f}% slower "
+                            f"than baseline {reference['mb_per_s']:.1f} MB/s")
+    return failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Cipher benchmark suite')
+    parser.add_argument('--ciphers', nargs='+', help='Cipher names to run (default: all)')
+    parser.add_argument('--min-size', default='100', help='Smallest input size (default: 100)')
+    parser.add_argument('--max-size', default='1MB', help='Largest input size, up to 100MB (default: 1MB)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per case; the best is kept (default: 3)')
+    parser.add_argument('--baseline', help='Baseline JSON file to compare against')
+    parser.add_argument('--save-baseline', help='Write results to this JSON file')
+    parser.add_argument('--max-regression', type=float, default=20.0,
+                        help='Allowed slowdown against the baseline in percent (default: 20)')
+    args = parser.parse_args(argv)
+
+    low, high = parse_size(args.min_size), parse_size(args.max_size)
+    sizes = [s for s in SIZES if low <= s <= high]
+    results = run(set(args.ciphers) if args.ciphers else None, sizes, args.repeat)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.save_baseline}")
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        failures = compare(results, baseline, args.max_regression)
+        for message in failures:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        if failures:
+            return 1
+        print(f"No case more than {args.max_regression:g}% slower than baseline.")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
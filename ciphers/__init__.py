@@ -7,4 +7,8 @@ class InvalidTextError(Exception):
     pass
 
 def preserve_case(char: str, result: str) -> str:
-    return result.upper() if char.isupper() else result.lower() 
\ No newline at end of file
+    return result.upper() if char.isupper() else result.lower() 
+
+from .keycache import key_cache_info, set_key_cache_size, clear_key_cache
+from .registry import get_cipher, available_ciphers
+from .textform import NormalizedText
@@ -0,0 +1,9 @@
+"""Cryptanalysis tools for the classical ciphers."""
+
+from .scoring import Candidate, ENGLISH_FREQUENCIES, load_quadgrams
+from .caesar import crack_caesar
+from .vigenere import crack_vigenere, key_length_scores
+from .substitution import crack_substitution
+from .hill import crack_hill, crack_hill_known_plaintext
+from .playfair import crack_playfair
+from ..cracking import CRACKERS, crack_texts
@@ -0,0 +1,30 @@
+from ..caesar import CaesarCipher
+from .scoring import Candidate, letter_histograms, shift_scores, rank_shifts
+
+def crack_caesar(messages, top=3, method='chi2'):
+    """
+    Break a batch of Caesar ciphertexts by scoring all 26 shifts at once.
+
+    Letter histograms of all messages are built with one bincount and scored
+    against English as a single (messages x shifts) array operation.
+
+    Args:
+        messages (list[str, bytes or NormalizedText]): Ciphertexts.
+        top (int): Number of candidates to return per message.
+        method (str): 'chi2' (lower score is better) or 'loglik' (higher is better).
+    Returns:
+        list[list[Candidate]]: Ranked candidates for each message; ``key`` is
+            the shift as a string, usable with ``CaesarCipher.decrypt``.
+    """
+    messages = list(messages)
+    if not messages:
+        return []
+    top = max(1, min(top, 26))
+    scores = shift_scores(letter_histograms(messages), method)
+    best = rank_shifts(scores, method, top)
+    cipher = CaesarCipher()
+    results = []
+    for row, message in enumerate(messages):
+        results.append([Candidate(str(shift), float(scores[row, shift]), cipher.decrypt(message, str(shift)))
+                        for shift in best[row]])
+    return results
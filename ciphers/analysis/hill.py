@@ -0,0 +1,299 @@
+from .. import InvalidTextError
+from ..hill import HillCipher, _inverse_mod26, _letters
+from .scoring import Candidate, frequency_scores, quadgram_scores
+from numpy.lib.stride_tricks import sliding_window_view
+import itertools
+import string
+import numpy as np
+
+# Ciphertext letters analysed by the ciphertext-only search.
+MAX_LETTERS = 3000
+# Best rows per block size combined into full decryption matrices.
+_ROWS_KEPT = {2: 20, 3: 12}
+# Candidate rows multiplied at once; bounds the (rows, blocks) temporary.
+_ROWS_PER_CHUNK = 4096
+# Keys consistent with one crib alignment beyond which the crib is too short.
+_MAX_SOLUTIONS = 64
+
+def _blocks(text, n: int):
+    """
+    Split the letters of a ciphertext into n-letter blocks.
+
+    Raises:
+        InvalidTextError: If the letter count is not a multiple of n.
+    """
+    letters = _letters(text)
+    if len(letters) % n:
+        raise InvalidTextError(f"Ciphertext length {len(letters)} is not a multiple of the block size {n}.")
+    return letters.reshape(-1, n).astype(np.int64)
+
+def _key_string(matrix) -> str:
+    return ''.join(string.ascii_uppercase[v] for v in np.asarray(matrix).ravel())
+
+def _full_rank(matrices, p: int):
+    """Mask of the (k, n, n) matrices that are invertible modulo a prime, by batched elimination."""
+    a = np.asarray(matrices, dtype=np.int64) % p
+    k, n, _ = a.shape
+    inverses = np.array([pow(v, -1, p) if v else 0 for v in range(p)], dtype=np.int64)
+    index = np.arange(k)
+    keep = np.ones(k, dtype=bool)
+    for col in range(n):
+        nonzero = a[:, col:, col] != 0
+        keep &= nonzero.any(axis=1)
+        pivot = col + nonzero.argmax(axis=1)
+        a[index, col], a[index, pivot] = a[index, pivot], a[index, col].copy()
+        a[:, col] = a[:, col] * inverses[a[:, col, col]][:, None] % p
+        factors = a[:, :, col].copy()
+        factors[:, col] = 0
+        a = (a - factors[:, :, None] * a[:, None, col]) % p
+    return keep
+
+def _invertible(matrices):
+    """Mask of the (k, n, n) matrices that are invertible modulo 26, that is modulo 2 and modulo 13."""
+    return _full_rank(matrices, 2) & _full_rank(matrices, 13)
+
+def _rank(keys, ciphertext, top):
+    """Score each key by the quadgrams of its decryption and keep the best."""
+    cipher = HillCipher()
+    scored = []
+    for key in dict.fromkeys(keys):
+        plaintext = cipher.decrypt(ciphertext, key)
+        scored.append((float(quadgram_scores(_letters(plaintext)[:MAX_LETTERS])), key, plaintext))
+    scored.sort(key=lambda item: -item[0])
+    return [Candidate(key, score, plaintext) for score, key, plaintext in scored[:top]]
+
+def _row_reduce(matrix, p: int):
+    """
+    Gauss-Jordan elimination modulo a prime, recording the row operations.
+
+    Args:
+        matrix (numpy.ndarray): k x n integer matrix.
+        p (int): Prime modulus.
+    Returns:
+        tuple: (reduced, transform, pivots) with ``transform @ matrix == reduced``
+            (mod p) and ``pivots`` the pivot columns of the reduced rows.
+    """
+    k, n = matrix.shape
+    aug = np.concatenate([matrix % p, np.eye(k, dtype=np.int64)], axis=1)
+    pivots = []
+    for col in range(n):
+        row = len(pivots)
+        candidates = np.flatnonzero(aug[row:, col]) + row
+        if len(candidates) == 0:
+            continue
+        aug[[row, candidates[0]]] = aug[[candidates[0], row]]
+        aug[row] = aug[row] * pow(int(aug[row, col]), -1, p) % p
+        factors = aug[:, col].copy()
+        factors[row] = 0
+        aug = (aug - np.outer(factors, aug[row])) % p
+        pivots.append(col)
+    return aug[:, :n], aug[:, n:], pivots
+
+class _CribSystem:
+    """The crib blocks of one alignment phase, row-reduced modulo a prime."""
+
+    def __init__(self, plain, p: int):
+        self.p = p
+        self.n = plain.shape[1]
+        self.reduced, self.transform, self.pivots = _row_reduce(plain, p)
+        self.free = [c for c in range(self.n) if c not in self.pivots]
+
+    @property
+    def count(self) -> int:
+        """Number of solutions of a consistent system."""
+        return self.p ** (len(self.free) * self.n)
+
+    def consistent(self, windows):
+        """Mask of the (batch, k, n) cipher windows for which ``plain @ X == window`` is solvable."""
+        rhs = (self.transform @ windows) % self.p
+        return (rhs[:, len(self.pivots):, :] == 0).all(axis=(1, 2))
+
+    def solutions(self, windows):
+        """
+        Solve ``plain @ X == window`` modulo p for consistent windows.
+
+        Returns:
+            numpy.ndarray: (batch, count, n, n) every solution X per window.
+        """
+        n, p, rank = self.n, self.p, len(self.pivots)
+        rhs = (self.transform @ windows) % p
+        particular = np.zeros((len(windows), n, n), dtype=np.int64)
+        particular[:, self.pivots, :] = rhs[:, :rank, :]
+        # Null space basis: one vector per free column.
+        null = np.zeros((n, len(self.free)), dtype=np.int64)
+        for j, f in enumerate(self.free):
+            null[f, j] = 1
+            null[self.pivots, j] = -self.reduced[:rank, f] % p
+        choices = np.array(list(itertools.product(range(p), repeat=len(self.free) * n)), dtype=np.int64)
+        offsets = null @ choices.reshape(len(choices), len(self.free), n)
+        return (particular[:, None] + offsets[None]) % p
+
+def known_plaintext_keys(ciphertext, crib, n: int):
+    """
+    Solve for every n x n key consistent with a crib at some position.
+
+    For each alignment phase of the crib, its blocks are row-reduced modulo
+    2 and modulo 13 once; the cipher blocks at every position with that
+    phase are then checked and solved as one batched product, the solutions
+    combined with the Chinese remainder theorem and kept if the key is
+    invertible.
+
+    Args:
+        ciphertext (str or bytes-like): Hill ciphertext.
+        crib (str): Plaintext known to occur in the message; non-letters are ignored.
+        n (int): Block size.
+    Returns:
+        list[str]: Keys (as accepted by ``HillCipher``) in alignment order.
+    Raises:
+        InvalidTextError: If the ciphertext length is not a multiple of n.
+    """
+    cipher_blocks = _blocks(ciphertext, n)
+    crib = _letters(crib)
+    total = cipher_blocks.size
+    keys = []
+    for phase in range(n):
+        k = (len(crib) - phase) // n
+        if k < 1 or len(cipher_blocks) < k:
+            continue
+        plain = crib[phase:phase + k * n].reshape(k, n).astype(np.int64)
+        # C = P @ M.T, so M.T solves the crib system modulo 2 and modulo 13.
+        mod2, mod13 = _CribSystem(plain, 2), _CribSystem(plain, 13)
+        if mod2.count * mod13.count > _MAX_SOLUTIONS:
+            continue  # Too few independent crib blocks at this phase.
+        # windows[b] holds the k cipher blocks starting at block b.
+        windows = sliding_window_view(cipher_blocks, k, axis=0).transpose(0, 2, 1)
+        starts = np.arange(len(windows)) * n - phase
+        windows = windows[(starts >= 0) & (starts + len(crib) <= total)]
+        windows = windows[mod2.consistent(windows) & mod13.consistent(windows)]
+        # 13 = 1 (mod 2) and 14 = 1 (mod 13).
+        transposed = (13 * mod2.solutions(windows)[:, :, None] + 14 * mod13.solutions(windows)[:, None, :]) % 26
+        matrices = transposed.reshape(-1, n, n).transpose(0, 2, 1)
+        matrices = matrices[_invertible(matrices)]
+        keys.extend(_key_string(m) for m in matrices)
+    return keys
+
+def crack_hill_known_plaintext(ciphertext, crib, n=None, top=3):
+    """
+    Recover a Hill key from a crib known to occur somewhere in the plaintext.
+
+    Args:
+        ciphertext (str or bytes-like): Hill ciphertext.
+        crib (str): Known plaintext; it needs at least n * n + n - 1 letters
+            to determine an n x n key at every alignment.
+        n (int or None): Block size; None tries every size the crib can solve.
+        top (int): Number of keys to return.
+    Returns:
+        list[Candidate]: Keys consistent with the crib, ranked by the mean
+            log10 quadgram probability of their decryption.
+    """
+    sizes = [n] if n else [s for s in range(2, len(_letters(crib)) + 1)
+                           if s * s <= len(_letters(crib)) and len(_letters(ciphertext)) % s == 0]
+    keys = []
+    for size in sizes:
+        keys.extend(known_plaintext_keys(ciphertext, crib, size))
+    return _rank(keys, ciphertext, top)
+
+def _candidate_rows(n: int):
+    """All rows that can belong to an invertible matrix: entries share no factor with 26."""
+    rows = np.indices((26,) * n).reshape(n, -1).T
+    return rows[np.gcd.reduce(np.concatenate([rows, np.full((len(rows), 1), 26)], axis=1), axis=1) == 1]
+
+def _row_letters(rows, blocks):
+    """Plaintext letters each decryption row produces: (rows, blocks) uint8."""
+    # Products stay below n * 625, exact in float32.
+    return np.remainder(rows.astype(np.float32) @ blocks.T.astype(np.float32), 26).astype(np.uint8)
+
+def row_scores(blocks, method='loglik'):
+    """
+    Score every possible decryption row against English letter frequencies.
+
+    Row i of the decryption matrix alone decides letter i of every plaintext
+    block, so rows can be scored independently: all rows are applied to all
+    blocks as one batched matrix product.
+
+    Args:
+        blocks (numpy.ndarray): (blocks, n) ciphertext letter values.
+        method (str): 'chi2' (lower is better) or 'loglik' (higher is better).
+    Returns:
+        tuple: (rows, scores) with rows an (R, n) array of candidate rows.
+    """
+    rows = _candidate_rows(blocks.shape[1])
+    scores = np.empty(len(rows))
+    for start in range(0, len(rows), _ROWS_PER_CHUNK):
+        chunk = rows[start:start + _ROWS_PER_CHUNK]
+        letters = _row_letters(chunk, blocks)
+        flat = (np.arange(len(chunk))[:, None] * 26 + letters).ravel()
+        hist = np.bincount(flat, minlength=len(chunk) * 26).reshape(len(chunk), 26)
+        scores[start:start + len(chunk)] = frequency_scores(hist, method)
+    return rows, scores
+
+def crack_hill(ciphertext, n=2, top=3, method='loglik'):
+    """
+    Break a Hill ciphertext without a crib by searching the key space.
+
+    Every row that can appear in an invertible decryption matrix is scored
+    on its own; the best rows are then combined into full matrices, which
+    are filtered for invertibility and ranked by quadgram score.
+
+    Args:
+        ciphertext (str or bytes-like): Hill ciphertext; only its first
+            ``MAX_LETTERS`` letters are analysed.
+        n (int): Block size, 2 or 3.
+        top (int): Number of keys to return.
+        method (str): Row scoring, 'loglik' or 'chi2'.
+    Returns:
+        list[Candidate]: Ranked candidates; ``score`` is the mean log10
+            quadgram probability of the decryption.
+    Raises:
+        ValueError: If n is not 2 or 3.
+        InvalidTextError: If the ciphertext length is not a multiple of n.
+    """
+    if n not in _ROWS_KEPT:
+        raise ValueError("Ciphertext-only search supports block sizes 2 and 3.")
+    blocks = _blocks(ciphertext, n)[:MAX_LETTERS // n]
+    if len(blocks) < 2:
+        return []
+    rows, scores = row_scores(blocks, method)
+    order = np.argsort(scores if method == 'chi2' else -scores, kind='stable')
+    best = rows[order[:_ROWS_KEPT[n]]]
+    combos = np.array(list(itertools.permutations(range(len(best)), n)))
+    matrices = best[combos]
+    keep = _invertible(matrices)
+    combos, matrices = combos[keep], matrices[keep]
+    # Plaintext of every combination, interleaving the letters of its rows.
+    letters = _row_letters(best, blocks)
+    plaintexts = letters[combos].transpose(0, 2, 1).reshape(len(combos), -1)
+    quad = quadgram_scores(plaintexts)
+    chosen = np.argsort(-quad, kind='stable')[:max(top, 1) * 2]
+    keys = [_key_string(_inverse_mod26(matrices[i])) for i in chosen]
+    return _rank(keys, ciphertext, top)
+
+def crack_hill_batch(messages, top=3, method='loglik', block_size=2, crib=None):
+    """
+    Break messages that were encrypted with the same Hill key.
+
+    Every message must hold whole blocks; their blocks are pooled, so each
+    message starts on a block boundary of the pooled text.
+
+    Args:
+        messages (list[str]): Ciphertexts.
+        top (int): Number of keys to return.
+        method (str): Row scoring for the ciphertext-only search.
+        block_size (int): Key matrix size.
+        crib (str or None): Known plaintext; switches to the known-plaintext attack.
+    Returns:
+        list[list[Candidate]]: For each message, the ranked keys with its decryption.
+    Raises:
+        InvalidTextError: If a message's letter count is not a multiple of block_size.
+    """
+    messages = list(messages)
+    if not messages:
+        return []
+    blocks = np.concatenate([_blocks(message, block_size) for message in messages])
+    pooled = (blocks.ravel() + ord('A')).astype(np.uint8).tobytes()
+    if crib:
+        candidates = crack_hill_known_plaintext(pooled, crib, block_size, top)
+    else:
+        candidates = crack_hill(pooled, block_size, top, method)
+    cipher = HillCipher()
+    return [[Candidate(c.key, c.score, cipher.decrypt(message, c.key)) for c in candidates] for message in messages]
@@ -0,0 +1,221 @@
+from .. import InvalidTextError
+from ..playfair import PlayfairCipher, _digraph_table, _letter_values
+from .scoring import Candidate, english_quadgrams
+from concurrent.futures import ProcessPoolExecutor
+import itertools
+import string
+import numpy as np
+
+# Letters analysed; Playfair needs a few hundred, more only slows each trial.
+MAX_LETTERS = 1000
+# Most proposals evaluated together; the first accepted one is taken.
+_MAX_BATCH = 256
+# Annealing temperatures per quadgram of text, on the log10 score scale;
+# with 500000 proposals most chains solve a few hundred letters.
+_START_TEMPERATURE = 0.03
+_END_TEMPERATURE = 0.001
+# Square letters: the alphabet without J.
+_ALPHABET = np.array([v for v in range(26) if v != ord('J') - ord('A')], dtype=np.intp)
+# Output positions of decrypting each pair of square positions (pos_a * 25 + pos_b).
+_DECRYPT_FIRST, _DECRYPT_SECOND = _digraph_table(np.arange(25, dtype=np.uint8), -1).astype(np.intp).T.copy()
+
+def _mutations():
+    """
+    Position permutations applied to the square, with their proposal weights.
+
+    Letter swaps do most of the work; swapping rows or columns and
+    transposing make the large moves that letter swaps cannot.
+
+    Returns:
+        tuple: ((m, 25) permutations, (m,) probabilities).
+    """
+    grid = np.arange(25).reshape(5, 5)
+    swaps, rows, cols = [], [], []
+    for a, b in itertools.combinations(range(25), 2):
+        perm = np.arange(25)
+        perm[[a, b]] = perm[[b, a]]
+        swaps.append(perm)
+    for a, b in itertools.combinations(range(5), 2):
+        order = np.arange(5)
+        order[[a, b]] = order[[b, a]]
+        rows.append(grid[order].ravel())
+        cols.append(grid[:, order].ravel())
+    perms = np.array(swaps + rows + cols + [grid.T.ravel()])
+    weights = np.concatenate([np.full(len(swaps), 0.9 / len(swaps)), np.full(len(rows), 0.045 / len(rows)),
+                              np.full(len(cols), 0.045 / len(cols)), [0.01]])
+    return perms, weights / weights.sum()
+
+_PERMS, _PERM_WEIGHTS = _mutations()
+
+class _Problem:
+    """Pre-encoded ciphertext digraphs and the scoring table."""
+
+    def __init__(self, values, table):
+        # Ciphertext never contains J; treat a stray one as I, like the square does.
+        values = np.where(values == ord('J') - ord('A'), ord('I') - ord('A'), values).astype(np.intp)
+        self.first = values[0::2]
+        self.second = values[1::2]
+        self.table = table
+        self.quads = len(values) - 3
+
+    def score(self, squares):
+        """
+        Total log10 quadgram probability of the decryption under each square.
+
+        Args:
+            squares (numpy.ndarray): (batch, 25) letter values in row-major order.
+        Returns:
+            numpy.ndarray: (batch,) scores.
+        """
+        batch = len(squares)
+        rows = np.arange(batch)[:, None]
+        # Position index: the square position of every letter value.
+        positions = np.zeros((batch, 26), dtype=np.intp)
+        positions[rows, squares] = np.arange(25)
+        positions = positions.ravel()
+        codes = positions[rows * 26 + self.first] * 25 + positions[rows * 26 + self.second]
+        letters = squares.ravel()
+        first = letters[rows * 25 + _DECRYPT_FIRST[codes]]
+        second = letters[rows * 25 + _DECRYPT_SECOND[codes]]
+        digraphs = first * 26 + second
+        # Quadgrams starting on a digraph are two digraphs; the others straddle three.
+        even = digraphs[:, :-1] * 676 + digraphs[:, 1:]
+        odd = second[:, :-2] * 17576 + digraphs[:, 1:-1] * 26 + first[:, 2:]
+        return (self.table[even].sum(axis=1, dtype=np.float64)
+                + self.table[odd].sum(axis=1, dtype=np.float64))
+
+    def anneal(self, seed, iterations, start=None):
+        """
+        One simulated-annealing chain from a random or given square.
+
+        Proposals are drawn and scored in batches; the first one that passes
+        the Metropolis test is applied, which is equivalent to trying them
+        one at a time from the same state.
+
+        Args:
+            seed: Seed for ``numpy.random.default_rng``.
+            iterations (int): Proposals tried over the cooling schedule.
+            start (numpy.ndarray or None): Initial square; random if None.
+        Returns:
+            tuple: (square, mean log10 probability per quadgram) of the best
+                square seen.
+        """
+        rng = np.random.default_rng(seed)
+        square = rng.permutation(_ALPHABET) if start is None else np.asarray(start, dtype=np.intp)
+        score = self.score(square[None])[0]
+        best, best_score = square, score
+        # Geometric cooling on the total score, scaled with the text length.
+        hot, cold = _START_TEMPERATURE * self.quads, _END_TEMPERATURE * self.quads
+        batch = 1
+        done = 0
+        while done < iterations:
+            temperature = hot * (cold / hot) ** (done / iterations)
+            moves = rng.choice(len(_PERMS), size=batch, p=_PERM_WEIGHTS)
+            proposals = square[_PERMS[moves]]
+            deltas = self.score(proposals) - score
+            accepted = np.flatnonzero(rng.random(batch) < np.exp(np.minimum(deltas, 0) / temperature))
+            # Size the next batch to about twice the proposals an acceptance takes.
+            if len(accepted) == 0:
+                done += batch
+                batch = min(2 * batch, _MAX_BATCH)
+                continue
+            first = accepted[0]
+            done += first + 1
+            batch = int(min(max(2 * (first + 1), batch // 2, 1), _MAX_BATCH))
+            square, score = proposals[first], score + deltas[first]
+            if score > best_score:
+                best, best_score = square, score
+        return best, best_score / self.quads
+
+_worker_problem = None
+
+def _init_worker(values, table):
+    global _worker_problem
+    _worker_problem = _Problem(values, table)
+
+def _anneal_in_worker(seed, iterations, start):
+    return _worker_problem.anneal(seed, iterations, start)
+
+def _square_key(square) -> str:
+    return ''.join(string.ascii_uppercase[v] for v in square)
+
+def crack_playfair(ciphertext, top=3, chains=4, iterations=500000, jobs=1, seed=None, start=None, quadgrams=None):
+    """
+    Break a Playfair ciphertext with simulated annealing over 5x5 squares.
+
+    The ciphertext is encoded once as digraph letter arrays. Each trial
+    builds the position index of a mutated square, decrypts every digraph
+    through a position table and scores the result with quadgrams, so no
+    square or string is ever rebuilt. Independent chains can run in a
+    process pool.
+
+    Args:
+        ciphertext (str or bytes-like): Ciphertext; only its first
+            ``MAX_LETTERS`` letters are analysed.
+        top (int): Number of distinct decryptions to return.
+        chains (int): Independent annealing chains.
+        iterations (int): Proposals per chain.
+        jobs (int): Worker processes for the chains.
+        seed (int or None): Seed for reproducible results; chains are seeded
+            independently of ``jobs``.
+        start (str or None): Keyword or square every chain starts from, such
+            as a partial solution; random squares if None.
+        quadgrams (numpy.ndarray or None): Table from ``load_quadgrams``.
+    Returns:
+        list[Candidate]: Ranked candidates; ``key`` is the 25-letter square
+            (row-major), usable as a ``PlayfairCipher`` key, and ``score`` the
+            mean log10 quadgram probability.
+    Raises:
+        InvalidTextError: If the ciphertext has an odd number of letters.
+    """
+    values = _letter_values(ciphertext)
+    if len(values) % 2:
+        raise InvalidTextError("Playfair ciphertext must contain an even number of letters.")
+    values = values[:MAX_LETTERS - MAX_LETTERS % 2]
+    if len(values) < 4:
+        return []
+    table = english_quadgrams() if quadgrams is None else quadgrams
+    cipher = PlayfairCipher()
+    if start is not None:
+        start = np.frombuffer(''.join(cipher.compile(start).rows).encode('ascii'), dtype=np.uint8) - ord('A')
+    seeds = np.random.SeedSequence(seed).spawn(chains)
+    if jobs <= 1:
+        problem = _Problem(values, table)
+        results = [problem.anneal(s, iterations, start) for s in seeds]
+    else:
+        with ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=(values, table)) as pool:
+            results = list(pool.map(_anneal_in_worker, seeds, [iterations] * chains, [start] * chains))
+    candidates = {}
+    for square, score in sorted(results, key=lambda r: -r[1]):
+        key = _square_key(square)
+        plaintext = cipher.decrypt(ciphertext, key)
+        # Squares that differ by cyclic row or column shifts decrypt identically.
+        candidates.setdefault(plaintext, Candidate(key, float(score), plaintext))
+    return list(candidates.values())[:top]
+
+def crack_playfair_batch(messages, top=3, method='quadgram', restarts=4, jobs=1, seed=None):
+    """
+    Break messages that were encrypted with the same Playfair key.
+
+    Every message has an even letter count, so their digraphs can be pooled.
+
+    Args:
+        messages (list[str]): Ciphertexts.
+        top (int): Number of keys to return.
+        method (str): Scoring method; only 'quadgram' is supported.
+        restarts (int): Independent annealing chains.
+        jobs (int): Worker processes for the chains.
+        seed (int or None): Seed for reproducible results.
+    Returns:
+        list[list[Candidate]]: For each message, the ranked keys with its decryption.
+    Raises:
+        ValueError: If method is not 'quadgram'.
+    """
+    if method != 'quadgram':
+        raise ValueError(f"Unknown scoring method {method!r}; use 'quadgram'.")
+    messages = list(messages)
+    if not messages:
+        return []
+    candidates = crack_playfair(''.join(messages), top, chains=restarts, jobs=jobs, seed=seed)
+    cipher = PlayfairCipher()
+    return [[Candidate(c.key, c.score, cipher.decrypt(message, c.key)) for c in candidates] for message in messages]
@@ -0,0 +1,177 @@
+from collections import namedtuple
+from functools import lru_cache
+from pathlib import Path
+import gzip
+import string
+import numpy as np
+from ..textform import NormalizedText, text_bytes
+
+Candidate = namedtuple('Candidate', ['key', 'score', 'plaintext'])
+Candidate.__doc__ = "A recovered key with its score (meaning depends on the method) and plaintext."
+
+# Relative letter frequencies of English text, A..Z.
+ENGLISH_FREQUENCIES = np.array([
+    0.08167, 0.01492, 0.02782, 0.04253, 0.12702, 0.02228, 0.02015, 0.06094, 0.06966,
+    0.00153, 0.00772, 0.04025, 0.02406, 0.06749, 0.07507, 0.01929, 0.00095, 0.05987,
+    0.06327, 0.09056, 0.02758, 0.00978, 0.02360, 0.00150, 0.01974, 0.00074,
+])
+ENGLISH_FREQUENCIES = ENGLISH_FREQUENCIES / ENGLISH_FREQUENCIES.sum()
+ENGLISH_LOG_FREQUENCIES = np.log(ENGLISH_FREQUENCIES)
+# Probability that two random letters of English text are equal.
+ENGLISH_IOC = float((ENGLISH_FREQUENCIES ** 2).sum())
+
+# SHIFT_INDEX[s, l] is the ciphertext letter that decrypts to l under shift s.
+SHIFT_INDEX = (np.arange(26)[None, :] + np.arange(26)[:, None]) % 26
+
+METHODS = ('chi2', 'loglik')
+
+QUADGRAMS_PATH = Path(__file__).parent / 'data' / 'english_quadgrams.txt.gz'
+# Place values of the four letters of a quadgram table index.
+QUADGRAM_PLACES = np.array([17576, 676, 26, 1], dtype=np.int64)
+
+def letter_values(text):
+    """
+    Extract ASCII letters as values 0..25, ignoring case and everything else.
+
+    Args:
+        text (str, bytes-like or NormalizedText): Input text.
+    Returns:
+        numpy.ndarray: uint8 letter values.
+    """
+    if isinstance(text, NormalizedText):
+        return text.letters
+    codes = np.frombuffer(text_bytes(text), dtype=np.uint8)
+    folded = (codes | 32) - np.uint8(ord('a'))
+    return folded[folded < 26]
+
+def letter_histograms(messages):
+    """
+    Count letters per message with a single bincount.
+
+    Args:
+        messages (list[str, bytes or NormalizedText]): Messages to count.
+    Returns:
+        numpy.ndarray: (messages, 26) int64 letter counts.
+    """
+    encoded = [text_bytes(m) for m in messages]
+    codes = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    ids = np.repeat(np.arange(len(encoded)), [len(e) for e in encoded])
+    folded = (codes | 32) - np.uint8(ord('a'))
+    letters = folded < 26
+    flat = ids[letters] * 26 + folded[letters]
+    return np.bincount(flat, minlength=len(encoded) * 26).reshape(len(encoded), 26)
+
+def frequency_scores(histograms, method='chi2'):
+    """
+    Score letter histograms against English as they are, without shifting.
+
+    Args:
+        histograms (numpy.ndarray): (rows, 26) letter counts.
+        method (str): 'chi2' (lower is better) or 'loglik' (higher is better).
+    Returns:
+        numpy.ndarray: (rows,) scores.
+    """
+    histograms = np.asarray(histograms, dtype=np.float64)
+    if method == 'chi2':
+        expected = np.maximum(histograms.sum(axis=1)[:, None] * ENGLISH_FREQUENCIES, 1e-12)
+        return ((histograms - expected) ** 2 / expected).sum(axis=1)
+    if method == 'loglik':
+        return histograms @ ENGLISH_LOG_FREQUENCIES
+    raise ValueError(f"Unknown scoring method {method!r}; use one of {', '.join(METHODS)}.")
+
+def shift_scores(histograms, method='chi2'):
+    """
+    Score every Caesar shift of every histogram against English.
+
+    Args:
+        histograms (numpy.ndarray): (messages, 26) letter counts of ciphertexts.
+        method (str): 'chi2' (chi-squared statistic, lower is better) or
+            'loglik' (log-likelihood, higher is better).
+    Returns:
+        numpy.ndarray: (messages, 26) scores; column s is decryption shift s.
+    """
+    histograms = np.asarray(histograms, dtype=np.float64)
+    if method == 'chi2':
+        totals = histograms.sum(axis=1)[:, None, None]
+        expected = np.maximum(totals * ENGLISH_FREQUENCIES, 1e-12)
+        observed = histograms[:, SHIFT_INDEX]
+        return ((observed - expected) ** 2 / expected).sum(axis=2)
+    if method == 'loglik':
+        # weights[c, s] = log P(letter that ciphertext c decrypts to under shift s)
+        weights = ENGLISH_LOG_FREQUENCIES[(np.arange(26)[:, None] - np.arange(26)[None, :]) % 26]
+        return histograms @ weights
+    raise ValueError(f"Unknown scoring method {method!r}; use one of {', '.join(METHODS)}.")
+
+def rank_shifts(scores, method='chi2', top=3):
+    """
+    Return the best shifts per row, best first.
+
+    Args:
+        scores (numpy.ndarray): (rows, 26) output of ``shift_scores``.
+        method (str): Scoring method, which decides the sort direction.
+        top (int): Number of shifts to keep per row.
+    Returns:
+        numpy.ndarray: (rows, top) shift indices.
+    """
+    order = scores if method == 'chi2' else -scores
+    return np.argsort(order, axis=1, kind='stable')[:, :top]
+
+def load_quadgrams(path=QUADGRAMS_PATH):
+    """
+    Load quadgram counts into a dense table of log10 probabilities.
+
+    Args:
+        path (str or Path): Text file (optionally gzip-compressed) with one
+            "QUAD count" pair per line, e.g. "TION 6356".
+    Returns:
+        numpy.ndarray: float32 array of 26**4 log10 probabilities indexed by
+            the letter values (A=0) in base 26; unseen quadgrams get a floor.
+    Raises:
+        ValueError: If a line is not a 4-letter quadgram and a count.
+    """
+    path = Path(path)
+    opener = gzip.open if path.suffix == '.gz' else open
+    counts = np.zeros(26 ** 4, dtype=np.float64)
+    with opener(path, 'rt', encoding='ascii') as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                quad, count = line.split()
+                values = [string.ascii_uppercase.index(c) for c in quad.upper()]
+                if len(values) != 4:
+                    raise ValueError
+                counts[int(np.dot(values, QUADGRAM_PLACES))] += int(count)
+            except ValueError:
+                raise ValueError(f"{path}:{number}: expected 'QUAD count', got {line.strip()!r}") from None
+    total = counts.sum()
+    if not total:
+        raise ValueError(f"{path}: no quadgrams found")
+    floor = np.log10(0.01 / total)
+    with np.errstate(divide='ignore'):
+        table = np.where(counts > 0, np.log10(counts / total), floor)
+    return table.astype(np.float32)
+
+@lru_cache(maxsize=1)
+def english_quadgrams():
+    """Return the bundled English quadgram table (loaded once)."""
+    table = load_quadgrams()
+    table.flags.writeable = False
+    return table
+
+def quadgram_scores(values, table=None):
+    """
+    Mean log10 quadgram probability of letter sequences.
+
+    Args:
+        values (numpy.ndarray): Letter values 0..25, one sequence or a
+            (sequences, length) batch.
+        table (numpy.ndarray or None): Table from ``load_quadgrams``; defaults
+            to the bundled English table.
+    Returns:
+        float or numpy.ndarray: Score per sequence, higher is more English-like.
+    """
+    table = english_quadgrams() if table is None else table
+    values = np.asarray(values, dtype=np.int64)
+    indices = sum(values[..., i:values.shape[-1] - 3 + i] * place for i, place in enumerate(QUADGRAM_PLACES))
+    return table[indices].mean(axis=-1)
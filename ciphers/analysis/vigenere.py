@@ -0,0 +1,207 @@
+from ..vigenere import VigenereCipher
+from .scoring import Candidate, ENGLISH_IOC, shift_scores, rank_shifts
+import math
+import string
+import numpy as np
+from ..textform import text_bytes
+
+# Letters used for the key-length statistics; a sample this size estimates
+# the index of coincidence of 40 columns to well under a percent.
+_SAMPLE_LETTERS = 1 << 17
+_RANDOM_IOC = 1 / 26
+# Prior cost of each key letter, log(26) nats.
+_LETTER_COST = math.log(26)
+# Key lengths solved in full, in order of their key-length score.
+_LENGTHS_SOLVED = 6
+
+def _letter_stream(messages):
+    """
+    Extract the letters of messages that each restart the key.
+
+    Args:
+        messages (list[str, bytes or NormalizedText]): Ciphertexts.
+    Returns:
+        tuple: (letters, positions, ids) where letters are uint8 values 0..25,
+            positions is each letter's index within its message and ids the
+            message it belongs to.
+    """
+    encoded = [text_bytes(m) for m in messages]
+    codes = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    folded = (codes | 32) - np.uint8(ord('a'))
+    mask = folded < 26
+    letters = folded[mask]
+    sources = np.repeat(np.arange(len(encoded)), [len(e) for e in encoded])
+    ids = sources[mask]
+    counts = np.bincount(ids, minlength=len(encoded))
+    starts = np.cumsum(counts) - counts
+    positions = np.arange(len(letters)) - starts[ids]
+    return letters, positions, ids
+
+def _coincidence(letters, positions, max_length):
+    """
+    Average index of coincidence of the columns for every key length at once.
+
+    Returns:
+        numpy.ndarray: (max_length,) IoC for key lengths 1..max_length.
+    """
+    lengths = np.arange(1, max_length + 1)
+    columns = positions[None, :] % lengths[:, None]
+    flat = (np.arange(max_length)[:, None] * max_length + columns) * 26 + letters[None, :]
+    hist = np.bincount(flat.ravel(), minlength=max_length * max_length * 26)
+    hist = hist.reshape(max_length, max_length, 26).astype(np.float64)
+    totals = hist.sum(axis=2)
+    pairs = totals * (totals - 1)
+    ioc = np.divide((hist * (hist - 1)).sum(axis=2), pairs, out=np.zeros_like(pairs), where=pairs > 0)
+    used = (np.arange(max_length)[None, :] < lengths[:, None]) & (pairs > 0)
+    return (ioc * used).sum(axis=1) / np.maximum(used.sum(axis=1), 1)
+
+def _kasiski(letters, positions, ids, max_length):
+    """
+    Fraction of repeated-trigram distances divisible by every key length.
+
+    Returns:
+        numpy.ndarray or None: (max_length,) fractions, or None without repeats.
+    """
+    if len(letters) < 3:
+        return None
+    values = letters.astype(np.int64)
+    trigrams = values[:-2] * 676 + values[1:-1] * 26 + values[2:]
+    # A trigram must not straddle two messages.
+    valid = ids[:-2] == ids[2:]
+    keys = (ids[:-2] * 17576 + trigrams)[valid]
+    starts = positions[:-2][valid]
+    order = np.argsort(keys, kind='stable')
+    keys, starts = keys[order], starts[order]
+    repeat = keys[1:] == keys[:-1]
+    distances = (starts[1:] - starts[:-1])[repeat]
+    if len(distances) == 0:
+        return None
+    lengths = np.arange(1, max_length + 1)
+    return (distances[None, :] % lengths[:, None] == 0).mean(axis=1)
+
+def key_length_scores(messages, max_key_length=40):
+    """
+    Score candidate Vigenère key lengths with the index of coincidence and Kasiski examination.
+
+    The IoC of the columns is close to English for the right length and its
+    multiples, while repeated-trigram distances are divisible by the right
+    length and its divisors; the product of the two peaks at the key length.
+
+    Args:
+        messages (list[str or bytes]): Ciphertexts encrypted with the same key,
+            each starting at the first key letter.
+        max_key_length (int): Longest key length considered.
+    Returns:
+        numpy.ndarray: (max_key_length,) scores for lengths 1..max_key_length,
+            about 1 for the key length and near 0 for random lengths.
+    """
+    letters, positions, ids = _letter_stream(messages)
+    return _length_scores(letters[:_SAMPLE_LETTERS], positions[:_SAMPLE_LETTERS], ids[:_SAMPLE_LETTERS], max_key_length)
+
+def _length_scores(letters, positions, ids, max_length):
+    ioc = _coincidence(letters, positions, max_length)
+    score = np.clip((ioc - _RANDOM_IOC) / (ENGLISH_IOC - _RANDOM_IOC), 0, None)
+    kasiski = _kasiski(letters, positions, ids, max_length)
+    return score if kasiski is None else score * kasiski
+
+def _minimal_period(key: str) -> str:
+    """Reduce a key that repeats a shorter key, e.g. 'ABAB' -> 'AB'."""
+    for p in range(1, len(key)):
+        if len(key) % p == 0 and key == key[:p] * (len(key) // p):
+            return key[:p]
+    return key
+
+def _solve_length(letters, positions, length, method, variants):
+    """
+    Solve every column of one key length and derive close alternatives.
+
+    Returns:
+        list[tuple]: (key, log-likelihood) for the best key and for the
+            ``variants`` single-letter changes that cost the least.
+    """
+    flat = (positions % length) * 26 + letters
+    hist = np.bincount(flat, minlength=length * 26).reshape(length, 26)
+    loglik = shift_scores(hist, 'loglik')
+    ranked = rank_shifts(shift_scores(hist, method) if method != 'loglik' else loglik, method, 2)
+    best = ranked[:, 0]
+    columns = np.arange(length)
+    total = float(loglik[columns, best].sum())
+    key = ''.join(string.ascii_uppercase[s] for s in best)
+    results = [(key, total)]
+    if _minimal_period(key) != key:
+        return results  # A multiple of a shorter key length adds nothing new.
+    costs = loglik[columns, best] - loglik[columns, ranked[:, 1]]
+    for col in np.argsort(costs, kind='stable')[:variants]:
+        alt = key[:col] + string.ascii_uppercase[ranked[col, 1]] + key[col + 1:]
+        results.append((alt, total - float(costs[col])))
+    return results
+
+def _recover_keys(messages, top, max_key_length, method):
+    """
+    Rank likely keys with their posterior probability.
+
+    Returns:
+        list[tuple]: (key, confidence) pairs, best first.
+    """
+    letters, positions, ids = _letter_stream(messages)
+    if len(letters) < 2:
+        return []
+    max_length = max(1, min(max_key_length, len(letters) // 2))
+    scores = _length_scores(letters[:_SAMPLE_LETTERS], positions[:_SAMPLE_LETTERS], ids[:_SAMPLE_LETTERS], max_length)
+    lengths = np.argsort(-scores, kind='stable')[:max(top, _LENGTHS_SOLVED)] + 1
+    candidates = {}
+    for length in lengths:
+        for key, loglik in _solve_length(letters, positions, int(length), method, top):
+            key = _minimal_period(key)
+            # Posterior under a uniform prior over key letters: each letter costs log(26).
+            posterior = loglik - _LETTER_COST * len(key)
+            candidates[key] = max(candidates.get(key, -np.inf), posterior)
+    keys = sorted(candidates, key=lambda k: (-candidates[k], len(k), k))[:top]
+    values = np.array([candidates[k] for k in candidates])
+    confidence = np.exp(np.array([candidates[k] for k in keys]) - values.max())
+    confidence /= np.exp(values - values.max()).sum()
+    return list(zip(keys, confidence.tolist()))
+
+def crack_vigenere(ciphertext, top=3, max_key_length=40, method='chi2'):
+    """
+    Break a Vigenère ciphertext without the key.
+
+    Key lengths are ranked by the index of coincidence and Kasiski
+    examination, computed for all lengths at once; the columns of the best
+    lengths are then solved together by frequency scoring.
+
+    Args:
+        ciphertext (str, bytes-like or NormalizedText): Ciphertext.
+        top (int): Number of candidate keys to return.
+        max_key_length (int): Longest key length considered.
+        method (str): Column scoring, 'chi2' or 'loglik'.
+    Returns:
+        list[Candidate]: Ranked candidates; ``score`` is the confidence in
+            0..1 (posterior probability among the keys tried).
+    """
+    cipher = VigenereCipher()
+    return [Candidate(key, confidence, cipher.decrypt(ciphertext, key))
+            for key, confidence in _recover_keys([ciphertext], top, max_key_length, method)]
+
+def crack_vigenere_batch(messages, top=3, method='chi2', max_key_length=40):
+    """
+    Break messages that were encrypted one by one with the same Vigenère key.
+
+    This matches ``cli.py``, which restarts the key on every input line; all
+    messages are pooled to recover the shared key.
+
+    Args:
+        messages (list[str or bytes]): Ciphertexts.
+        top (int): Number of candidate keys to return.
+        method (str): Column scoring, 'chi2' or 'loglik'.
+        max_key_length (int): Longest key length considered.
+    Returns:
+        list[list[Candidate]]: For each message, the ranked keys with its decryption.
+    """
+    messages = list(messages)
+    if not messages:
+        return []
+    keys = _recover_keys(messages, top, max_key_length, method)
+    cipher = VigenereCipher()
+    return [[Candidate(key, confidence, cipher.decrypt(message, key)) for key, confidence in keys]
+            for message in messages]
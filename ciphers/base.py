@@ -1,12 +1,325 @@
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from .keycache import KEY_CACHE
+from .textform import NormalizedText
+from . import metrics
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+# Block size for in-place processing of caller-supplied buffers.
+INPLACE_BLOCK_SIZE = 1 << 16
+BYTES_TYPES = (bytes, bytearray, memoryview)
+
+class StreamTransform:
+    """Incremental encryption or decryption that carries state across chunks."""
+
+    def __init__(self, func):
+        self._func = func
+
+    def update(self, chunk: str) -> str:
+        """Process the next chunk and return whatever output is ready."""
+        return self._func(chunk)
+
+    def finalize(self) -> str:
+        """Flush buffered state (padding, pending letters) at end of input."""
+        return ''
+
+def iter_chunks(source, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Yield chunks from a file-like object or an iterable of strings.
+
+    Args:
+        source: Object with ``read(size)``, or any iterable of chunks.
+        chunk_size (int): Read size for file-like sources.
+    Yields:
+        str: Non-empty chunks in order.
+    """
+    if hasattr(source, 'read'):
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        for chunk in source:
+            if chunk:
+                yield chunk
+
+def match_input_type(raw: bytes, like):
+    """Return ASCII output as str for str input and as bytes for bytes-like input."""
+    if isinstance(like, NormalizedText):
+        return like.output(raw)
+    return raw.decode('ascii') if isinstance(like, str) else raw
+
+def as_byte_view(buffer) -> memoryview:
+    """
+    Return a writable flat byte view of a caller-supplied buffer.
+
+    Args:
+        buffer: bytearray, memoryview or other writable buffer.
+    Returns:
+        memoryview: Unsigned-byte view sharing memory with ``buffer``.
+    Raises:
+        TypeError: If the buffer is read-only.
+    """
+    view = memoryview(buffer)
+    if view.readonly:
+        raise TypeError("encrypt_into/decrypt_into need a writable buffer such as bytearray.")
+    return view.cast('B') if view.format != 'B' or view.ndim != 1 else view
+
+def translate_into(buffer, table: bytes):
+    """Apply a bytes translation table to a writable buffer in place, block by block."""
+    view = as_byte_view(buffer)
+    for start in range(0, len(view), INPLACE_BLOCK_SIZE):
+        block = view[start:start + INPLACE_BLOCK_SIZE]
+        block[:] = block.tobytes().translate(table)
+
+def ascii_codes(text):
+    """
+    Return the bytes of an ASCII str, a bytes-like payload or a NormalizedText as a uint8 array.
+
+    Returns:
+        numpy.ndarray or None: Read-only codes, or None for non-ASCII str input.
+    """
+    import numpy as np
+    if isinstance(text, NormalizedText):
+        return text.codes
+    if isinstance(text, str):
+        if not text.isascii():
+            return None
+        text = text.encode('ascii')
+    return np.frombuffer(text, dtype=np.uint8)
+
+def gather_rows(tables, codes):
+    """
+    Translate codes with several 256-entry byte tables at once.
+
+    Args:
+        tables (list[bytes]): One translation table per output row.
+        codes (numpy.ndarray): uint8 input codes.
+    Returns:
+        numpy.ndarray: (len(tables), len(codes)) uint8 array.
+    """
+    import numpy as np
+    matrix = np.frombuffer(b''.join(tables), dtype=np.uint8).reshape(len(tables), 256)
+    return matrix.take(codes, axis=1)
+
+def _stack_outputs(outputs):
+    import numpy as np
+    encoded = []
+    for out in outputs:
+        if isinstance(out, str):
+            if not out.isascii():
+                raise ValueError("as_array needs ASCII output; use the list form for non-ASCII text.")
+            out = out.encode('ascii')
+        encoded.append(out)
+    if len({len(out) for out in encoded}) > 1:
+        raise ValueError("as_array needs outputs of one length; these keys give different lengths.")
+    width = len(encoded[0]) if encoded else 0
+    return np.frombuffer(bytearray(b''.join(encoded)), dtype=np.uint8).reshape(len(encoded), width)
+
+@dataclass(frozen=True, eq=False)
+class CompiledKey(ABC):
+    """A validated key with its precomputed key schedule."""
+
+    key: str
+
+    # Whether the key position advances with every letter, so a segment of a
+    # larger document needs the number of letters before it (Vigenère).
+    letter_positions = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        metrics.instrument_class(cls, metrics.KEY_METHODS)
+
+    @abstractmethod
+    def encrypt(self, plaintext: str) -> str:
+        pass
+
+    @abstractmethod
+    def decrypt(self, ciphertext: str) -> str:
+        pass
+
+    def encrypt_into(self, buffer, offset: int = 0):
+        """
+        Encrypt an ASCII payload in place.
+
+        Only length-preserving ciphers support this.
+
+        Args:
+            buffer: Writable bytearray or memoryview.
+            offset (int): Letters before the buffer when it is a segment of a
+                larger document; keys with ``letter_positions`` start there.
+        Raises:
+            TypeError: If the cipher changes the text length or the buffer is read-only.
+        """
+        raise TypeError(f"{type(self).__name__} does not preserve length; use encrypt() instead.")
+
+    def decrypt_into(self, buffer, offset: int = 0):
+        """Decrypt an ASCII payload in place; see ``encrypt_into``."""
+        raise TypeError(f"{type(self).__name__} does not preserve length; use decrypt() instead.")
+
+    def segment_block(self, mode: str):
+        """
+        How ``ciphers.parallel`` may split one document into segments for this key.
+
+        Args:
+            mode (str): 'encrypt' or 'decrypt'.
+        Returns:
+            int or None: 0 if segments are transformed in place with
+                ``encrypt_into``/``decrypt_into``; n if every n-letter block
+                maps to n letters on its own, so segments start after a
+                multiple of n letters; None if the document cannot be split.
+        """
+        return None
+
+    def encryptor(self) -> StreamTransform:
+        """Return a stream transform for encryption (stateless by default)."""
+        return StreamTransform(self.encrypt)
+
+    def decryptor(self) -> StreamTransform:
+        """Return a stream transform for decryption (stateless by default)."""
+        return StreamTransform(self.decrypt)
+
+    def iter_encrypt(self, chunks):
+        return _iter_transform(self.encryptor(), chunks)
+
+    def iter_decrypt(self, chunks):
+        return _iter_transform(self.decryptor(), chunks)
+
+    def encrypt_stream(self, source, sink, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        return _write_all(self.iter_encrypt(iter_chunks(source, chunk_size)), sink)
+
+    def decrypt_stream(self, source, sink, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        return _write_all(self.iter_decrypt(iter_chunks(source, chunk_size)), sink)
+
+def _iter_transform(transform, chunks):
+    for chunk in chunks:
+        out = transform.update(chunk)
+        if out:
+            yield out
+    out = transform.finalize()
+    if out:
+        yield out
+
+def _write_all(outputs, sink) -> int:
+    written = 0
+    for out in outputs:
+        sink.write(out)
+        written += len(out)
+    return written
 
 class Cipher(ABC):
     """Abstract base class for all ciphers."""
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        metrics.instrument_class(cls, metrics.CIPHER_METHODS)
+
+    def compile(self, key: str) -> CompiledKey:
+        """
+        Validate a key and build its key schedule, using the shared key cache.
+
+        Args:
+            key (str): Cipher key.
+        Returns:
+            CompiledKey: Immutable prepared key with encrypt/decrypt methods.
+        Raises:
+            InvalidKeyError: If the key is invalid for this cipher.
+        """
+        return KEY_CACHE.get(self, key)
+
     @abstractmethod
-    def encrypt(self, plaintext: str, key: str) -> str:
+    def _compile_key(self, key: str) -> CompiledKey:
         pass
 
-    @abstractmethod
-    def decrypt(self, ciphertext: str, key: str) -> str:
-        pass 
\ No newline at end of file
+    def encrypt(self, plaintext, key: str):
+        """Encrypt a str (returns str) or a bytes-like ASCII payload (returns bytes)."""
+        return self.compile(key).encrypt(plaintext)
+
+    def decrypt(self, ciphertext, key: str):
+        """Decrypt a str (returns str) or a bytes-like ASCII payload (returns bytes)."""
+        return self.compile(key).decrypt(ciphertext)
+
+    def encrypt_many(self, plaintext, keys, as_array: bool = False):
+        """
+        Encrypt one text under many keys, normalizing the text only once.
+
+        Args:
+            plaintext (str, bytes-like or NormalizedText): Text to encrypt.
+            keys (iterable[str]): Cipher keys.
+            as_array (bool): Return a (len(keys), output length) uint8 array of
+                ASCII codes instead of a list.
+        Returns:
+            list or numpy.ndarray: One output per key, in key order, of the
+                input's type (str or bytes), or the array.
+        Raises:
+            InvalidKeyError: If any key is invalid.
+            ValueError: If as_array is set and the outputs are not ASCII text
+                of one length.
+        """
+        return self._transform_many(plaintext, keys, 'encrypt', as_array)
+
+    def decrypt_many(self, ciphertext, keys, as_array: bool = False):
+        """Decrypt one text under many keys; see ``encrypt_many``."""
+        return self._transform_many(ciphertext, keys, 'decrypt', as_array)
+
+    def _transform_many(self, text, keys, mode, as_array):
+        compiled = [self.compile(key) for key in keys]
+        rows = self._many_rows(text, compiled, mode) if compiled else None
+        if rows is None:
+            outputs = [key.encrypt(text) if mode == 'encrypt' else key.decrypt(text) for key in compiled]
+            return _stack_outputs(outputs) if as_array else outputs
+        if as_array:
+            return rows
+        return [match_input_type(row.tobytes(), text) for row in rows]
+
+    def _many_rows(self, text, compiled_keys, mode):
+        """
+        Transform a text under several compiled keys at once.
+
+        Ciphers override this with a vectorized version; returning None
+        falls back to one call per key.
+
+        Returns:
+            numpy.ndarray or None: (len(compiled_keys), output length) uint8 ASCII codes.
+        """
+        return None
+
+    def encrypt_into(self, buffer, key: str):
+        """Encrypt a writable bytearray/memoryview in place (length-preserving ciphers only)."""
+        self.compile(key).encrypt_into(buffer)
+
+    def decrypt_into(self, buffer, key: str):
+        """Decrypt a writable bytearray/memoryview in place (length-preserving ciphers only)."""
+        self.compile(key).decrypt_into(buffer)
+
+    def encrypt_stream(self, source, sink, key: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        """
+        Encrypt from a file-like object or chunk iterator into a writable sink.
+
+        Memory use is bounded by ``chunk_size``; the output is identical to
+        ``encrypt`` on the concatenated input.
+
+        Args:
+            source: Object with ``read(size)``, or an iterable of text chunks.
+            sink: Object with ``write(text)``.
+            key (str): Cipher key.
+            chunk_size (int): Characters read per chunk.
+        Returns:
+            int: Number of characters written.
+        """
+        return self.compile(key).encrypt_stream(source, sink, chunk_size)
+
+    def decrypt_stream(self, source, sink, key: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        """
+        Decrypt from a file-like object or chunk iterator into a writable sink.
+
+        Args:
+            source: Object with ``read(size)``, or an iterable of text chunks.
+            sink: Object with ``write(text)``.
+            key (str): Cipher key.
+            chunk_size (int): Characters read per chunk.
+        Returns:
+            int: Number of characters written.
+        """
+        return self.compile(key).decrypt_stream(source, sink, chunk_size)
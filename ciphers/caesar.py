@@ -1,35 +1,78 @@
-from .base import Cipher
-from . import InvalidKeyError, preserve_case
+from .base import Cipher, CompiledKey, ascii_codes, gather_rows, translate_into
+from .textform import NormalizedText
+from . import InvalidKeyError
+from dataclasses import dataclass
+import string
+
+def _shift_letter(char: str, shift: int) -> str:
+    base = ord('A') if char.isupper() else ord('a')
+    return chr((ord(char) - base + shift) % 26 + base)
+
+def _translation_tables(shift: int):
+    """
+    Build the translation tables for a Caesar shift.
+
+    Args:
+        shift (int): Shift in the range 0..25.
+    Returns:
+        tuple: (str table, bytes table) covering upper and lower case ASCII letters.
+    """
+    upper, lower = string.ascii_uppercase, string.ascii_lowercase
+    shifted = upper[shift:] + upper[:shift] + lower[shift:] + lower[:shift]
+    return (str.maketrans(upper + lower, shifted),
+            bytes.maketrans((upper + lower).encode('ascii'), shifted.encode('ascii')))
+
+def _translate(text, shift: int, tables):
+    str_table, bytes_table = tables
+    if isinstance(text, NormalizedText):
+        return text.translate(bytes_table)
+    if not isinstance(text, str):
+        return bytes(text).translate(bytes_table)
+    if text.isascii():
+        return text.encode('ascii').translate(bytes_table).decode('ascii')
+    # Non-ASCII letters keep their historical code-point arithmetic.
+    extra = {ord(c): _shift_letter(c, shift) for c in set(text) if c.isalpha() and not c.isascii()}
+    return text.translate({**str_table, **extra})
+
+@dataclass(frozen=True, eq=False)
+class CaesarKey(CompiledKey):
+    """Compiled Caesar key: the shift and its translation tables."""
+
+    shift: int
+    encrypt_tables: tuple
+    decrypt_tables: tuple
+
+    def encrypt(self, plaintext):
+        return _translate(plaintext, self.shift, self.encrypt_tables)
+
+    def decrypt(self, ciphertext):
+        return _translate(ciphertext, -self.shift % 26, self.decrypt_tables)
+
+    def encrypt_into(self, buffer, offset=0):
+        translate_into(buffer, self.encrypt_tables[1])
+
+    def decrypt_into(self, buffer, offset=0):
+        translate_into(buffer, self.decrypt_tables[1])
+
+    def segment_block(self, mode):
+        return 0
 
 class CaesarCipher(Cipher):
     """Caesar cipher implementation."""
 
-    def encrypt(self, plaintext: str, key: str) -> str:
-        try:
-            shift = int(key) % 26
-        except ValueError:
-            raise InvalidKeyError("Key for Caesar cipher must be an integer.")
-        result = ''
-        for char in plaintext:
-            if char.isalpha():
-                base = ord('A') if char.isupper() else ord('a')
-                shifted = chr((ord(char) - base + shift) % 26 + base)
-                result += preserve_case(char, shifted)
-            else:
-                result += char
-        return result
-
-    def decrypt(self, ciphertext: str, key: str) -> str:
+    def _parse_key(self, key: str) -> int:
         try:
-            shift = int(key) % 26
+            return int(key) % 26
         except ValueError:
             raise InvalidKeyError("Key for Caesar cipher must be an integer.")
-        result = ''
-        for char in ciphertext:
-            if char.isalpha():
-                base = ord('A') if char.isupper() else ord('a')
-                shifted = chr((ord(char) - base - shift) % 26 + base)
-                result += preserve_case(char, shifted)
-            else:
-                result += char
-        return result 
\ No newline at end of file
+
+    def _compile_key(self, key: str) -> CaesarKey:
+        shift = self._parse_key(key)
+        return CaesarKey(key, shift, _translation_tables(shift), _translation_tables(-shift % 26))
+
+    def _many_rows(self, text, compiled_keys, mode):
+        codes = ascii_codes(text)
+        if codes is None:
+            return None
+        return gather_rows([(k.encrypt_tables if mode == 'encrypt' else k.decrypt_tables)[1] for k in compiled_keys],
+                           codes)
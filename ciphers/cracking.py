@@ -0,0 +1,76 @@
+"""
+Key recovery over many ciphertexts, shared by the CLI and the server.
+
+The cryptanalysis modules need numpy, so they are imported on first use and
+importing this module stays cheap.
+
+Usage:
+    from ciphers.cracking import crack_texts
+    for text, candidates, error in crack_texts('vigenere', lines, top=2):
+        print(candidates[0].key if candidates else error)
+"""
+import importlib
+from itertools import islice
+from . import InvalidKeyError, InvalidTextError
+
+# Cryptanalysis entry points, imported on first use:
+# cipher -> (module, batch function, scoring methods, extra options passed from args).
+CRACKERS = {
+    'caesar': ('ciphers.analysis.caesar', 'crack_caesar', ('chi2', 'loglik'), ()),
+    'vigenere': ('ciphers.analysis.vigenere', 'crack_vigenere_batch', ('chi2', 'loglik'), ()),
+    'substitution': ('ciphers.analysis.substitution', 'crack_substitution_batch', ('quadgram',),
+                     ('restarts', 'jobs', 'seed')),
+    'hill': ('ciphers.analysis.hill', 'crack_hill_batch', ('loglik', 'chi2'), ('block_size', 'crib')),
+    'playfair': ('ciphers.analysis.playfair', 'crack_playfair_batch', ('quadgram',), ('restarts', 'jobs', 'seed')),
+}
+
+def crack_texts(cipher_name, texts, top=3, method=None, batch_size=10000, **options):
+    """
+    Recover keys for ciphertexts, analysing them in batches.
+
+    When the cracker rejects a batch, the batch is halved until the texts it
+    rejects are found; those fail alone and the others are analysed together.
+
+    Args:
+        cipher_name (str): Cipher with an entry in ``CRACKERS``.
+        texts (iterable[str]): Ciphertexts.
+        top (int): Candidates per text.
+        method (str or None): Scoring method passed to the cracker; None for its default.
+        batch_size (int): Texts analysed per call.
+        **options: Extra keyword arguments for the cracker.
+    Yields:
+        tuple: (text, list of ``Candidate``, error) in input order, with no
+        candidates and error set on failure.
+    """
+    module_name, func_name, methods, _ = CRACKERS[cipher_name]
+    crack = getattr(importlib.import_module(module_name), func_name)
+    texts = (text for text in texts if text)  # Skip empty texts
+    while batch := list(islice(texts, batch_size)):
+        yield from _crack_batch(crack, batch, top, method or methods[0], options)
+
+def _crack_batch(crack, batch, top, method, options):
+    try:
+        return [(text, candidates, None) for text, candidates in zip(batch, crack(batch, top=top, method=method, **options))]
+    except (InvalidKeyError, InvalidTextError) as e:
+        if len(batch) == 1:
+            return [(batch[0], [], str(e))]
+    half = len(batch) // 2
+    errors = {**_rejected(crack, batch[:half], 0, top, method, options),
+              **_rejected(crack, batch[half:], half, top, method, options)}
+    if not errors:  # Only the texts together fail.
+        return _crack_batch(crack, batch[:half], top, method, options) + \
+            _crack_batch(crack, batch[half:], top, method, options)
+    results = iter(_crack_batch(crack, [text for i, text in enumerate(batch) if i not in errors], top, method, options))
+    return [(text, [], errors[i]) if i in errors else next(results) for i, text in enumerate(batch)]
+
+def _rejected(crack, batch, start, top, method, options):
+    """Error message by batch index (offset by start) of each text the cracker rejects, found by halving."""
+    try:
+        crack(batch, top=top, method=method, **options)
+        return {}
+    except (InvalidKeyError, InvalidTextError) as e:
+        if len(batch) == 1:
+            return {start: str(e)}
+    half = len(batch) // 2
+    return {**_rejected(crack, batch[:half], start, top, method, options),
+            **_rejected(crack, batch[half:], start + half, top, method, options)}
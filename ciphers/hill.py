@@ -1,9 +1,217 @@
-from .base import Cipher
+from .base import Cipher, CompiledKey, StreamTransform, match_input_type
+from .textform import NormalizedText, ascii_letter_values
+from . import metrics
 from . import InvalidKeyError
-import string
+from dataclasses import dataclass
 import numpy as np
 import math
 
+# Number of blocks multiplied at once; bounds the temporary arrays on huge inputs.
+_BLOCKS_PER_CHUNK = 1 << 18
+# Output letters computed at once by ``_apply_matrices``; bounds its temporary arrays.
+_MANY_ELEMENTS = 1 << 22
+
+def _inverse_mod_prime(matrix, p):
+    """
+    Invert a matrix modulo a prime with Gauss-Jordan elimination.
+
+    Args:
+        matrix (numpy.ndarray): n x n integer matrix.
+        p (int): Prime modulus.
+    Returns:
+        numpy.ndarray or None: Inverse modulo p, or None if the matrix is singular.
+    """
+    n = matrix.shape[0]
+    aug = np.concatenate([matrix % p, np.eye(n, dtype=np.int64)], axis=1)
+    for col in range(n):
+        pivots = np.flatnonzero(aug[col:, col]) + col
+        if len(pivots) == 0:
+            return None
+        row = pivots[0]
+        aug[[col, row]] = aug[[row, col]]
+        aug[col] = aug[col] * pow(int(aug[col, col]), -1, p) % p
+        factors = aug[:, col].copy()
+        factors[col] = 0
+        aug = (aug - np.outer(factors, aug[col])) % p
+    return aug[:, n:]
+
+def _inverse_mod26(matrix):
+    """
+    Invert a matrix modulo 26 exactly.
+
+    The inverse is computed modulo 2 and modulo 13 and combined with the
+    Chinese remainder theorem, since 26 = 2 * 13 is not prime.
+
+    Args:
+        matrix (numpy.ndarray): n x n integer matrix.
+    Returns:
+        numpy.ndarray or None: Inverse modulo 26, or None if it does not exist.
+    """
+    inv2 = _inverse_mod_prime(matrix, 2)
+    inv13 = _inverse_mod_prime(matrix, 13)
+    if inv2 is None or inv13 is None:
+        return None
+    # 13 = 1 (mod 2) and 14 = 1 (mod 13), both vanishing modulo the other prime.
+    return (13 * inv2 + 14 * inv13) % 26
+
+def _key_schedule(key: str):
+    """
+    Build the key matrix and its inverse modulo 26.
+
+    Args:
+        key (str): Alphabetic string, length must be a perfect square.
+    Returns:
+        tuple: (matrix, inverse) as read-only int64 arrays.
+    Raises:
+        InvalidKeyError: If key length is not a perfect square, not alphabetic, or matrix is not invertible mod 26.
+    """
+    key = key.upper()
+    L = len(key)
+    n = math.isqrt(L)
+    if n < 2 or n * n != L or not key.isalpha():
+        raise InvalidKeyError("Key for Hill cipher must be a perfect square length (e.g., 4, 9, 16) and alphabetic.")
+    nums = [ord(c) - ord('A') for c in key]
+    matrix = np.array(nums, dtype=np.int64).reshape(n, n)
+    inverse = _inverse_mod26(matrix)
+    if inverse is None:
+        raise InvalidKeyError("Key matrix is not invertible modulo 26.")
+    matrix.flags.writeable = False
+    inverse.flags.writeable = False
+    return matrix, inverse
+
+def _letters(text):
+    """
+    Extract letters as values 0..25 (A=0), dropping everything else.
+
+    Args:
+        text (str, bytes-like or NormalizedText): Input text; only ASCII letters count in bytes.
+    Returns:
+        numpy.ndarray: uint8 letter values.
+    """
+    if isinstance(text, NormalizedText):
+        return text.letters
+    if not isinstance(text, str):
+        return ascii_letter_values(text)
+    if text.isascii():
+        return ascii_letter_values(text.encode('ascii'))
+    letters = ''.join(filter(str.isalpha, text)).upper()
+    codes = np.frombuffer(letters.encode('utf-32-le'), dtype=np.uint32)
+    return ((codes.astype(np.int64) - ord('A')) % 26).astype(np.uint8)
+
+def _pad(values, n: int):
+    pad = (-len(values)) % n
+    if pad:
+        values = np.concatenate([values, np.full(pad, ord('X') - ord('A'), dtype=np.uint8)])
+    return values
+
+def _letter_values(text, n: int):
+    """
+    Extract letters as values 0..25, padded with 'X' to a multiple of n.
+
+    Args:
+        text (str or bytes-like): Input text; non-letters are dropped.
+        n (int): Block size.
+    Returns:
+        numpy.ndarray: uint8 array whose length is a multiple of n.
+    """
+    return _pad(_letters(text), n)
+
+def _apply_matrix(matrix, values) -> bytes:
+    """
+    Multiply every n-letter block by the matrix modulo 26.
+
+    Args:
+        matrix (numpy.ndarray): n x n matrix.
+        values (numpy.ndarray): uint8 letter values, length a multiple of n.
+    Returns:
+        bytes: Uppercase ASCII result.
+    """
+    n = matrix.shape[0]
+    # Products are integers below n * 25 * 25, which float32 represents exactly
+    # up to 2**24; larger keys fall back to float64.
+    dtype = np.float32 if n * 625 < 2 ** 24 else np.float64
+    key = matrix.T.astype(dtype)
+    blocks = values.reshape(-1, n)
+    out = np.empty_like(blocks)
+    for start in range(0, len(blocks), _BLOCKS_PER_CHUNK):
+        chunk = blocks[start:start + _BLOCKS_PER_CHUNK].astype(dtype)
+        # Row-major (blocks, n) @ key.T is the column form key @ (n, blocks).
+        out[start:start + _BLOCKS_PER_CHUNK] = np.remainder(chunk @ key, 26)
+    out += ord('A')
+    return out.tobytes()
+
+def _apply_matrices(matrices, values):
+    """
+    Multiply every n-letter block by a stack of matrices modulo 26.
+
+    Args:
+        matrices (numpy.ndarray): (keys, n, n) stacked matrices.
+        values (numpy.ndarray): uint8 letter values, length a multiple of n.
+    Returns:
+        numpy.ndarray: (keys, len(values)) uint8 uppercase ASCII codes.
+    """
+    keys, n = matrices.shape[:2]
+    dtype = np.float32 if n * 625 < 2 ** 24 else np.float64
+    blocks = values.reshape(-1, n).astype(dtype)
+    out = np.empty((keys, len(blocks), n), dtype=np.uint8)
+    # Products are at most n * 25 * 25; a table lookup reduces them faster than np.remainder.
+    mod26 = (np.arange(n * 625 + 1) % 26 + ord('A')).astype(np.uint8)
+    # Keys multiplied at once, so that the float products stay near _MANY_ELEMENTS.
+    step = max(1, _MANY_ELEMENTS // max(blocks.size, 1))
+    for start in range(0, keys, step):
+        chunk = matrices[start:start + step]
+        # Side by side, the transposed matrices make one (n, keys * n) operand:
+        # a single matrix product covers every key.
+        wide = chunk.transpose(2, 0, 1).reshape(n, -1).astype(dtype)
+        products = mod26.take((blocks @ wide).astype(np.int32))
+        out[start:start + step] = products.reshape(len(blocks), len(chunk), n).transpose(1, 0, 2)
+    return out.reshape(keys, -1)
+
+class _HillStream(StreamTransform):
+    """Stream transform that holds back a partial block until more letters arrive."""
+
+    def __init__(self, matrix):
+        self._matrix = matrix
+        self._pending = np.empty(0, dtype=np.uint8)
+        self._like = ''
+
+    def update(self, chunk):
+        self._like = chunk[:0]
+        values = np.concatenate([self._pending, _letters(chunk)])
+        full = len(values) - len(values) % self._matrix.shape[0]
+        self._pending = values[full:]
+        return match_input_type(_apply_matrix(self._matrix, values[:full]), chunk)
+
+    def finalize(self):
+        values, self._pending = self._pending, self._pending[:0]
+        return match_input_type(_apply_matrix(self._matrix, _pad(values, self._matrix.shape[0])), self._like)
+
+@dataclass(frozen=True, eq=False)
+class HillKey(CompiledKey):
+    """Compiled Hill key: the key matrix and its inverse modulo 26."""
+
+    matrix: np.ndarray
+    inverse: np.ndarray
+
+    @property
+    def size(self) -> int:
+        return self.matrix.shape[0]
+
+    def encrypt(self, plaintext):
+        return match_input_type(_apply_matrix(self.matrix, _letter_values(plaintext, self.size)), plaintext)
+
+    def decrypt(self, ciphertext):
+        return match_input_type(_apply_matrix(self.inverse, _letter_values(ciphertext, self.size)), ciphertext)
+
+    def encryptor(self) -> StreamTransform:
+        return _HillStream(self.matrix)
+
+    def decryptor(self) -> StreamTransform:
+        return _HillStream(self.inverse)
+
+    def segment_block(self, mode):
+        return self.size
+
 class HillCipher(Cipher):
     """Hill cipher implementation (nxn matrix, n >= 2)."""
 
@@ -18,17 +226,7 @@ class HillCipher(Cipher):
         Raises:
             InvalidKeyError: If key length is not a perfect square, not alphabetic, or matrix is not invertible mod 26.
         """
-        key = key.upper()
-        L = len(key)
-        n = int(math.sqrt(L))
-        if n < 2 or n * n != L or not key.isalpha():
-            raise InvalidKeyError("Key for Hill cipher must be a perfect square length (e.g., 4, 9, 16) and alphabetic.")
-        nums = [ord(c) - ord('A') for c in key]
-        matrix = np.array(nums).reshape(n, n)
-        det = int(round(np.linalg.det(matrix)))
-        if det == 0 or self._modinv(det, 26) is None:
-            raise InvalidKeyError("Key matrix is not invertible modulo 26.")
-        return matrix
+        return self.compile(key).matrix
 
     def _modinv(self, a, m):
         """
@@ -40,50 +238,25 @@ class HillCipher(Cipher):
         Returns:
             int or None: Modular inverse if exists, else None.
         """
-        a = a % m
-        for x in range(1, m):
-            if (a * x) % m == 1:
-                return x
-        return None
+        try:
+            return pow(a, -1, m)
+        except ValueError:
+            return None
 
     def _process_text(self, text: str, n: int):
-        text = ''.join([c.upper() for c in text if c.isalpha()])
-        pad = (-len(text)) % n
-        if pad:
-            text += 'X' * pad
-        return text
-
-    def encrypt(self, plaintext: str, key: str) -> str:
-        matrix = self._key_to_matrix(key)
-        n = matrix.shape[0]
-        text = self._process_text(plaintext, n)
-        result = ''
-        for i in range(0, len(text), n):
-            block = [ord(c) - ord('A') for c in text[i:i+n]]
-            enc = np.dot(matrix, block) % 26
-            result += ''.join(chr(num + ord('A')) for num in enc)
-        return result
-
-    def decrypt(self, ciphertext: str, key: str) -> str:
-        matrix = self._key_to_matrix(key)
-        n = matrix.shape[0]
-        det = int(round(np.linalg.det(matrix)))
-        det_inv = self._modinv(det, 26)
-        if det_inv is None:
-            raise InvalidKeyError("Key matrix is not invertible modulo 26.")
-        # Compute matrix of cofactors
-        cofactors = np.zeros_like(matrix)
-        for r in range(n):
-            for c in range(n):
-                minor = np.delete(np.delete(matrix, r, axis=0), c, axis=1)
-                cof = ((-1) ** (r + c)) * int(round(np.linalg.det(minor)))
-                cofactors[r, c] = cof
-        adjugate = cofactors.T % 26
-        inv_matrix = (det_inv * adjugate) % 26
-        text = self._process_text(ciphertext, n)
-        result = ''
-        for i in range(0, len(text), n):
-            block = [ord(c) - ord('A') for c in text[i:i+n]]
-            dec = np.dot(inv_matrix, block) % 26
-            result += ''.join(chr(int(num) + ord('A')) for num in dec)
-        return result 
\ No newline at end of file
+        values = _letter_values(text, n)
+        return (values + ord('A')).tobytes().decode('ascii')
+
+    def _compile_key(self, key: str) -> HillKey:
+        return HillKey(key, *_key_schedule(key))
+
+    def _many_rows(self, text, compiled_keys, mode):
+        # Keys of different sizes give outputs of different lengths.
+        if len({k.size for k in compiled_keys}) > 1:
+            return None
+        matrices = np.stack([k.matrix if mode == 'encrypt' else k.inverse for k in compiled_keys])
+        return _apply_matrices(matrices, _letter_values(text, compiled_keys[0].size))
+
+# Timed while metrics are enabled.
+metrics.probe(globals(), 'hill', 'normalize', '_letters')
+metrics.probe(globals(), 'hill', 'blocks', '_apply_matrix', arg=1)
@@ -0,0 +1,314 @@
+from abc import ABC, abstractmethod
+from .base import BYTES_TYPES
+from .textform import ascii_letter_count
+import sys
+
+def _common_prefix(old: str, new: str) -> int:
+    """Length of the longest common prefix, found by comparing slices."""
+    lo, hi = 0, min(len(old), len(new))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if old[lo:mid] == new[lo:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+def _common_suffix(old: str, new: str, limit: int) -> int:
+    """Length of the longest common suffix, at most ``limit``."""
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if old[len(old) - mid:len(old) - lo] == new[len(new) - mid:len(new) - lo]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+def _edit(old: str, new: str):
+    """
+    Locate the edit that turns old into new.
+
+    Returns:
+        tuple: (prefix, suffix) lengths shared by both texts; they never overlap.
+    """
+    prefix = _common_prefix(old, new)
+    return prefix, _common_suffix(old, new, min(len(old), len(new)) - prefix)
+
+def _letter_count(text: str) -> int:
+    """Number of letters, counted like the ciphers that skip non-letters."""
+    if text.isascii():
+        return ascii_letter_count(text.encode('ascii'))
+    return sum(map(str.isalpha, text))
+
+class LivePreview:
+    """
+    Keeps the output of one compiled key up to date while its input is edited.
+
+    This base class recomputes the whole text on every update; the subclasses
+    re-encipher only what an edit can affect. ``recomputed`` is the number of
+    characters (letters for block ciphers) enciphered by the last update.
+    """
+
+    def __init__(self, compiled, mode='encrypt'):
+        self.compiled = compiled
+        self.mode = mode
+        self.text = ''
+        self.output = ''
+        self.recomputed = 0
+
+    def _transform(self, text):
+        return self.compiled.encrypt(text) if self.mode == 'encrypt' else self.compiled.decrypt(text)
+
+    def _recompute(self, text):
+        self.recomputed = len(text)
+        return self._transform(text)
+
+    def update(self, text: str) -> str:
+        """
+        Return the output for the edited text.
+
+        Args:
+            text (str): The whole current input.
+        Returns:
+            str: The same output as enciphering ``text`` in one go.
+        Raises:
+            InvalidTextError: If the cipher rejects the text; the previous
+                state is kept.
+        """
+        if isinstance(text, BYTES_TYPES):
+            raise TypeError("Live previews work on str input.")
+        if text != self.text:
+            self.output = self._recompute(text)
+            self.text = text
+        else:
+            self.recomputed = 0
+        return self.output
+
+class _LocalPreview(LivePreview):
+    """Ciphers that map every character on its own: only the edited span changes."""
+
+    def _recompute(self, text):
+        prefix, suffix = _edit(self.text, text)
+        middle = text[prefix:len(text) - suffix]
+        self.recomputed = len(middle)
+        return self.output[:prefix] + self._transform(middle) + self.output[len(self.output) - suffix:]
+
+class _KeyedPreview(LivePreview):
+    """
+    Ciphers whose key position advances with every letter.
+
+    The edited span is enciphered from the key position of the unchanged
+    prefix; the rest is reused unless the edit changed the letter count by
+    something other than a multiple of the key period.
+    """
+
+    def __init__(self, compiled, mode='encrypt'):
+        super().__init__(compiled, mode)
+        self.period = len(compiled.key)
+
+    def _from_offset(self, text, offset):
+        stream = self.compiled.encryptor() if self.mode == 'encrypt' else self.compiled.decryptor()
+        stream.update('a' * offset)
+        return stream.update(text)
+
+    def _recompute(self, text):
+        prefix, suffix = _edit(self.text, text)
+        middle = text[prefix:len(text) - suffix]
+        offset = _letter_count(text[:prefix]) % self.period
+        letters = _letter_count(middle)
+        output = self.output[:prefix] + self._from_offset(middle, offset)
+        self.recomputed = len(middle)
+        shift = (letters - _letter_count(self.text[prefix:len(self.text) - suffix])) % self.period
+        if shift == 0:
+            return output + self.output[len(self.output) - suffix:]
+        self.recomputed += suffix
+        return output + self._from_offset(text[len(text) - suffix:], (offset + letters) % self.period)
+
+class _BlockPreview(LivePreview, ABC):
+    """
+    Ciphers that encipher the letter stream in blocks.
+
+    The output only holds letters, each block of the prepared stream (the
+    letters plus any inserted or padding letters) giving one output block.
+    An edit re-enciphers the block around its first changed letter and every
+    block after it until the old and new streams start a block on the same
+    unchanged letter again; from there the old output is reused. The
+    unchanged letters after the edit are scanned in growing windows, so a
+    resynchronising edit costs about the size of the edit.
+    """
+
+    # Unchanged letters first scanned for a block boundary after an edit.
+    _WINDOW = 64
+
+    def __init__(self, compiled, mode='encrypt'):
+        import numpy as np
+        super().__init__(compiled, mode)
+        self.letters = np.empty(0, dtype=np.uint8)
+        # Prepared stream index of every letter.
+        self.positions = np.empty(0, dtype=np.int64)
+
+    @property
+    @abstractmethod
+    def block_size(self) -> int:
+        """Letters per block of the prepared stream."""
+        pass
+
+    @abstractmethod
+    def _letters(self, text):
+        """Letter values of a text, as the cipher extracts them."""
+        pass
+
+    @abstractmethod
+    def _positions(self, letters):
+        """Prepared stream index of every letter of a run starting a block."""
+        pass
+
+    @abstractmethod
+    def _prepare(self, letters, pad):
+        """Prepared stream of a run starting a block, padded to whole blocks if pad."""
+        pass
+
+    @abstractmethod
+    def _encipher(self, prepared) -> str:
+        pass
+
+    def _letter_count(self, text) -> int:
+        # Uppercasing can turn one non-ASCII letter into two ('ß' -> 'SS'), so those are counted as the cipher extracts them.
+        return _letter_count(text) if text.isascii() else len(self._letters(text))
+
+    def _inserts_letters(self) -> bool:
+        """Whether letters are inserted between text letters, not only padded at the end."""
+        return True
+
+    def _recompute(self, text):
+        import numpy as np
+        n = self.block_size
+        prefix, suffix = _edit(self.text, text)
+        old_letters, old_positions = self.letters, self.positions
+        before = self._letter_count(text[:prefix])
+        tail = len(old_letters) - self._letter_count(text[len(text) - suffix:])
+        # Blocks before the one holding the first prepared letter after the prefix are kept.
+        first = int(old_positions[before - 1]) + 1 if before else 0
+        start = first - first % n
+        restart = int(np.searchsorted(old_positions[:before], start))
+        edited = np.concatenate([old_letters[restart:before], self._letters(text[prefix:len(text) - suffix])])
+        window = self._WINDOW
+        if not self._inserts_letters() and (len(edited) - (tail - restart)) % n:
+            window = len(old_letters)  # Every later block shifts.
+        while True:
+            region = np.concatenate([edited, old_letters[tail:tail + window]])
+            positions = self._positions(region) + start
+            # Unchanged letters that start a block in both the old and the new stream.
+            aligned = np.flatnonzero((positions[len(edited):] % n == 0)
+                                     & (old_positions[tail:tail + window] % n == 0))
+            if len(aligned) or tail + window >= len(old_letters):
+                break
+            window *= 2
+        if len(aligned):
+            split = len(edited) + aligned[0]
+            end, old_end = int(positions[split]), int(old_positions[tail + aligned[0]])
+            prepared = self._prepare(region[:split + 1], False)[:end - start]
+            output = self.output[:start] + self._encipher(prepared) + self.output[old_end:]
+            positions = np.concatenate([old_positions[:restart], positions[:split],
+                                        old_positions[tail + aligned[0]:] + (end - old_end)])
+        else:
+            prepared = self._prepare(region, True)
+            end = start + len(prepared)
+            output = self.output[:start] + self._encipher(prepared)
+            positions = np.concatenate([old_positions[:restart], positions])
+        self.letters = np.concatenate([old_letters[:restart], region[:len(edited)], old_letters[tail:]])
+        self.positions = positions
+        self.recomputed = end - start
+        return output
+
+class _HillPreview(_BlockPreview):
+    @property
+    def block_size(self):
+        return self.compiled.size
+
+    def _inserts_letters(self):
+        return False
+
+    def _letters(self, text):
+        from .hill import _letters
+        return _letters(text)
+
+    def _positions(self, letters):
+        import numpy as np
+        return np.arange(len(letters))
+
+    def _prepare(self, letters, pad):
+        from .hill import _pad
+        return _pad(letters, self.block_size) if pad else letters
+
+    def _encipher(self, prepared):
+        from .hill import _apply_matrix
+        matrix = self.compiled.matrix if self.mode == 'encrypt' else self.compiled.inverse
+        return _apply_matrix(matrix, prepared).decode('ascii')
+
+class _PlayfairPreview(_BlockPreview):
+    block_size = 2
+
+    def _inserts_letters(self):
+        return self.mode == 'encrypt'
+
+    def _letters(self, text):
+        from .playfair import _letter_values
+        return _letter_values(text)
+
+    def _positions(self, letters):
+        import numpy as np
+        if self.mode == 'decrypt':
+            return np.arange(len(letters))
+        from .playfair import _digraph_inserts
+        indices = np.arange(len(letters))
+        return indices + np.searchsorted(_digraph_inserts(letters), indices, side='right')
+
+    def _prepare(self, letters, pad):
+        from . import InvalidTextError
+        from .playfair import _prepare_digraphs
+        if self.mode == 'encrypt':
+            return _prepare_digraphs(letters, pad)
+        if pad and len(letters) % 2:
+            raise InvalidTextError("Playfair ciphertext must contain an even number of letters.")
+        return letters
+
+    def _encipher(self, prepared):
+        from .playfair import _substitute
+        table = self.compiled.encrypt_table if self.mode == 'encrypt' else self.compiled.decrypt_table
+        return _substitute(prepared, self.compiled.index, table).decode('ascii')
+
+# Compiled key class -> preview, by module so that no cipher module is imported here.
+_PREVIEWS = [
+    ('ciphers.caesar', 'CaesarKey', _LocalPreview),
+    ('ciphers.substitution', 'SubstitutionKey', _LocalPreview),
+    ('ciphers.vigenere', 'VigenereKey', _KeyedPreview),
+    ('ciphers.hill', 'HillKey', _HillPreview),
+    ('ciphers.playfair', 'PlayfairKey', _PlayfairPreview),
+]
+
+def live_preview(compiled, mode='encrypt') -> LivePreview:
+    """
+    Create the incremental preview that fits a compiled key.
+
+    Caesar and Substitution re-encipher only the edited span, Vigenère the
+    edited span from its key position (and the rest only when the key
+    position after it moved), Hill and Playfair only the enclosing blocks or
+    digraphs. Other ciphers, such as plugins, recompute the whole text.
+
+    Args:
+        compiled (CompiledKey): Key from ``Cipher.compile``.
+        mode (str): 'encrypt' or 'decrypt'.
+    Returns:
+        LivePreview: Preview whose ``update(text)`` returns the output for text.
+    Raises:
+        ValueError: If mode is not 'encrypt' or 'decrypt'.
+    """
+    if mode not in ('encrypt', 'decrypt'):
+        raise ValueError(f"Unknown mode {mode!r}; use 'encrypt' or 'decrypt'.")
+    for module_name, class_name, preview in _PREVIEWS:
+        module = sys.modules.get(module_name)
+        if module is not None and type(compiled) is getattr(module, class_name):
+            return preview(compiled, mode)
+    return LivePreview(compiled, mode)
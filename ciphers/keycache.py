@@ -0,0 +1,86 @@
+from collections import OrderedDict, namedtuple
+import os
+import threading
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+DEFAULT_MAXSIZE = int(os.environ.get('CIPHER_KEY_CACHE_SIZE', 256))
+
+class KeyCache:
+    """Thread-safe LRU cache of compiled keys, shared by all ciphers."""
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, cipher, key: str):
+        """
+        Return the compiled key for a cipher, compiling it on a miss.
+
+        Args:
+            cipher (Cipher): Cipher instance that owns the key.
+            key (str): Key string as given by the caller.
+        Returns:
+            CompiledKey: The prepared key.
+        Raises:
+            InvalidKeyError: If the key is invalid (invalid keys are not cached).
+        """
+        cache_key = (type(cipher), key)
+        with self._lock:
+            compiled = self._entries.get(cache_key)
+            if compiled is not None:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return compiled
+            self.misses += 1
+        compiled = cipher._compile_key(key)
+        with self._lock:
+            if self._maxsize > 0:
+                self._entries[cache_key] = compiled
+                self._evict()
+        return compiled
+
+    def resize(self, maxsize: int):
+        """
+        Change the maximum number of cached keys, evicting the oldest if needed.
+
+        Args:
+            maxsize (int): New capacity; 0 disables caching.
+        """
+        if maxsize < 0:
+            raise ValueError("Key cache size must be non-negative.")
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+    def clear(self):
+        """Drop all cached keys and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self._maxsize, len(self._entries))
+
+    def _evict(self):
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+KEY_CACHE = KeyCache()
+
+def key_cache_info() -> CacheInfo:
+    """Return hit/miss counters and size of the process-wide key cache."""
+    return KEY_CACHE.info()
+
+def set_key_cache_size(maxsize: int):
+    """Set the capacity of the process-wide key cache."""
+    KEY_CACHE.resize(maxsize)
+
+def clear_key_cache():
+    """Empty the process-wide key cache."""
+    KEY_CACHE.clear()
@@ -0,0 +1,310 @@
+"""
+Counters and latency histograms per cipher, mode and phase.
+
+Metrics are off by default and then cost nothing: the hot paths are only
+wrapped with timers while metrics are enabled. Phases:
+
+- ``key_setup``: building a key schedule (key cache misses only).
+- ``transform``: a whole ``encrypt`` or ``decrypt`` call on a compiled key.
+- ``normalize``: extracting and preparing the letters (Hill, Playfair).
+- ``blocks``: the per-block matrix or digraph work (Hill, Playfair).
+- ``io``: reading and writing, recorded by callers such as ``cli.py``.
+
+Usage:
+    from ciphers import metrics
+    metrics.enable()
+    ...
+    print(metrics.summary())
+"""
+from bisect import bisect_right
+from collections import namedtuple
+import functools
+import threading
+import time
+
+# Latency histogram bucket bounds in nanoseconds: four buckets per power of two, up to ~39 hours.
+BUCKET_BOUNDS = [(4 + i % 4 + 1) << (i // 4) for i in range(4 * 45)]
+# Methods of compiled keys and ciphers timed while enabled: name -> (phase, mode).
+KEY_METHODS = {'encrypt': ('transform', 'encrypt'), 'decrypt': ('transform', 'decrypt')}
+CIPHER_METHODS = {'_compile_key': ('key_setup', '-')}
+
+PhaseStats = namedtuple('PhaseStats', ['calls', 'items', 'total_ns', 'p50_ns', 'p99_ns', 'max_ns'])
+
+enabled = False
+_lock = threading.Lock()
+_stats = {}
+# [namespace, name, original, wrapper]; namespace is a class or a module's globals.
+_probes = []
+_context = threading.local()
+
+class _Histogram:
+    __slots__ = ('calls', 'items', 'total_ns', 'max_ns', 'buckets')
+
+    def __init__(self):
+        self.calls = 0
+        self.items = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)
+
+    def add(self, ns, items):
+        self.calls += 1
+        self.items += items
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+        self.buckets[bisect_right(BUCKET_BOUNDS, ns)] += 1
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of calls."""
+        rank = fraction * self.calls
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank and count:
+                return min(BUCKET_BOUNDS[bucket], self.max_ns) if bucket < len(BUCKET_BOUNDS) else self.max_ns
+        return self.max_ns
+
+def cipher_name(cls) -> str:
+    """Short cipher name for a cipher or compiled key class, e.g. HillKey -> 'hill'."""
+    name = cls.__name__
+    for suffix in ('Cipher', 'Key'):
+        if name.endswith(suffix) and name != suffix:
+            name = name[:-len(suffix)]
+            break
+    return name.lower()
+
+def record(cipher, mode, phase, ns, items=0):
+    """
+    Add one timed call.
+
+    Args:
+        cipher (str): Cipher name, or another component such as 'cli'.
+        mode (str): 'encrypt', 'decrypt', or '-' when it does not apply.
+        phase (str): Phase name.
+        ns (int): Duration in nanoseconds.
+        items (int): Characters (or bytes, letters) processed.
+    """
+    with _lock:
+        histogram = _stats.get((cipher, mode, phase))
+        if histogram is None:
+            histogram = _stats[(cipher, mode, phase)] = _Histogram()
+        histogram.add(ns, items)
+
+class timed:
+    """
+    Context manager recording the duration of its block, if metrics are enabled.
+
+    Args:
+        phase (str): Phase name.
+        cipher (str): Cipher or component name.
+        mode (str): Mode, '-' when it does not apply.
+        items (int): Characters processed; may be set on the object inside the block.
+    """
+
+    def __init__(self, phase, cipher='-', mode='-', items=0):
+        self.phase = phase
+        self.cipher = cipher
+        self.mode = mode
+        self.items = items
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        if enabled:
+            record(self.cipher, self.mode, self.phase, time.perf_counter_ns() - self._start, self.items)
+        return False
+
+def _size(value) -> int:
+    try:
+        return len(value)
+    except TypeError:
+        return 0
+
+def _timer(func, cipher, phase, mode, arg):
+    """
+    Wrap a function with a timer counting the length of argument ``arg`` as items.
+
+    With a mode, the call also becomes the context that nested probes
+    without one (normalize, blocks) are attributed to.
+    """
+    @functools.wraps(func)
+    def timed_call(*args, **kwargs):
+        outer = getattr(_context, 'current', None)
+        current = (cipher, mode) if mode is not None else outer or (cipher, '-')
+        _context.current = current
+        start = time.perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            _context.current = outer
+            record(current[0], current[1], phase, elapsed,
+                   _size(args[arg]) if arg is not None and len(args) > arg else 0)
+    return timed_call
+
+def _install(probe):
+    namespace, name, original, wrapper = probe
+    if isinstance(namespace, dict):
+        namespace[name] = wrapper
+    else:
+        setattr(namespace, name, wrapper)
+
+def _uninstall(probe):
+    namespace, name, original, wrapper = probe
+    if isinstance(namespace, dict):
+        namespace[name] = original
+    else:
+        setattr(namespace, name, original)
+
+def _add_probe(namespace, name, wrapper_for):
+    original = namespace[name] if isinstance(namespace, dict) else namespace.__dict__[name]
+    probe = [namespace, name, original, wrapper_for(original)]
+    with _lock:
+        _probes.append(probe)
+        if enabled:
+            _install(probe)
+
+def instrument_class(cls, methods):
+    """
+    Register the methods a class defines itself as probes.
+
+    Called from ``__init_subclass__`` of ``Cipher`` and ``CompiledKey``, so
+    every cipher, including plugins, is covered.
+
+    Args:
+        cls (type): The class.
+        methods (dict): Method name -> (phase, mode) as in ``KEY_METHODS``.
+    """
+    name = cipher_name(cls)
+    for method, (phase, mode) in methods.items():
+        if method in cls.__dict__:
+            # The text after self is counted; key setup has no text.
+            arg = 1 if phase == 'transform' else None
+            _add_probe(cls, method, lambda func, phase=phase, mode=mode, arg=arg: _timer(func, name, phase, mode, arg))
+
+def probe(namespace, cipher, phase, *names, arg=0):
+    """
+    Register module functions as probes of a phase.
+
+    The functions are replaced in the module namespace while metrics are
+    enabled, so calls through the module globals are timed.
+
+    Args:
+        namespace (dict): The module's ``globals()``.
+        cipher (str): Cipher name.
+        phase (str): Phase name.
+        *names (str): Function names.
+        arg (int): Position of the argument whose length is counted as items.
+    """
+    for name in names:
+        _add_probe(namespace, name, lambda func: _timer(func, cipher, phase, None, arg))
+
+def enable():
+    """Start recording; installs the timers on every registered probe."""
+    global enabled
+    with _lock:
+        if not enabled:
+            enabled = True
+            for p in _probes:
+                _install(p)
+
+def disable():
+    """Stop recording and restore the original functions; collected metrics are kept."""
+    global enabled
+    with _lock:
+        if enabled:
+            enabled = False
+            for p in _probes:
+                _uninstall(p)
+
+def reset():
+    """Drop everything recorded so far."""
+    with _lock:
+        _stats.clear()
+
+def snapshot() -> dict:
+    """
+    Return the metrics recorded so far.
+
+    Returns:
+        dict: (cipher, mode, phase) -> PhaseStats.
+    """
+    with _lock:
+        return {key: PhaseStats(h.calls, h.items, h.total_ns, h.percentile(0.5), h.percentile(0.99), h.max_ns)
+                for key, h in _stats.items()}
+
+def summary(wall_seconds=None) -> str:
+    """
+    Format the recorded metrics and the key cache counters as a table.
+
+    Args:
+        wall_seconds (float or None): Elapsed time of the whole run, shown
+            with the overall throughput of the transform phase.
+    Returns:
+        str: Multi-line summary.
+    """
+    from .keycache import key_cache_info
+    stats = snapshot()
+    lines = []
+    if wall_seconds is not None:
+        chars = sum(s.items for (_, _, phase), s in stats.items() if phase == 'transform')
+        lines.append(f"Wall time {wall_seconds:.3f} s, {chars} characters transformed "
+                     f"({chars / max(wall_seconds, 1e-9) / 1e6:.2f} MB/s)")
+    info = key_cache_info()
+    lines.append(f"Key cache: {info.hits} hits, {info.misses} misses, {info.currsize}/{info.maxsize} keys")
+    lines.append(f"{'cipher':<14}{'mode':<9}{'phase':<11}{'calls':>9}{'chars':>12}{'total ms':>11}"
+                 f"{'MB/s':>9}{'p50 us':>9}{'p99 us':>9}")
+    for (cipher, mode, phase), s in sorted(stats.items()):
+        rate = f"{s.items / max(s.total_ns, 1) * 1e3:.2f}" if s.items else '-'
+        lines.append(f"{cipher:<14}{mode:<9}{phase:<11}{s.calls:>9}{s.items:>12}{s.total_ns / 1e6:>11.2f}"
+                     f"{rate:>9}{s.p50_ns / 1e3:>9.1f}{s.p99_ns / 1e3:>9.1f}")
+    return '\n'.join(lines)
+
+def collapsed_stacks(profile) -> dict:
+    """
+    Turn cProfile statistics into collapsed stacks for flame graph tools.
+
+    cProfile keeps only caller -> callee edges, so each function's time is
+    split over its call paths in proportion to the time of each edge.
+
+    Args:
+        profile (pstats.Stats): Loaded profile.
+    Returns:
+        dict: 'root;caller;function' -> microseconds spent in the function itself.
+    """
+    stats = profile.stats
+    callees = {}
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge))
+    stacks = {}
+
+    def label(func):
+        filename, line, name = func
+        return f"{name} ({filename.rsplit('/', 1)[-1]}:{line})" if line else name
+
+    def visit(func, path, share):
+        _, _, tottime, cumtime, _ = stats[func]
+        path = path + (label(func),)
+        own = int(tottime * share * 1e6)
+        if own:
+            key = ';'.join(path)
+            stacks[key] = stacks.get(key, 0) + own
+        for callee, (_, _, _, edge_cumtime) in callees.get(func, ()):
+            # Paths under a microsecond are dropped; they would not show in a flame graph.
+            if share * edge_cumtime >= 1e-6 and label(callee) not in path:
+                visit(callee, path, share * edge_cumtime / stats[callee][3])
+
+    for func, (_, _, _, _, callers) in stats.items():
+        if not callers:
+            visit(func, (), 1.0)
+    return stacks
+
+def write_collapsed(profile, path):
+    """Write ``collapsed_stacks`` as 'stack microseconds' lines, the flamegraph.pl input format."""
+    with open(path, 'w', encoding='utf-8') as f:
+        for stack, micros in sorted(collapsed_stacks(profile).items()):
+            f.write(f"{stack} {micros}\n")
@@ -0,0 +1,230 @@
+"""
+Parallel encryption of one large document through shared memory.
+
+The document is placed in a ``multiprocessing.shared_memory`` block once and
+cut into one segment per worker process; workers attach to the block by name,
+so no segment is copied through a pipe.
+
+- Caesar, Substitution and Vigenère preserve length and transform their
+  segment in place with ``encrypt_into``. Vigenère segments start at the key
+  position given by the letters before them, which the workers count first.
+- Hill, and Playfair decryption, turn every n-letter block into n letters and
+  drop everything else. Cuts are moved forward to the next multiple of n
+  letters, and each segment writes its letters into a second shared block at
+  its letter offset.
+- Playfair encryption pairs letters depending on all letters before them and
+  runs serially, as does any document too small to split.
+
+The output is identical to ``compiled.encrypt(data)`` on the whole bytes.
+
+Usage:
+    from ciphers import get_cipher
+    from ciphers.parallel import parallel_transform_file
+    key = get_cipher('vigenere').compile('lemon')
+    with open('out.txt', 'wb') as sink:
+        parallel_transform_file(key, 'encrypt', 'book.txt', sink, workers=8)
+"""
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+from multiprocessing import shared_memory
+import os
+from .base import INPLACE_BLOCK_SIZE
+from .textform import ascii_letter_count
+
+# Documents are only split into segments of at least this many bytes.
+MIN_SEGMENT = 1 << 20
+# Bytes scanned at once when a cut moves forward to a block boundary.
+_SCAN_WINDOW = 4096
+
+_worker_key = None
+
+def _init_worker(compiled):
+    global _worker_key
+    _worker_key = compiled
+
+def _count_letters(name, start, end) -> int:
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        return sum(ascii_letter_count(shm.buf[s:min(s + INPLACE_BLOCK_SIZE, end)])
+                   for s in range(start, end, INPLACE_BLOCK_SIZE))
+    finally:
+        shm.close()
+
+def _transform_in_place(name, mode, start, end, offset):
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        with shm.buf[start:end] as segment:
+            if mode == 'encrypt':
+                _worker_key.encrypt_into(segment, offset)
+            else:
+                _worker_key.decrypt_into(segment, offset)
+    finally:
+        shm.close()
+
+def _transform_blocks(name, out_name, mode, start, end, out_start) -> int:
+    shm = shared_memory.SharedMemory(name=name)
+    out = shared_memory.SharedMemory(name=out_name)
+    try:
+        data = bytes(shm.buf[start:end])
+        result = _worker_key.encrypt(data) if mode == 'encrypt' else _worker_key.decrypt(data)
+        out.buf[out_start:out_start + len(result)] = result
+        return len(result)
+    finally:
+        shm.close()
+        out.close()
+
+def split_points(size: int, workers: int, min_segment: int = MIN_SEGMENT):
+    """
+    Cut a document into up to ``workers`` segments of at least ``min_segment`` bytes.
+
+    Returns:
+        list[int]: Cut offsets, starting with 0 and ending with ``size``.
+    """
+    segments = max(1, min(workers, size // max(min_segment, 1)))
+    return [size * i // segments for i in range(segments + 1)]
+
+def _skip_letters(buf, pos: int, count: int, size: int) -> int:
+    """Return the offset just after the count-th letter at or after pos (pos for 0, size if there are fewer)."""
+    if count == 0:
+        return pos
+    window = _SCAN_WINDOW
+    while pos < size:
+        chunk = bytes(buf[pos:min(pos + window, size)])
+        for i, b in enumerate(chunk):
+            if ord('a') <= b | 32 <= ord('z'):
+                count -= 1
+                if not count:
+                    return pos + i + 1
+        pos += len(chunk)
+        window *= 2
+    return size
+
+def _align(buf, cuts, before, block):
+    """
+    Move the inner cuts forward until a multiple of ``block`` letters precedes each.
+
+    Args:
+        buf: The document.
+        cuts (list[int]): Cut offsets from ``split_points``.
+        before (list[int]): Letters before each cut.
+        block (int): Letters per block.
+    Returns:
+        tuple: (cuts, letters before each cut); cuts that meet or pass the
+            next one are dropped.
+    """
+    size = cuts[-1]
+    aligned, aligned_before = [0], [0]
+    for cut, letters in zip(cuts[1:-1], before[1:-1]):
+        missing = -letters % block
+        cut = _skip_letters(buf, cut, missing, size)
+        if aligned[-1] < cut < size:
+            aligned.append(cut)
+            aligned_before.append(letters + missing)
+    return aligned + [size], aligned_before + [before[-1]]
+
+def _serial(compiled, mode, data):
+    return compiled.encrypt(data) if mode == 'encrypt' else compiled.decrypt(data)
+
+def _transform_shared(compiled, mode, shm, size, workers, min_segment, sink):
+    """Transform the first ``size`` bytes of ``shm`` and pass the output to ``sink`` as a memoryview."""
+    block = compiled.segment_block(mode)
+    cuts = split_points(size, workers, min_segment)
+    if block is None or len(cuts) == 2:
+        sink(memoryview(_serial(compiled, mode, bytes(shm.buf[:size]))))
+        return
+    with ProcessPoolExecutor(max_workers=len(cuts) - 1, initializer=_init_worker, initargs=(compiled,)) as pool:
+        names = [shm.name] * (len(cuts) - 1)
+        before = [0] * len(cuts)
+        if block or compiled.letter_positions:
+            # Letter counts per segment, in parallel; their prefix sums are the offsets.
+            counts = pool.map(_count_letters, names, cuts[:-1], cuts[1:])
+            before = [0] + list(accumulate(counts))
+        if not block:
+            list(pool.map(_transform_in_place, names, [mode] * len(names), cuts[:-1], cuts[1:], before[:-1]))
+            with shm.buf[:size] as output:
+                sink(output)
+            return
+        cuts, before = _align(shm.buf, cuts, before, block)
+        out = shared_memory.SharedMemory(create=True, size=max(1, -(-before[-1] // block) * block))
+        try:
+            count = len(cuts) - 1
+            lengths = pool.map(_transform_blocks, [shm.name] * count, [out.name] * count, [mode] * count,
+                               cuts[:-1], cuts[1:], before[:-1])
+            with out.buf[:sum(lengths)] as output:
+                sink(output)
+        finally:
+            out.close()
+            out.unlink()
+
+def _run(compiled, mode, size, fill, workers, min_segment, sink):
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    try:
+        fill(shm.buf)
+        _transform_shared(compiled, mode, shm, size, workers or os.cpu_count() or 1, min_segment, sink)
+    finally:
+        shm.close()
+        shm.unlink()
+
+def parallel_transform(compiled, mode, data, workers=None, min_segment=MIN_SEGMENT) -> bytes:
+    """
+    Encrypt or decrypt one bytes payload on several processes.
+
+    Args:
+        compiled (CompiledKey): Compiled key.
+        mode (str): 'encrypt' or 'decrypt'.
+        data (bytes-like): The document; only its ASCII letters are letters.
+        workers (int or None): Worker processes; defaults to the CPU count.
+        min_segment (int): Smallest segment worth a process, in bytes.
+    Returns:
+        bytes: Same as ``compiled.encrypt(data)`` (or ``decrypt``).
+    Raises:
+        InvalidTextError: If the cipher rejects the text, as in the serial call.
+    """
+    data = memoryview(data).cast('B')
+    result = []
+
+    def fill(buf):
+        buf[:len(data)] = data
+
+    _run(compiled, mode, len(data), fill, workers, min_segment, lambda output: result.append(bytes(output)))
+    return result[0]
+
+def parallel_transform_file(compiled, mode, path, sink, workers=None, min_segment=MIN_SEGMENT) -> int:
+    """
+    Encrypt or decrypt a file as one document on several processes.
+
+    The file is read straight into shared memory and the output is written
+    from it, so the document is held once (twice for Hill and Playfair).
+
+    Args:
+        compiled (CompiledKey): Compiled key.
+        mode (str): 'encrypt' or 'decrypt'.
+        path (str): Input file.
+        sink: Binary file object the output is written to.
+        workers (int or None): Worker processes; defaults to the CPU count.
+        min_segment (int): Smallest segment worth a process, in bytes.
+    Returns:
+        int: Bytes written.
+    Raises:
+        OSError: If the file cannot be read or the output written.
+        InvalidTextError: If the cipher rejects the text.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        written = []
+
+        def fill(buf):
+            with buf[:size] as view:
+                read = 0
+                while read < size:
+                    n = f.readinto(view[read:])
+                    if not n:
+                        raise OSError(f"{path}: file shrank while reading")
+                    read += n
+
+        def write(output):
+            sink.write(output)
+            written.append(len(output))
+
+        _run(compiled, mode, size, fill, workers, min_segment, write)
+    return written[0]
@@ -1,6 +1,223 @@
-from .base import Cipher
-from . import InvalidKeyError
+from .base import Cipher, CompiledKey, StreamTransform, match_input_type
+from .textform import NormalizedText, ascii_letter_values
+from . import metrics
+from . import InvalidKeyError, InvalidTextError
+from dataclasses import dataclass
 import string
+import numpy as np
+
+_X = ord('X') - ord('A')
+# Output letters produced at once by ``_substitute_many``; bounds its temporary arrays.
+_MANY_BLOCK = 1 << 22
+
+def _digraph_table(square, shift):
+    """
+    Build the 25x25 digraph substitution table for a square.
+
+    Args:
+        square (numpy.ndarray): 25 letter values in row-major order.
+        shift (int): +1 for encryption, -1 for decryption.
+    Returns:
+        numpy.ndarray: (625, 2) uint8 array of output letter values, indexed by
+            ``pos_a * 25 + pos_b`` where pos is a square position.
+    """
+    pos = np.arange(25)
+    row_a, col_a = np.divmod(pos[:, None], 5)
+    row_b, col_b = np.divmod(pos[None, :], 5)
+    row_a, col_a = np.broadcast_to(row_a, (25, 25)), np.broadcast_to(col_a, (25, 25))
+    row_b, col_b = np.broadcast_to(row_b, (25, 25)), np.broadcast_to(col_b, (25, 25))
+    same_row = row_a == row_b
+    same_col = ~same_row & (col_a == col_b)
+    out_a = np.where(same_row, row_a * 5 + (col_a + shift) % 5,
+                     np.where(same_col, (row_a + shift) % 5 * 5 + col_a, row_a * 5 + col_b))
+    out_b = np.where(same_row, row_b * 5 + (col_b + shift) % 5,
+                     np.where(same_col, (row_b + shift) % 5 * 5 + col_b, row_b * 5 + col_a))
+    table = np.ascontiguousarray(np.stack([square[out_a], square[out_b]], axis=-1).reshape(625, 2))
+    table.flags.writeable = False
+    return table
+
+def _letter_values(text):
+    """
+    Extract uppercase letters as values 0..25.
+
+    Args:
+        text (str, bytes-like or NormalizedText): Input text; non-letters are dropped.
+    Returns:
+        numpy.ndarray: uint8 letter values.
+    Raises:
+        InvalidTextError: If a str contains non-ASCII letters.
+    """
+    if isinstance(text, NormalizedText):
+        return text.letters
+    if not isinstance(text, str):
+        return ascii_letter_values(text)
+    if not text.isascii():
+        text = ''.join(filter(str.isalpha, text)).upper()
+        if not text.isascii():
+            bad = next(c for c in text if not c.isascii())
+            raise InvalidTextError(f"Character {bad} not found in Playfair square.")
+    return ascii_letter_values(text.encode('ascii'))
+
+def _digraph_inserts(values):
+    """
+    Letter indices before which an 'X' goes, between doubled letters.
+
+    A doubled pair at letter index k gets an 'X' only when k starts a
+    digraph. Whether it does depends only on the previous doubled pair: after
+    any double at k', the next letter index that starts a digraph has the
+    opposite parity of k'. That makes every insertion decision independent.
+
+    Args:
+        values (numpy.ndarray): uint8 letter values.
+    Returns:
+        numpy.ndarray: Sorted indices, as taken by ``numpy.insert``.
+    """
+    doubles = np.flatnonzero(values[:-1] == values[1:])
+    if len(doubles) == 0:
+        return doubles
+    parity = np.empty_like(doubles)
+    parity[0] = 0
+    parity[1:] = 1 - doubles[:-1] % 2
+    return doubles[(doubles + parity) % 2 == 0] + 1
+
+def _prepare_digraphs(values, pad=True):
+    """
+    Split letters into digraphs, inserting 'X' between doubled letters.
+
+    Args:
+        values (numpy.ndarray): uint8 letter values.
+        pad (bool): Append 'X' if the result has odd length.
+    Returns:
+        numpy.ndarray: uint8 letter values, of even length when padded.
+    """
+    inserts = _digraph_inserts(values)
+    if len(inserts):
+        values = np.insert(values, inserts, _X)
+    if pad and len(values) % 2:
+        values = np.append(values, np.uint8(_X))
+    return values
+
+def _compile_square(rows):
+    """
+    Compile a Playfair square into lookup tables.
+
+    Args:
+        rows (tuple[str]): The five rows of the square.
+    Returns:
+        tuple: (26-entry position index, encryption table, decryption table).
+    """
+    square = np.frombuffer(''.join(rows).encode('ascii'), dtype=np.uint8) - np.uint8(ord('A'))
+    index = np.zeros(26, dtype=np.uint8)
+    index[square] = np.arange(25, dtype=np.uint8)
+    index[ord('J') - ord('A')] = index[ord('I') - ord('A')]
+    index.flags.writeable = False
+    return index, _digraph_table(square, 1), _digraph_table(square, -1)
+
+def _substitute(values, index, table) -> bytes:
+    positions = index[values]
+    codes = positions[0::2].astype(np.uint16) * 25 + positions[1::2]
+    # Each table row is two bytes, so gather it as a single uint16.
+    out = table.view(np.uint16).ravel()[codes].view(np.uint8)
+    out += ord('A')
+    return out.tobytes()
+
+def _substitute_many(values, indexes, tables):
+    """
+    Substitute the digraphs of one prepared text with several keys at once.
+
+    Args:
+        values (numpy.ndarray): uint8 letter values of even length.
+        indexes (numpy.ndarray): (keys, 26) position indexes.
+        tables (numpy.ndarray): (keys, 625, 2) digraph tables.
+    Returns:
+        numpy.ndarray: (keys, len(values)) uint8 uppercase ASCII codes.
+    """
+    keys = len(indexes)
+    flat = tables.reshape(keys, -1).view(np.uint16)
+    out = np.empty((keys, len(values) // 2), dtype=np.uint16)
+    step = max(1, _MANY_BLOCK // max(len(values), 1))
+    for start in range(0, keys, step):
+        positions = indexes[start:start + step][:, values]
+        codes = positions[:, 0::2].astype(np.uint16) * 25 + positions[:, 1::2]
+        out[start:start + step] = flat[start:start + step][np.arange(len(codes))[:, np.newaxis], codes]
+    out = out.view(np.uint8)
+    out += ord('A')
+    return out
+
+class _PlayfairEncryptStream(StreamTransform):
+    """
+    Stream transform for encryption.
+
+    An unpaired final letter is held back, since the next chunk decides
+    whether it pairs with the following letter or gets an 'X'.
+    """
+
+    def __init__(self, index, table):
+        self._index = index
+        self._table = table
+        self._pending = np.empty(0, dtype=np.uint8)
+        self._like = ''
+
+    def update(self, chunk):
+        self._like = chunk[:0]
+        values = _prepare_digraphs(np.concatenate([self._pending, _letter_values(chunk)]), pad=False)
+        complete = len(values) - len(values) % 2
+        self._pending = values[complete:]
+        return match_input_type(_substitute(values[:complete], self._index, self._table), chunk)
+
+    def finalize(self):
+        values, self._pending = _prepare_digraphs(self._pending), self._pending[:0]
+        return match_input_type(_substitute(values, self._index, self._table), self._like)
+
+class _PlayfairDecryptStream(StreamTransform):
+    """Stream transform for decryption; holds back an odd letter between chunks."""
+
+    def __init__(self, index, table):
+        self._index = index
+        self._table = table
+        self._pending = np.empty(0, dtype=np.uint8)
+        self._like = ''
+
+    def update(self, chunk):
+        self._like = chunk[:0]
+        values = np.concatenate([self._pending, _letter_values(chunk)])
+        complete = len(values) - len(values) % 2
+        self._pending = values[complete:]
+        return match_input_type(_substitute(values[:complete], self._index, self._table), chunk)
+
+    def finalize(self):
+        if len(self._pending):
+            raise InvalidTextError("Playfair ciphertext must contain an even number of letters.")
+        return match_input_type(b'', self._like)
+
+@dataclass(frozen=True, eq=False)
+class PlayfairKey(CompiledKey):
+    """Compiled Playfair key: the square, its position index and digraph tables."""
+
+    rows: tuple
+    index: np.ndarray
+    encrypt_table: np.ndarray
+    decrypt_table: np.ndarray
+
+    def encrypt(self, plaintext):
+        values = _prepare_digraphs(_letter_values(plaintext))
+        return match_input_type(_substitute(values, self.index, self.encrypt_table), plaintext)
+
+    def decrypt(self, ciphertext):
+        values = _letter_values(ciphertext)
+        if len(values) % 2:
+            raise InvalidTextError("Playfair ciphertext must contain an even number of letters.")
+        return match_input_type(_substitute(values, self.index, self.decrypt_table), ciphertext)
+
+    def encryptor(self) -> StreamTransform:
+        return _PlayfairEncryptStream(self.index, self.encrypt_table)
+
+    def decryptor(self) -> StreamTransform:
+        return _PlayfairDecryptStream(self.index, self.decrypt_table)
+
+    def segment_block(self, mode):
+        # Encryption pairs letters depending on every letter before them.
+        return 2 if mode == 'decrypt' else None
 
 class PlayfairCipher(Cipher):
     """Playfair cipher implementation."""
@@ -34,58 +251,26 @@ class PlayfairCipher(Cipher):
                 break
         return [square[i:i+self.size] for i in range(0, 25, self.size)]
 
-    def _find_position(self, square, char):
-        for i, row in enumerate(square):
-            for j, c in enumerate(row):
-                if c == char:
-                    return i, j
-        raise ValueError(f"Character {char} not found in Playfair square.")
+    def _compile_key(self, key: str) -> PlayfairKey:
+        rows = tuple(''.join(row) for row in self._generate_square(key))
+        if not all(row.isascii() for row in rows):
+            raise InvalidKeyError("Key for Playfair cipher must use ASCII letters.")
+        return PlayfairKey(key, rows, *_compile_square(rows))
 
     def _process_text(self, text):
-        text = ''.join([c.upper() for c in text if c.isalpha()])
-        processed = ''
-        i = 0
-        while i < len(text):
-            a = text[i]
-            b = text[i+1] if i+1 < len(text) else 'X'
-            if a == b:
-                processed += a + 'X'
-                i += 1
-            else:
-                processed += a + b
-                i += 2
-        if len(processed) % 2 != 0:
-            processed += 'X'
-        return processed
-
-    def encrypt(self, plaintext: str, key: str) -> str:
-        square = self._generate_square(key)
-        text = self._process_text(plaintext)
-        result = ''
-        for i in range(0, len(text), 2):
-            a, b = text[i], text[i+1]
-            row_a, col_a = self._find_position(square, a)
-            row_b, col_b = self._find_position(square, b)
-            if row_a == row_b:
-                result += square[row_a][(col_a+1)%5] + square[row_b][(col_b+1)%5]
-            elif col_a == col_b:
-                result += square[(row_a+1)%5][col_a] + square[(row_b+1)%5][col_b]
-            else:
-                result += square[row_a][col_b] + square[row_b][col_a]
-        return result
-
-    def decrypt(self, ciphertext: str, key: str) -> str:
-        square = self._generate_square(key)
-        text = ''.join([c.upper() for c in ciphertext if c.isalpha()])
-        result = ''
-        for i in range(0, len(text), 2):
-            a, b = text[i], text[i+1]
-            row_a, col_a = self._find_position(square, a)
-            row_b, col_b = self._find_position(square, b)
-            if row_a == row_b:
-                result += square[row_a][(col_a-1)%5] + square[row_b][(col_b-1)%5]
-            elif col_a == col_b:
-                result += square[(row_a-1)%5][col_a] + square[(row_b-1)%5][col_b]
-            else:
-                result += square[row_a][col_b] + square[row_b][col_a]
-        return result 
\ No newline at end of file
+        values = _prepare_digraphs(_letter_values(text))
+        return (values + ord('A')).tobytes().decode('ascii')
+
+    def _many_rows(self, text, compiled_keys, mode):
+        values = _letter_values(text)
+        if mode == 'encrypt':
+            values = _prepare_digraphs(values)
+        elif len(values) % 2:
+            raise InvalidTextError("Playfair ciphertext must contain an even number of letters.")
+        indexes = np.stack([k.index for k in compiled_keys])
+        tables = np.stack([k.encrypt_table if mode == 'encrypt' else k.decrypt_table for k in compiled_keys])
+        return _substitute_many(values, indexes, tables)
+
+# Timed while metrics are enabled.
+metrics.probe(globals(), 'playfair', 'normalize', '_letter_values', '_prepare_digraphs')
+metrics.probe(globals(), 'playfair', 'blocks', '_substitute')
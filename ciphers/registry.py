@@ -0,0 +1,119 @@
+from collections.abc import Mapping
+import importlib
+import threading
+
+# Entry point group third-party packages use to add ciphers, e.g. in pyproject.toml:
+#   [project.entry-points."ciphers.plugins"]
+#   rot13 = "mypackage.rot13:Rot13Cipher"
+ENTRY_POINT_GROUP = 'ciphers.plugins'
+
+# Built-in ciphers as 'module:class', imported on first lookup.
+BUILTIN_CIPHERS = {
+    'caesar': 'ciphers.caesar:CaesarCipher',
+    'vigenere': 'ciphers.vigenere:VigenereCipher',
+    'playfair': 'ciphers.playfair:PlayfairCipher',
+    'substitution': 'ciphers.substitution:SubstitutionCipher',
+    'hill': 'ciphers.hill:HillCipher',
+}
+
+def _load_target(target):
+    """Resolve a 'module:attribute' string to the object it names."""
+    module_name, _, attr = target.partition(':')
+    obj = importlib.import_module(module_name)
+    for part in filter(None, attr.split('.')):
+        obj = getattr(obj, part)
+    return obj
+
+class CipherRegistry(Mapping):
+    """
+    Cipher instances by name, created on first lookup.
+
+    Looking up a name imports only the module of that cipher, so using one
+    cipher does not pay for the imports (such as NumPy) of the others.
+    Entry points in ``ENTRY_POINT_GROUP`` are read only when a name is not
+    built in or registered, or when the registry is iterated.
+    """
+
+    def __init__(self, builtins=None, group=ENTRY_POINT_GROUP):
+        self._targets = dict(BUILTIN_CIPHERS if builtins is None else builtins)
+        self._instances = {}
+        self._group = group
+        self._plugins = None
+        self._lock = threading.Lock()
+
+    def register(self, name: str, target):
+        """
+        Add or replace a cipher.
+
+        Args:
+            name (str): Lookup name.
+            target: A ``Cipher`` instance, a ``Cipher`` subclass, or a
+                'module:class' string imported on first lookup.
+        """
+        with self._lock:
+            self._targets[name] = target
+            self._instances.pop(name, None)
+
+    def _plugin_targets(self):
+        if self._plugins is None:
+            plugins = {}
+            if self._group:
+                from importlib.metadata import entry_points
+                for entry_point in entry_points(group=self._group):
+                    plugins.setdefault(entry_point.name, entry_point.value)
+            self._plugins = plugins
+        return self._plugins
+
+    def _target(self, name):
+        if name in self._targets:
+            return self._targets[name]
+        return self._plugin_targets().get(name)
+
+    def __getitem__(self, name: str):
+        cipher = self._instances.get(name)
+        if cipher is not None:
+            return cipher
+        with self._lock:
+            if name not in self._instances:
+                target = self._target(name)
+                if target is None:
+                    raise KeyError(name)
+                if isinstance(target, str):
+                    target = _load_target(target)
+                self._instances[name] = target() if isinstance(target, type) else target
+            return self._instances[name]
+
+    def __contains__(self, name) -> bool:
+        return self._target(name) is not None
+
+    def __iter__(self):
+        names = dict.fromkeys(self._targets)
+        names.update(dict.fromkeys(self._plugin_targets()))
+        return iter(names)
+
+    def __len__(self) -> int:
+        return len(set(self._targets) | set(self._plugin_targets()))
+
+    def loaded(self):
+        """Names of the ciphers instantiated so far."""
+        return list(self._instances)
+
+registry = CipherRegistry()
+
+def get_cipher(name: str):
+    """
+    Return the shared instance of a cipher, importing its module on first use.
+
+    Args:
+        name (str): Built-in name ('caesar', 'vigenere', 'playfair',
+            'substitution', 'hill'), a registered name or an entry point name.
+    Returns:
+        Cipher: The cipher instance.
+    Raises:
+        KeyError: If no cipher has that name.
+    """
+    return registry[name]
+
+def available_ciphers():
+    """Names of all built-in, registered and installed plugin ciphers."""
+    return list(registry)
@@ -0,0 +1,249 @@
+"""
+Content-addressed cache of cipher results for inputs that repeat.
+
+Results are keyed on (cipher, mode, key fingerprint, text digest). The key
+fingerprint is an HMAC-SHA256 of the key under a secret, so keys are never
+stored, in memory or on disk; the text digest is a BLAKE2b hash of the input,
+keyed with a subkey of the same secret so stored digests cannot confirm a
+guessed input. The sqlite file holds plaintext outputs and is created with
+mode 0600.
+
+Two tiers:
+
+- memory: an LRU bounded by the bytes of the cached outputs;
+- disk (optional): a sqlite file that persists across runs. Its secret is
+  read from ``CIPHER_CACHE_SECRET`` or kept in ``<path>.secret`` (mode 0600),
+  so fingerprints stay comparable from one run to the next.
+
+Usage:
+    from ciphers.resultcache import ResultCache
+    cache = ResultCache(path='results.sqlite')
+    output = cache.get('vigenere', 'encrypt', 'lemon', text)
+    if output is None:
+        output = get_cipher('vigenere').encrypt(text, 'lemon')
+        cache.put('vigenere', 'encrypt', 'lemon', text, output)
+    print(cache.summary())
+"""
+from collections import OrderedDict, namedtuple
+import hashlib
+import hmac
+import os
+import secrets
+import sqlite3
+import threading
+
+ResultCacheInfo = namedtuple('ResultCacheInfo', ['hits', 'disk_hits', 'misses', 'entries', 'bytes', 'max_bytes'])
+
+DEFAULT_MAX_BYTES = int(os.environ.get('CIPHER_RESULT_CACHE_BYTES', 64 << 20))
+# Bookkeeping bytes charged per memory entry on top of its output.
+ENTRY_OVERHEAD = 200
+# Results written to sqlite per transaction.
+DISK_BATCH = 1000
+# Key fingerprints remembered per cache, by a digest of the key; a batch
+# usually has one key.
+_FINGERPRINTS = 1024
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS results (
+    cipher TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    key_fingerprint BLOB NOT NULL,
+    text_digest BLOB NOT NULL,
+    output BLOB NOT NULL,
+    is_text INTEGER NOT NULL,
+    PRIMARY KEY (cipher, mode, key_fingerprint, text_digest)
+) WITHOUT ROWID
+'''
+
+def _load_secret(path: str) -> bytes:
+    """Return the secret for a cache file, creating ``<path>.secret`` on first use."""
+    env = os.environ.get('CIPHER_CACHE_SECRET')
+    if env:
+        return env.encode('utf-8')
+    secret_path = path + '.secret'
+    try:
+        fd = os.open(secret_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        with open(secret_path, 'rb') as f:
+            return f.read()
+    secret = secrets.token_bytes(32)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(secret)
+    return secret
+
+def text_digest(text, key: bytes = b'') -> bytes:
+    """Keyed BLAKE2b digest of a str or bytes-like input; the type is part of it, as it decides the output type."""
+    if isinstance(text, str):
+        return b's' + hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16, key=key).digest()
+    return b'b' + hashlib.blake2b(text, digest_size=16, key=key).digest()
+
+def _create_private(path: str):
+    """Create an empty file readable only by its owner, unless it exists."""
+    try:
+        os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600))
+    except FileExistsError:
+        pass
+
+class ResultCache:
+    """
+    Thread-safe two-tier cache of cipher outputs.
+
+    Args:
+        max_bytes (int): Memory tier budget in bytes of output (plus
+            ``ENTRY_OVERHEAD`` per entry); 0 disables the memory tier.
+        path (str or None): sqlite file for the disk tier, created with mode
+            0600 if missing.
+        secret (bytes or None): Secret for key fingerprints and text digests. Defaults to
+            the disk tier's secret, or a random one for a memory-only cache.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, path=None, secret=None):
+        if max_bytes < 0:
+            raise ValueError("Result cache size must be non-negative.")
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self._fingerprints = {}
+        self._pending = {}
+        self._db = None
+        if path is not None:
+            _create_private(path)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(_SCHEMA)
+            self._db.commit()
+        if secret is None:
+            secret = _load_secret(path) if path is not None else secrets.token_bytes(32)
+        self._secret = secret
+        # BLAKE2b keys are at most 64 bytes, and a subkey keeps the two uses of the secret apart.
+        self._text_key = hmac.new(secret, b'text digest', hashlib.sha256).digest()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def fingerprint(self, cipher: str, key) -> bytes:
+        """HMAC-SHA256 of a key under the cache secret; what the cache stores instead of the key."""
+        message = f"{cipher}\0{key}".encode('utf-8', 'surrogatepass')
+        # The memo is keyed by a digest too, so it holds no key; BLAKE2b is cheaper than the HMAC.
+        digest = hashlib.blake2b(message, digest_size=16).digest()
+        fingerprint = self._fingerprints.get(digest)
+        if fingerprint is None:
+            fingerprint = hmac.new(self._secret, message, hashlib.sha256).digest()
+            if len(self._fingerprints) >= _FINGERPRINTS:
+                self._fingerprints.clear()
+            self._fingerprints[digest] = fingerprint
+        return fingerprint
+
+    def _cache_key(self, cipher, mode, key, text):
+        return cipher, mode, self.fingerprint(cipher, key), text_digest(text, self._text_key)
+
+    def get(self, cipher: str, mode: str, key, text):
+        """
+        Look up a result, in memory first and then on disk.
+
+        Args:
+            cipher (str): Cipher name.
+            mode (str): 'encrypt' or 'decrypt'.
+            key: Cipher key as given to the cipher.
+            text (str or bytes-like): Input text.
+        Returns:
+            str, bytes or None: The cached output, or None on a miss.
+        """
+        cache_key = self._cache_key(cipher, mode, key, text)
+        with self._lock:
+            output = self._entries.get(cache_key)
+            if output is not None:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return output
+            # Results not yet written to disk are still in memory.
+            output = self._pending.get(cache_key)
+            if output is not None:
+                self.hits += 1
+                self._remember(cache_key, output)
+                return output
+            if self._db is not None:
+                row = self._db.execute('SELECT output, is_text FROM results WHERE cipher = ? AND mode = ? '
+                                       'AND key_fingerprint = ? AND text_digest = ?', cache_key).fetchone()
+                if row is not None:
+                    output = row[0].decode('utf-8', 'surrogatepass') if row[1] else bytes(row[0])
+            if output is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(cache_key, output)
+            return output
+
+    def put(self, cipher: str, mode: str, key, text, output):
+        """Store a result in memory and, with a disk tier, on disk (written in batches)."""
+        cache_key = self._cache_key(cipher, mode, key, text)
+        with self._lock:
+            self._remember(cache_key, output)
+            if self._db is not None:
+                self._pending[cache_key] = output
+                if len(self._pending) >= DISK_BATCH:
+                    self._flush()
+
+    def _remember(self, cache_key, output):
+        if cache_key in self._entries:
+            self._bytes -= len(self._entries.pop(cache_key)) + ENTRY_OVERHEAD
+        size = len(output) + ENTRY_OVERHEAD
+        if size > self._max_bytes:
+            return
+        self._entries[cache_key] = output
+        self._bytes += size
+        while self._bytes > self._max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted) + ENTRY_OVERHEAD
+
+    def _flush(self):
+        rows = [(*cache_key, output.encode('utf-8', 'surrogatepass') if isinstance(output, str) else bytes(output),
+                 isinstance(output, str)) for cache_key, output in self._pending.items()]
+        self._pending.clear()
+        with self._db:
+            self._db.executemany('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)', rows)
+
+    def flush(self):
+        """Write pending results to the disk tier."""
+        with self._lock:
+            if self._pending:
+                self._flush()
+
+    def close(self):
+        """Flush and close the disk tier; the memory tier stays usable."""
+        with self._lock:
+            if self._db is not None:
+                if self._pending:
+                    self._flush()
+                self._db.close()
+                self._db = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def clear(self):
+        """Drop the memory tier and reset the counters; the disk tier is kept."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.disk_hits = 0
+            self.misses = 0
+
+    def info(self) -> ResultCacheInfo:
+        with self._lock:
+            return ResultCacheInfo(self.hits, self.disk_hits, self.misses, len(self._entries), self._bytes,
+                                   self._max_bytes)
+
+    def summary(self) -> str:
+        """One line with the hit rate, e.g. for the end of a CLI run."""
+        info = self.info()
+        lookups = info.hits + info.misses
+        rate = 100 * info.hits / lookups if lookups else 0.0
+        return (f"Result cache: {info.hits} hits ({info.disk_hits} from disk), {info.misses} misses, "
+                f"{rate:.1f}% hit rate, {info.entries} entries, {info.bytes}/{info.max_bytes} bytes")
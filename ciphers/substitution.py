@@ -1,7 +1,68 @@
-from .base import Cipher
+from .base import Cipher, CompiledKey, ascii_codes, gather_rows, translate_into
+from .textform import NormalizedText
 from . import InvalidKeyError
+from dataclasses import dataclass
 import string
 
+def _translation_tables(key: str):
+    """
+    Build encryption and decryption tables for a validated substitution key.
+
+    Args:
+        key (str): 26 unique uppercase letters.
+    Returns:
+        tuple: ((str, bytes) encryption tables, (str, bytes) decryption tables).
+            The bytes tables are None when the key is not ASCII.
+    """
+    plain = string.ascii_uppercase + string.ascii_lowercase
+    cipher = key + key.lower()
+    encrypt_table = {ord(p): c for p, c in zip(plain, cipher)}
+    decrypt_table = {ord(c): p for p, c in zip(plain, cipher)}
+    if key.isascii():
+        plain_bytes, cipher_bytes = plain.encode('ascii'), cipher.encode('ascii')
+        return ((encrypt_table, bytes.maketrans(plain_bytes, cipher_bytes)),
+                (decrypt_table, bytes.maketrans(cipher_bytes, plain_bytes)))
+    return (encrypt_table, None), (decrypt_table, None)
+
+def _bytes_table(tables) -> bytes:
+    if tables[1] is None:
+        raise InvalidKeyError("Key for Substitution cipher must be ASCII to process bytes.")
+    return tables[1]
+
+def _translate(text, tables):
+    str_table, bytes_table = tables
+    if isinstance(text, NormalizedText):
+        return text.text.translate(str_table) if bytes_table is None and not text.is_bytes \
+            else text.translate(_bytes_table(tables))
+    if not isinstance(text, str):
+        return bytes(text).translate(_bytes_table(tables))
+    if bytes_table is not None and text.isascii():
+        return text.encode('ascii').translate(bytes_table).decode('ascii')
+    return text.translate(str_table)
+
+@dataclass(frozen=True, eq=False)
+class SubstitutionKey(CompiledKey):
+    """Compiled substitution key: the normalized alphabet and its tables."""
+
+    alphabet: str
+    encrypt_tables: tuple
+    decrypt_tables: tuple
+
+    def encrypt(self, plaintext):
+        return _translate(plaintext, self.encrypt_tables)
+
+    def decrypt(self, ciphertext):
+        return _translate(ciphertext, self.decrypt_tables)
+
+    def encrypt_into(self, buffer, offset=0):
+        translate_into(buffer, _bytes_table(self.encrypt_tables))
+
+    def decrypt_into(self, buffer, offset=0):
+        translate_into(buffer, _bytes_table(self.decrypt_tables))
+
+    def segment_block(self, mode):
+        return 0
+
 class SubstitutionCipher(Cipher):
     """Monoalphabetic substitution cipher implementation."""
 
@@ -13,28 +74,13 @@ class SubstitutionCipher(Cipher):
             raise InvalidKeyError("Key for Substitution cipher must not contain repeated letters.")
         return key
 
-    def encrypt(self, plaintext: str, key: str) -> str:
-        key = self._validate_key(key)
-        table = {c: k for c, k in zip(string.ascii_uppercase, key)}
-        result = ''
-        for char in plaintext:
-            if char.isalpha():
-                upper = char.upper()
-                sub = table[upper]
-                result += sub if char.isupper() else sub.lower()
-            else:
-                result += char
-        return result
-
-    def decrypt(self, ciphertext: str, key: str) -> str:
-        key = self._validate_key(key)
-        table = {k: c for c, k in zip(string.ascii_uppercase, key)}
-        result = ''
-        for char in ciphertext:
-            if char.isalpha():
-                upper = char.upper()
-                sub = table[upper]
-                result += sub if char.isupper() else sub.lower()
-            else:
-                result += char
-        return result 
\ No newline at end of file
+    def _compile_key(self, key: str) -> SubstitutionKey:
+        alphabet = self._validate_key(key)
+        return SubstitutionKey(key, alphabet, *_translation_tables(alphabet))
+
+    def _many_rows(self, text, compiled_keys, mode):
+        codes = ascii_codes(text)
+        tables = [(k.encrypt_tables if mode == 'encrypt' else k.decrypt_tables)[1] for k in compiled_keys]
+        if codes is None or None in tables:
+            return None
+        return gather_rows(tables, codes)
@@ -0,0 +1,139 @@
+"""
+A text split once into its letters, their case and the non-letters between them.
+
+Every cipher here sees a text as a sequence of ASCII letters with everything
+else passed through (Caesar, Vigenère, Substitution) or dropped (Playfair,
+Hill). ``NormalizedText`` does that split once, so one input can go through
+several keys, ciphers and cracking tools without extracting its letters again:
+
+- ``letters``: uint8 letter values 0..25 (A=0), case folded.
+- ``case``: upper-case flags of the letters, packed eight per byte.
+- ``gaps``: [start, end) offsets of the runs of non-letters.
+
+Compiled keys and the analysis functions accept a ``NormalizedText``
+wherever they accept text and return output of the original type.
+
+Usage:
+    from ciphers import NormalizedText, get_cipher
+    text = NormalizedText(open('book.txt').read())
+    outputs = [get_cipher('vigenere').encrypt(text, key) for key in keys]
+"""
+import string
+
+# Bytes that are not ASCII letters, and a table that upper-cases ASCII letters.
+NON_LETTERS = bytes(b for b in range(256) if not chr(b).isascii() or not chr(b).isalpha())
+TO_UPPER = bytes.maketrans(string.ascii_lowercase.encode('ascii'), string.ascii_uppercase.encode('ascii'))
+
+def ascii_letter_values(data):
+    """
+    Extract the ASCII letters of a bytes-like payload as values 0..25 (A=0).
+
+    Args:
+        data (bytes-like): Input; everything but ASCII letters is dropped.
+    Returns:
+        numpy.ndarray: uint8 letter values.
+    """
+    import numpy as np
+    letters = bytes(data).translate(TO_UPPER, NON_LETTERS)
+    return np.frombuffer(letters, dtype=np.uint8) - np.uint8(ord('A'))
+
+def text_bytes(text) -> bytes:
+    """Bytes of a text for letter counting: UTF-8 for str, the payload itself otherwise."""
+    if isinstance(text, NormalizedText):
+        return text.data
+    return text.encode('utf-8') if isinstance(text, str) else bytes(text)
+
+def ascii_letter_count(data) -> int:
+    """Number of ASCII letters in a bytes-like payload."""
+    return len(bytes(data).translate(None, NON_LETTERS))
+
+class NormalizedText:
+    """
+    The letters, letter case and non-letter runs of an ASCII text or bytes payload.
+
+    Args:
+        text (str or bytes-like): ASCII str, or bytes whose ASCII letters count.
+    Raises:
+        ValueError: For a str with non-ASCII characters; the ciphers classify
+            those letters one by one, so such text is passed to them directly.
+    """
+    __slots__ = ('data', 'letters', 'case', 'gaps', 'is_bytes', '_mask')
+
+    def __init__(self, text):
+        import numpy as np
+        if isinstance(text, str):
+            if not text.isascii():
+                raise ValueError("NormalizedText needs ASCII str or bytes; pass non-ASCII text to the cipher as is.")
+            self.data, self.is_bytes = text.encode('ascii'), False
+        else:
+            self.data, self.is_bytes = bytes(text), True
+        codes = np.frombuffer(self.data, dtype=np.uint8)
+        folded = (codes | 32) - np.uint8(ord('a'))
+        mask = folded < 26
+        self.letters = folded[mask]
+        self.case = np.packbits(codes[mask] < ord('a'))
+        # Letter/non-letter changes alternate, starting and ending outside a gap.
+        edges = np.flatnonzero(np.diff(mask, prepend=True, append=True))
+        self.gaps = edges.reshape(-1, 2)
+        for array in (self.letters, self.case, self.gaps):
+            array.flags.writeable = False
+        self._mask = None
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __repr__(self) -> str:
+        return f"NormalizedText({len(self.data)} characters, {len(self.letters)} letters, {len(self.gaps)} gaps)"
+
+    @property
+    def text(self):
+        """The original text: str, or bytes for bytes-like input."""
+        return self.data if self.is_bytes else self.data.decode('ascii')
+
+    @property
+    def codes(self):
+        """The original text as a read-only uint8 array."""
+        import numpy as np
+        return np.frombuffer(self.data, dtype=np.uint8)
+
+    def upper(self):
+        """Return the upper-case flags of the letters as a boolean array."""
+        import numpy as np
+        return np.unpackbits(self.case, count=len(self.letters)).view(bool)
+
+    def letter_mask(self):
+        """Return a boolean array, True at the offsets of letters (built from ``gaps``, then cached)."""
+        if self._mask is None:
+            import numpy as np
+            depth = np.zeros(len(self.data) + 1, dtype=np.int8)
+            depth[self.gaps[:, 0]] = 1
+            depth[self.gaps[:, 1]] -= 1
+            self._mask = np.cumsum(depth[:-1], dtype=np.int8) == 0
+        return self._mask
+
+    def output(self, raw: bytes):
+        """Return ASCII output as str for str input and as bytes for bytes input."""
+        return raw if self.is_bytes else raw.decode('ascii')
+
+    def translate(self, table: bytes):
+        """Apply a bytes translation table to the original text; output has the input's type."""
+        return self.output(self.data.translate(table))
+
+    def restore(self, values):
+        """
+        Reassemble the text with new letters in the original case and places.
+
+        Args:
+            values (numpy.ndarray): Letter values 0..25, one per letter of the text.
+        Returns:
+            str or bytes: Text of the input's type.
+        Raises:
+            ValueError: If the number of values differs from the number of letters.
+        """
+        import numpy as np
+        if len(values) != len(self.letters):
+            raise ValueError(f"Expected {len(self.letters)} letter values, got {len(values)}.")
+        base = np.where(self.upper(), np.uint8(ord('A')), np.uint8(ord('a')))
+        out = np.frombuffer(bytearray(self.data), dtype=np.uint8)
+        out[self.letter_mask()] = base + values
+        return self.output(out.tobytes())
@@ -1,47 +1,242 @@
-from .base import Cipher
-from . import InvalidKeyError, preserve_case
+from .base import Cipher, CompiledKey, StreamTransform, INPLACE_BLOCK_SIZE, as_byte_view, ascii_codes
+from .textform import NormalizedText
+from . import InvalidKeyError
+from dataclasses import dataclass
+import numpy as np
+
+# Keys longer than this use an arithmetic key stream instead of per-position tables.
+_MAX_TABLE_PERIOD = 64
+# Key-stream elements built at once by ``_shift_many``; bounds its temporary arrays.
+_MANY_BLOCK = 1 << 22
+
+def _shift_tables(shifts):
+    """
+    Build one 256-entry byte table per key position.
+
+    Args:
+        shifts (numpy.ndarray): uint8 shifts (0..25).
+    Returns:
+        numpy.ndarray: (len(shifts), 256) uint8 array mapping ASCII letters to
+            their shifted letter in the same case and every other byte to itself.
+    """
+    tables = np.tile(np.arange(256, dtype=np.uint8), (len(shifts), 1))
+    letters = np.arange(26, dtype=np.uint8)
+    for row, shift in zip(tables, shifts):
+        shifted = (letters + shift) % 26
+        row[ord('A'):ord('Z') + 1] = shifted + ord('A')
+        row[ord('a'):ord('z') + 1] = shifted + ord('a')
+    tables.flags.writeable = False
+    return tables
+
+def _key_schedule(key: str):
+    """
+    Convert a Vigenère key into encryption and decryption shift schedules.
+
+    Args:
+        key (str): Alphabetic key.
+    Returns:
+        tuple: ((shifts, tables) for encryption, (shifts, tables) for decryption).
+            The tables are None for keys longer than ``_MAX_TABLE_PERIOD``.
+    """
+    shifts = np.array([(ord(k) - ord('a')) % 26 for k in key.lower()], dtype=np.uint8)
+    inverse = (26 - shifts) % 26
+    shifts.flags.writeable = False
+    inverse.flags.writeable = False
+    if len(shifts) > _MAX_TABLE_PERIOD:
+        return (shifts, None), (inverse, None)
+    return (shifts, _shift_tables(shifts)), (inverse, _shift_tables(inverse))
+
+def _classify(codes):
+    """
+    Classify wide code points the way ``str.isalpha``/``str.isupper`` would.
+
+    Args:
+        codes (numpy.ndarray): uint32 code points of the text.
+    Returns:
+        tuple: (letter mask, uppercase mask) as boolean arrays.
+    """
+    upper = (codes >= ord('A')) & (codes <= ord('Z'))
+    letters = upper | ((codes >= ord('a')) & (codes <= ord('z')))
+    wide = codes >= 128
+    if wide.any():
+        # Only distinct non-ASCII characters are classified in Python.
+        unique, inverse = np.unique(codes[wide], return_inverse=True)
+        chars = [chr(c) for c in unique]
+        letters[wide] = np.array([c.isalpha() for c in chars])[inverse]
+        upper[wide] = np.array([c.isupper() for c in chars])[inverse]
+    return letters, upper
+
+def _shift_codes(codes, schedule, offset: int, out) -> int:
+    """
+    Shift the ASCII letters of a byte array.
+
+    Args:
+        codes (numpy.ndarray): uint8 input bytes.
+        schedule (tuple): (shifts, tables) from ``_key_schedule``.
+        offset (int): Key position of the first letter.
+        out (numpy.ndarray): uint8 output array; may be ``codes`` itself.
+    Returns:
+        int: Number of letters shifted.
+    """
+    shifts, tables = schedule
+    letters = ((codes | 32) - np.uint8(ord('a'))) < 26
+    values = codes[letters]
+    period = len(shifts)
+    if tables is not None:
+        # Key position (offset + r) applies to every len(key)-th letter starting at r.
+        for r in range(min(period, len(values))):
+            values[r::period] = tables[(offset + r) % period][values[r::period]]
+    elif len(values):
+        base = np.where(values >= ord('a'), ord('a'), ord('A')).astype(np.uint8)
+        stream = np.tile(np.roll(shifts, -offset), -(-len(values) // period))[:len(values)]
+        values = (values - base + stream) % 26 + base
+    out[letters] = values
+    return len(values)
+
+def _shift_wide(text: str, shifts, offset: int):
+    codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+    letters, upper = _classify(codes)
+    count = int(np.count_nonzero(letters))
+    if count == 0:
+        return text, 0
+    base = np.where(upper[letters], ord('A'), ord('a'))
+    stream = np.tile(np.roll(shifts, -offset), -(-count // len(shifts)))[:count]
+    out = codes.copy()
+    out[letters] = (codes[letters].astype(np.int64) - base + stream) % 26 + base
+    return out.tobytes().decode('utf-32-le'), count
+
+def _shift_normalized(text, shifts, offset: int):
+    """Shift the folded letters of a NormalizedText and put them back in place."""
+    count = len(text.letters)
+    stream = np.tile(np.roll(shifts, -offset), -(-count // len(shifts)))[:count]
+    stream += text.letters
+    np.remainder(stream, 26, out=stream)
+    return text.restore(stream), count
+
+def _shift_text(text, schedule, offset: int = 0):
+    """
+    Shift the letters of a text by the key schedule.
+
+    Args:
+        text (str, bytes-like or NormalizedText): Input; non-letters pass through and do not use the key.
+        schedule (tuple): (shifts, tables) from ``_key_schedule``.
+        offset (int): Key position of the first letter.
+    Returns:
+        tuple: (shifted text of the input's type, bytes for bytes-like input;
+            number of letters in the text).
+    """
+    if isinstance(text, NormalizedText):
+        return _shift_normalized(text, schedule[0], offset)
+    if isinstance(text, str):
+        if not text.isascii():
+            return _shift_wide(text, schedule[0], offset)
+        codes = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+    else:
+        codes = np.frombuffer(text, dtype=np.uint8)
+    out = codes.copy()
+    count = _shift_codes(codes, schedule, offset, out)
+    if isinstance(text, str):
+        return out.tobytes().decode('ascii'), count
+    return out.tobytes(), count
+
+def _shift_many(codes, shift_rows):
+    """
+    Shift the ASCII letters of one text by several keys at once.
+
+    The letters are located and reduced to 0..25 once. Keys of one period
+    are stacked into a matrix whose tiling is the key stream of all of them,
+    broadcast against the letters in a single addition.
+
+    Args:
+        codes (numpy.ndarray): uint8 input bytes.
+        shift_rows (list[numpy.ndarray]): Shift schedule of every key.
+    Returns:
+        numpy.ndarray: (len(shift_rows), len(codes)) uint8 output bytes.
+    """
+    letters = ((codes | 32) - np.uint8(ord('a'))) < 26
+    positions = np.flatnonzero(letters)
+    values = codes[letters]
+    base = np.where(values >= ord('a'), ord('a'), ord('A')).astype(np.uint8)
+    values -= base
+    out = np.repeat(codes[np.newaxis, :], len(shift_rows), axis=0)
+    by_period = {}
+    for row, shifts in enumerate(shift_rows):
+        by_period.setdefault(len(shifts), []).append(row)
+    step = max(1, _MANY_BLOCK // max(len(values), 1))
+    for period, rows in by_period.items():
+        for start in range(0, len(rows), step):
+            group = rows[start:start + step]
+            shifts = np.stack([shift_rows[row] for row in group])
+            stream = np.tile(shifts, (1, -(-len(values) // period)))[:, :len(values)]
+            stream += values
+            np.remainder(stream, 26, out=stream)
+            stream += base
+            for row, letters_out in zip(group, stream):
+                out[row, positions] = letters_out
+    return out
+
+def _shift_into(buffer, schedule, offset: int = 0):
+    codes = np.frombuffer(as_byte_view(buffer), dtype=np.uint8)
+    offset %= len(schedule[0])
+    for start in range(0, len(codes), INPLACE_BLOCK_SIZE):
+        block = codes[start:start + INPLACE_BLOCK_SIZE]
+        offset = (offset + _shift_codes(block, schedule, offset, block)) % len(schedule[0])
+
+class _VigenereStream(StreamTransform):
+    """Stream transform that keeps the key position across chunks."""
+
+    def __init__(self, schedule):
+        self._schedule = schedule
+        self._offset = 0
+
+    def update(self, chunk):
+        out, count = _shift_text(chunk, self._schedule, self._offset)
+        self._offset = (self._offset + count) % len(self._schedule[0])
+        return out
+
+@dataclass(frozen=True, eq=False)
+class VigenereKey(CompiledKey):
+    """Compiled Vigenère key: shift schedules for both directions."""
+
+    encrypt_schedule: tuple
+    decrypt_schedule: tuple
+    letter_positions = True
+
+    def encrypt(self, plaintext):
+        return _shift_text(plaintext, self.encrypt_schedule)[0]
+
+    def decrypt(self, ciphertext):
+        return _shift_text(ciphertext, self.decrypt_schedule)[0]
+
+    def encrypt_into(self, buffer, offset=0):
+        _shift_into(buffer, self.encrypt_schedule, offset)
+
+    def decrypt_into(self, buffer, offset=0):
+        _shift_into(buffer, self.decrypt_schedule, offset)
+
+    def segment_block(self, mode):
+        return 0
+
+    def encryptor(self) -> StreamTransform:
+        return _VigenereStream(self.encrypt_schedule)
+
+    def decryptor(self) -> StreamTransform:
+        return _VigenereStream(self.decrypt_schedule)
 
 class VigenereCipher(Cipher):
     """Vigenère cipher implementation."""
 
-    def encrypt(self, plaintext: str, key: str) -> str:
+    def _validate_key(self, key: str):
         if not key.isalpha():
             raise InvalidKeyError("Key for Vigenère cipher must be alphabetic.")
-        result = ''
-        key = self._format_key(plaintext, key)
-        for p, k in zip(plaintext, key):
-            if p.isalpha():
-                base = ord('A') if p.isupper() else ord('a')
-                shift = ord(k.lower()) - ord('a')
-                shifted = chr((ord(p) - base + shift) % 26 + base)
-                result += preserve_case(p, shifted)
-            else:
-                result += p
-        return result
-
-    def decrypt(self, ciphertext: str, key: str) -> str:
-        if not key.isalpha():
-            raise InvalidKeyError("Key for Vigenère cipher must be alphabetic.")
-        result = ''
-        key = self._format_key(ciphertext, key)
-        for c, k in zip(ciphertext, key):
-            if c.isalpha():
-                base = ord('A') if c.isupper() else ord('a')
-                shift = ord(k.lower()) - ord('a')
-                shifted = chr((ord(c) - base - shift) % 26 + base)
-                result += preserve_case(c, shifted)
-            else:
-                result += c
-        return result
-
-    def _format_key(self, text: str, key: str) -> str:
-        key = key.lower()
-        key_sequence = ''
-        key_index = 0
-        for char in text:
-            if char.isalpha():
-                key_sequence += key[key_index % len(key)]
-                key_index += 1
-            else:
-                key_sequence += char
-        return key_sequence 
\ No newline at end of file
+        return key
+
+    def _compile_key(self, key: str) -> VigenereKey:
+        return VigenereKey(key, *_key_schedule(self._validate_key(key)))
+
+    def _many_rows(self, text, compiled_keys, mode):
+        codes = ascii_codes(text)
+        if codes is None:
+            return None
+        return _shift_many(codes, [(k.encrypt_schedule if mode == 'encrypt' else k.decrypt_schedule)[0]
+                                   for k in compiled_keys])
@@ -1,107 +1,643 @@
 import argparse
-from ciphers.caesar import CaesarCipher
-from ciphers.vigenere import VigenereCipher
-from ciphers.playfair import PlayfairCipher
-from ciphers.substitution import SubstitutionCipher
-from ciphers.hill import HillCipher
-from ciphers import InvalidKeyError
+from ciphers import InvalidKeyError, InvalidTextError, metrics
+from ciphers.cracking import CRACKERS, crack_texts
+from ciphers.registry import registry
+from collections import deque
+import json
 import sys
+import time
 
-CIPHERS = {
-    'caesar': CaesarCipher(),
-    'vigenere': VigenereCipher(),
-    'playfair': PlayfairCipher(),
-    'substitution': SubstitutionCipher(),
-    'hill': HillCipher(),
-}
+WRITE_BUFFER_SIZE = 1 << 16
 
-EXAMPLES = '''\nExamples:\n  python cli.py caesar encrypt --text "Hello, World!" 3\n  python cli.py vigenere decrypt --text "Rijvs, Uyvjn!" key\n  python cli.py playfair encrypt --text "Hide the gold" keyword\n  python cli.py substitution encrypt --text "Hello" QWERTYUIOPASDFGHJKLZXCVBNM\n  python cli.py hill encrypt --text "HELP" HILL\n  python cli.py caesar encrypt --input-file input.txt --output-file output.txt 5\n  python cli.py vigenere encrypt --text "Hello" --text "World" key --verbose\n'''
+# Cipher instances by name; each cipher module is imported on first lookup.
+CIPHERS = registry
 
-def parse_args():
+EXAMPLES = '''\nExamples:\n  python cli.py caesar encrypt --text "Hello, World!" 3\n  python cli.py vigenere decrypt --text "Rijvs, Uyvjn!" key\n  python cli.py playfair encrypt --text "Hide the gold" keyword\n  python cli.py substitution encrypt --text "Hello" QWERTYUIOPASDFGHJKLZXCVBNM\n  python cli.py hill encrypt --text "HELP" HILL\n  python cli.py caesar encrypt --input-file input.txt --output-file output.txt 5\n  python cli.py vigenere encrypt --text "Hello" --text "World" key --verbose\n  python cli.py caesar encrypt --input-file big.txt --output-file out.txt --jobs 8 3\n  python cli.py vigenere encrypt --input-file book.txt --output-file book.enc --document --jobs 8 lemon\n  python cli.py vigenere encrypt --input-file feed.txt --cache-file results.sqlite --stats lemon\n  cat input.txt | python cli.py caesar encrypt --input-file - --format raw 3 > output.txt\n  python cli.py caesar crack --input-file intercepted.txt --top 3\n  python cli.py vigenere crack --input-file intercepted.txt\n  python cli.py substitution crack --input-file intercepted.txt --jobs 4 --seed 1\n  python cli.py hill crack --input-file intercepted.txt --block-size 3 --crib "attack at dawn"\n  python cli.py playfair crack --input-file intercepted.txt --jobs 4 --seed 1\n  python cli.py jobs --input-file nightly.jsonl --jobs 8  (see python cli.py jobs --help)\n'''
+
+def parse_args(argv=None):
     parser = argparse.ArgumentParser(
         description='Classical Ciphers CLI',
         epilog=EXAMPLES,
         formatter_class=argparse.RawDescriptionHelpFormatter
     )
-    parser.add_argument('cipher', choices=CIPHERS.keys(), help='Cipher to use')
-    parser.add_argument('mode', choices=['encrypt', 'decrypt'], help='Mode')
+    # The metavar keeps argparse from listing (and so discovering) plugins unless help is shown.
+    parser.add_argument('cipher', choices=CIPHERS, metavar='cipher', help='Cipher to use: %(choices)s')
+    parser.add_argument('mode', choices=['encrypt', 'decrypt', 'crack'], help='Mode (crack recovers the key without it)')
     parser.add_argument('text', nargs='?', default=None, help='Text to process (or use --text-list/--input-file)')
-    parser.add_argument('key', help='Cipher key')
+    parser.add_argument('key', nargs='?', default=None, help='Cipher key (not used by crack)')
+    parser.add_argument('--text', dest='texts', action='append', metavar='TEXT',
+                        help='Text to process; repeat for several texts')
     parser.add_argument('--text-list', nargs='+', help='Multiple texts to process (space or comma separated)')
-    parser.add_argument('--input-file', help='Input file path')
-    parser.add_argument('--output-file', help='Output file path')
+    parser.add_argument('--input-file', help="Input file path ('-' for stdin)")
+    parser.add_argument('--output-file', help="Output file path ('-' or omitted for stdout)")
+    parser.add_argument('--format', choices=['annotated', 'raw', 'jsonl'], default='annotated',
+                        help='Output format: annotated "Input: ... -> Output: ..." lines (default), raw output only, or JSON lines')
     parser.add_argument('--delimiter', default=',', help='Delimiter for batch text (default: ,)')
     parser.add_argument('--verbose', action='store_true', help='Show detailed cipher process')
-    args = parser.parse_args()
+    parser.add_argument('--jobs', type=int, default=1, help='Worker processes for batch input or crack restarts (default: 1)')
+    parser.add_argument('--chunk-size', type=int, default=1000, help='Lines per worker batch with --jobs (default: 1000)')
+    parser.add_argument('--cache', action='store_true',
+                        help='Reuse results of repeated input lines (memory LRU; see --cache-file, --cache-mb)')
+    parser.add_argument('--cache-file', metavar='FILE',
+                        help='sqlite file that keeps cached results across runs (implies --cache)')
+    parser.add_argument('--cache-mb', type=int, default=64, help='Memory budget of the result cache in MB (default: 64)')
+    parser.add_argument('--document', action='store_true',
+                        help='Process --input-file as one document and write the raw result; '
+                             'with --jobs it is split over worker processes through shared memory')
+    parser.add_argument('--top', type=int, default=3, help='Candidates reported per input in crack mode (default: 3)')
+    parser.add_argument('--method', choices=['chi2', 'loglik', 'quadgram'],
+                        help='Scoring used by crack (default: chi2; loglik for hill, quadgram for substitution and playfair)')
+    parser.add_argument('--restarts', type=int,
+                        help='Random restarts (substitution, default: 20) or annealing chains (playfair, default: 4) for crack')
+    parser.add_argument('--seed', type=int, help='Random seed for reproducible substitution and playfair crack results')
+    parser.add_argument('--block-size', type=int, default=2, help='Hill key size n for hill crack (default: 2)')
+    parser.add_argument('--crib', help='Known plaintext for hill crack (known-plaintext attack)')
+    add_instrumentation_args(parser)
+    # Intermixed parsing collects the positionals around the options, so the
+    # key may come last ("--input-file in.txt 5") as well as right after the mode.
+    args = parser.parse_intermixed_args(argv)
+
+    # With two optional positionals, a lone key after the mode lands in 'text'.
+    if args.mode != 'crack' and args.key is None:
+        if args.text is not None and (args.texts or args.text_list or args.input_file):
+            args.key, args.text = args.text, None
+        else:
+            parser.error("the following arguments are required: key")
+    if args.mode == 'crack' and args.cipher not in CRACKERS:
+        parser.error(f"crack is supported for: {', '.join(CRACKERS)}")
+    if args.mode == 'crack':
+        methods = CRACKERS[args.cipher][2]
+        if args.method is None:
+            args.method = methods[0]
+        elif args.method not in methods:
+            parser.error(f"{args.cipher} crack supports --method {', '.join(methods)}")
     
     # Validate input sources
-    input_sources = sum(1 for x in [args.text, args.text_list, args.input_file] if x is not None)
+    input_sources = sum(1 for x in [args.text, args.texts, args.text_list, args.input_file] if x is not None)
     if input_sources == 0:
-        parser.error("One of text, --text-list, or --input-file is required")
+        parser.error("One of text, --text, --text-list, or --input-file is required")
     if input_sources > 1:
-        parser.error("Only one of text, --text-list, or --input-file can be used")
+        parser.error("Only one of text, --text, --text-list, or --input-file can be used")
+    if args.document and (args.mode == 'crack' or args.input_file is None):
+        parser.error("--document needs encrypt or decrypt with --input-file")
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+    if args.cache_mb < 0:
+        parser.error("--cache-mb must not be negative")
+    args.cache = args.cache or args.cache_file is not None
+    if args.cache and (args.mode == 'crack' or args.document):
+        parser.error("--cache works with line-by-line encrypt and decrypt")
+    if args.restarts is not None and args.restarts < 1:
+        parser.error("--restarts must be at least 1")
+    if args.mode == 'crack' and args.cipher == 'hill' and args.crib is None and args.block_size not in (2, 3):
+        parser.error("hill crack without --crib supports --block-size 2 or 3")
     return args
 
-def process_texts(cipher, mode, texts, key, verbose):
-    results = []
+JOB_EXAMPLES = '''\nEach input line is one job:\n  {"id": 7, "cipher": "vigenere", "mode": "encrypt", "key": "lemon", "text": "Attack at dawn"}\nEach output line is {"id": 7, "output": "..."} or {"id": 7, "error": "..."}, in input order.\n\nExamples:\n  python cli.py jobs --input-file nightly.jsonl --output-file results.jsonl --jobs 8\n  cat nightly.jsonl | python cli.py jobs > results.jsonl\n'''
+
+def add_instrumentation_args(parser):
+    parser.add_argument('--stats', action='store_true',
+                        help='Print throughput, calls, key cache hits and time per phase to stderr '
+                             '(work done in --jobs worker processes is not included)')
+    parser.add_argument('--profile', metavar='FILE',
+                        help='Write cProfile statistics to FILE and collapsed stacks for flame graphs to FILE.folded')
+
+def parse_job_args(argv):
+    parser = argparse.ArgumentParser(
+        prog='cli.py jobs',
+        description='Run JSONL jobs, each with its own cipher, mode, key and text',
+        epilog=JOB_EXAMPLES,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--input-file', default='-', help="JSONL job file ('-' or omitted for stdin)")
+    parser.add_argument('--output-file', help="Output file path ('-' or omitted for stdout)")
+    parser.add_argument('--jobs', type=int, default=1, help='Worker processes (default: 1)')
+    parser.add_argument('--chunk-size', type=int, default=1000, help='Jobs per worker batch with one key (default: 1000)')
+    add_instrumentation_args(parser)
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+    return args
+
+def process_texts(cipher, mode, texts, key, verbose, cache=None):
+    """
+    Process texts one after another.
+
+    Args:
+        cache (ResultCache or None): Results of repeated texts are taken from
+            and added to this cache.
+    Yields:
+        tuple: (text, output, error) with output None and error set on failure.
+    """
+    name = metrics.cipher_name(type(cipher))
     for text in texts:
         try:
             if not text:
                 continue  # Skip empty texts
-            if mode == 'encrypt':
-                output = cipher.encrypt(text, key)
-            else:
-                output = cipher.decrypt(text, key)
+            output = cache.get(name, mode, key, text) if cache is not None else None
+            if output is None:
+                if mode == 'encrypt':
+                    output = cipher.encrypt(text, key)
+                else:
+                    output = cipher.decrypt(text, key)
+                if cache is not None:
+                    cache.put(name, mode, key, text, output)
             if verbose:
-                print(f"[VERBOSE] Cipher: {cipher.__class__.__name__}, Key: {key}, Input: {text}, Output: {output}")
-            results.append((text, output))
-        except InvalidKeyError as e:
+                print(f"[VERBOSE] Cipher: {cipher.__class__.__name__}, Key: {key}, Input: {text}, Output: {output}", file=sys.stderr)
+            yield text, output, None
+        except (InvalidKeyError, InvalidTextError) as e:
             print(f"Error: {e}", file=sys.stderr)
-            results.append((text, None))
+            yield text, None, str(e)
+
+_worker_key = None
+_worker_error = None
+
+def _init_worker(cipher_name, key):
+    """Compile the key once per worker process."""
+    global _worker_key, _worker_error
+    try:
+        _worker_key = CIPHERS[cipher_name].compile(key)
+    except InvalidKeyError as e:
+        _worker_error = e
+
+def _process_batch(mode, batch):
+    if _worker_error is not None:
+        return [(text, None, str(_worker_error)) for text in batch]
+    transform = _worker_key.encrypt if mode == 'encrypt' else _worker_key.decrypt
+    results = []
+    for text in batch:
+        try:
+            results.append((text, transform(text), None))
+        except (InvalidKeyError, InvalidTextError) as e:
+            results.append((text, None, str(e)))
     return results
 
-def main():
-    args = parse_args()
-    cipher = CIPHERS[args.cipher]
-    
-    # Gather input texts
-    texts = []
+def _batches(texts, size):
+    batch = []
+    for text in texts:
+        if not text:
+            continue  # Skip empty texts
+        batch.append(text)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _submit_batch(pool, mode, batch, key, cache, name):
+    """Submit the texts of a batch that the cache cannot answer; returns (batch, cached outputs, future)."""
+    if cache is None:
+        return batch, None, pool.submit(_process_batch, mode, batch)
+    cached = [cache.get(name, mode, key, text) for text in batch]
+    misses = list(dict.fromkeys(text for text, output in zip(batch, cached) if output is None))
+    return batch, cached, pool.submit(_process_batch, mode, misses) if misses else None
+
+def _batch_results(batch, cached, future, mode, key, cache, name):
+    results = future.result() if future is not None else []
+    if cached is None:
+        return results
+    computed = {}
+    for text, output, error in results:
+        computed[text] = (output, error)
+        if error is None:
+            cache.put(name, mode, key, text, output)
+    return [(text, output, None) if output is not None else (text, *computed[text])
+            for text, output in zip(batch, cached)]
+
+def process_texts_parallel(cipher_name, mode, texts, key, verbose, jobs, chunk_size=1000, cache=None):
+    """
+    Process texts on a pool of worker processes, yielding results in input order.
+
+    Batches of ``chunk_size`` texts are submitted with at most ``2 * jobs``
+    batches in flight, so results stream back while the input is still being
+    read and memory stays bounded.
+
+    Args:
+        cipher_name (str): Key of the cipher in ``CIPHERS``.
+        mode (str): 'encrypt' or 'decrypt'.
+        texts (iterable[str]): Input texts.
+        key (str): Cipher key, compiled once per worker.
+        verbose (bool): Print each result to stderr as it is yielded.
+        jobs (int): Number of worker processes.
+        chunk_size (int): Texts per batch.
+        cache (ResultCache or None): Cache consulted before a batch is sent
+            to a worker; only the texts it cannot answer are sent, once each.
+    Yields:
+        tuple: (text, output, error) with output None and error set on failure.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    name = metrics.cipher_name(type(CIPHERS[cipher_name]))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(cipher_name, key)) as pool:
+        pending = deque()
+        batches = _batches(texts, chunk_size)
+        for batch in batches:
+            pending.append(_submit_batch(pool, mode, batch, key, cache, name))
+            if len(pending) >= 2 * jobs:
+                results = _batch_results(*pending.popleft(), mode, key, cache, name)
+                yield from _drain(results, cipher_name, key, verbose)
+        while pending:
+            yield from _drain(_batch_results(*pending.popleft(), mode, key, cache, name), cipher_name, key, verbose)
+
+def _drain(results, cipher_name, key, verbose):
+    for text, output, error in results:
+        if error is not None:
+            print(f"Error: {error}", file=sys.stderr)
+        elif verbose:
+            print(f"[VERBOSE] Cipher: {CIPHERS[cipher_name].__class__.__name__}, Key: {key}, Input: {text}, Output: {output}", file=sys.stderr)
+        yield text, output, error
+
+# Job records read ahead of the output; groups are formed within this window.
+JOB_WINDOW = 10000
+
+def read_jobs(lines):
+    """
+    Parse JSONL job records, one per non-blank line.
+
+    Args:
+        lines (iterable[str]): Input lines.
+    Yields:
+        tuple: (record, error) with record a dict holding cipher, mode, key and
+        text, or None and error set when the line is not a valid job.
+    """
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield None, f"Line {number}: not valid JSON"
+            continue
+        if not isinstance(record, dict):
+            yield None, f"Line {number}: a job must be a JSON object"
+            continue
+        error = _job_error(record)
+        yield (record, None) if error is None else ({'id': record.get('id')}, f"Line {number}: {error}")
+
+def _job_error(record):
+    if record.get('cipher') not in CIPHERS:
+        return f"unknown cipher {record.get('cipher')!r}"
+    if record.get('mode') not in ('encrypt', 'decrypt'):
+        return "mode must be 'encrypt' or 'decrypt'"
+    if isinstance(record.get('key'), int) and not isinstance(record['key'], bool):
+        record['key'] = str(record['key'])
+    if not isinstance(record.get('key'), str):
+        return "key must be a string"
+    if not isinstance(record.get('text'), str):
+        return "text must be a string"
+    return None
+
+def _process_job_group(cipher_name, key, items):
+    """
+    Run the (mode, text) items of one group with a single compiled key.
+
+    Returns:
+        list[tuple]: (output, error) per item, with output None on error.
+    """
+    try:
+        compiled = CIPHERS[cipher_name].compile(key)
+    except InvalidKeyError as e:
+        return [(None, str(e))] * len(items)
+    results = []
+    for mode, text in items:
+        try:
+            results.append((compiled.encrypt(text) if mode == 'encrypt' else compiled.decrypt(text), None))
+        except (InvalidKeyError, InvalidTextError) as e:
+            results.append((None, str(e)))
+    return results
+
+def _job_window(jobs, chunk_size):
+    """Group one window of jobs by (cipher, key); returns (slots, [(indices, args)])."""
+    slots = []
+    groups = {}
+    for record, error in jobs:
+        if record is not None and error is None:
+            group = groups.setdefault((record['cipher'], record['key']), ([], []))
+            group[0].append(len(slots))
+            group[1].append((record['mode'], record['text']))
+        slots.append([record, None, error])
+    work = []
+    for (cipher_name, key), (indices, items) in groups.items():
+        # Large groups are split so that one busy key still spreads over the workers.
+        for start in range(0, len(items), chunk_size):
+            work.append((indices[start:start + chunk_size], (cipher_name, key, items[start:start + chunk_size])))
+    return slots, work
+
+def run_jobs(jobs, workers=1, chunk_size=1000, window=JOB_WINDOW):
+    """
+    Run heterogeneous job records, yielding results in input order.
+
+    Records are read ``window`` at a time and grouped by (cipher, key), so
+    each key is compiled once per group whatever the mix of modes; with
+    ``workers`` > 1 the groups run on a process pool and the next window is
+    submitted before the previous one is written.
+
+    Args:
+        jobs (iterable[tuple]): (record, error) pairs from ``read_jobs``.
+        workers (int): Worker processes; 1 runs the groups in this process.
+        chunk_size (int): Records per submitted group at most.
+        window (int): Records grouped together.
+    Yields:
+        tuple: (record, output, error) with output None and error set on failure.
+    """
+    from itertools import islice
+    jobs = iter(jobs)
+    pool = None
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending = deque()
+        while True:
+            slots, work = _job_window(islice(jobs, window), chunk_size)
+            if not slots:
+                break
+            if pool is None:
+                pending.append((slots, [(indices, _process_job_group(*args)) for indices, args in work]))
+            else:
+                pending.append((slots, [(indices, pool.submit(_process_job_group, *args)) for indices, args in work]))
+            if len(pending) >= 2 or pool is None:
+                yield from _finish_window(*pending.popleft())
+        while pending:
+            yield from _finish_window(*pending.popleft())
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+def _finish_window(slots, work):
+    for indices, results in work:
+        if not isinstance(results, list):
+            results = results.result()
+        for index, (output, error) in zip(indices, results):
+            slots[index][1:] = output, error
+    for record, output, error in slots:
+        yield record, output, error
+
+def format_job_result(record, output, error):
+    """
+    Format the result of one job record as a JSON line.
+
+    The record's ``id`` is copied when present, so results can also be
+    matched without relying on their order.
+    """
+    result = {} if record is None or record.get('id') is None else {'id': record['id']}
+    if error is None:
+        result['output'] = output
+    else:
+        result['error'] = error
+    return json.dumps(result, ensure_ascii=False)
+
+def _report(results):
+    """Pass results through, printing the error of each failed one to stderr."""
+    for result in results:
+        if result[-1] is not None:
+            print(f"Error: {result[-1]}", file=sys.stderr)
+        yield result
+
+def format_candidates(fmt, text, candidates, error=None):
+    """
+    Format the crack result for one input (without the newline).
+
+    Args:
+        fmt (str): 'annotated', 'raw' or 'jsonl'.
+        text (str): Ciphertext.
+        candidates (list[Candidate]): Ranked candidates, best first.
+        error (str or None): Error message if the text could not be analysed.
+    Returns:
+        str: The line; raw format writes only the best plaintext.
+    """
+    if error is not None:
+        if fmt == 'jsonl':
+            return json.dumps({'input': text, 'error': error}, ensure_ascii=False)
+        return '' if fmt == 'raw' else f"Input: {text} -> Error: {error}"
+    if fmt == 'jsonl':
+        return json.dumps({'input': text, 'candidates': [
+            {'key': c.key, 'score': round(c.score, 4), 'output': c.plaintext} for c in candidates
+        ]}, ensure_ascii=False)
+    if not candidates:
+        return '' if fmt == 'raw' else f"Input: {text} -> Error: No candidates"
+    best = candidates[0]
+    if fmt == 'raw':
+        return best.plaintext
+    others = ', '.join(f"{c.key} ({c.score:.2f})" for c in candidates[1:])
+    line = f"Input: {text} -> Key: {best.key} (score {best.score:.2f}) -> Output: {best.plaintext}"
+    return f"{line} [also: {others}]" if others else line
+
+def read_texts(args):
+    """
+    Lazily yield the input texts selected on the command line.
+
+    Blank lines of an input file are skipped; ``--input-file -`` reads stdin.
+    """
     if args.text_list:
         for t in args.text_list:
-            texts.extend([s for s in t.split(args.delimiter) if s])
+            yield from (s for s in t.split(args.delimiter) if s)
     elif args.input_file:
-        try:
-            with open(args.input_file, 'r', encoding='utf-8') as f:
-                texts = [line.rstrip('\n') for line in f if line.strip()]
-        except Exception as e:
-            print(f"Error reading input file: {e}", file=sys.stderr)
-            sys.exit(1)
+        yield from (line for line in read_lines(args.input_file) if line.strip())
+    elif args.texts:
+        yield from (t for t in args.texts if t)
     elif args.text:
-        texts = [args.text]
+        yield args.text
+
+def read_lines(input_file):
+    """Lazily yield the lines of a file ('-' for stdin) without newlines; exits with status 1 on failure."""
+    try:
+        f = sys.stdin if input_file == '-' else open(input_file, 'r', encoding='utf-8')
+        with f:
+            if metrics.enabled:
+                yield from _timed_lines(f)
+            else:
+                for line in f:
+                    yield line.rstrip('\n')
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Error reading input file: {e}", file=sys.stderr)
+        sys.exit(1)
+
+def _timed_lines(f):
+    lines = iter(f)
+    while True:
+        with metrics.timed('io', 'cli', 'read') as timer:
+            line = next(lines, None)
+            timer.items = len(line) if line is not None else 0
+        if line is None:
+            return
+        yield line.rstrip('\n')
+
+def format_result(fmt, text, output, error):
+    """
+    Format one result as an output line (without the newline).
+
+    Args:
+        fmt (str): 'annotated', 'raw' or 'jsonl'.
+        text (str): Input text.
+        output (str or None): Cipher output, None on error.
+        error (str or None): Error message.
+    Returns:
+        str: The line; raw format writes an empty line for failed inputs.
+    """
+    if fmt == 'raw':
+        return output if output is not None else ''
+    if fmt == 'jsonl':
+        record = {'input': text, 'output': output} if output is not None else {'input': text, 'error': error}
+        return json.dumps(record, ensure_ascii=False)
+    if output is not None:
+        return f"Input: {text} -> Output: {output}"
+    return f"Input: {text} -> Error: {error}"
+
+def write_lines(lines, out_file, buffer_size=WRITE_BUFFER_SIZE):
+    """
+    Write lines with buffered bulk writes.
+
+    Args:
+        lines (iterable[str]): Lines without trailing newlines.
+        out_file: Writable text file.
+        buffer_size (int): Characters collected before each write.
+    """
+    buffer = []
+    buffered = 0
+    for line in lines:
+        buffer.append(line)
+        buffered += len(line) + 1
+        if buffered >= buffer_size:
+            _write_buffer(out_file, buffer)
+            buffer = []
+            buffered = 0
+    if buffer:
+        _write_buffer(out_file, buffer)
+
+def _write_buffer(out_file, buffer):
+    buffer.append('')
+    data = '\n'.join(buffer)
+    with metrics.timed('io', 'cli', 'write', len(data)):
+        out_file.write(data)
+
+def main():
+    if sys.argv[1:2] == ['jobs']:
+        run_instrumented(run_job_file, parse_job_args(sys.argv[2:]))
     else:
-        print("No input text provided.", file=sys.stderr)
+        run_instrumented(run_cipher, parse_args())
+
+def run_instrumented(run, args):
+    """Call run(args), collecting metrics with --stats and profiling with --profile."""
+    if args.stats:
+        metrics.enable()
+    profiler = None
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+    start = time.perf_counter()
+    try:
+        if profiler is not None:
+            profiler.runcall(run, args)
+        else:
+            run(args)
+    finally:
+        if args.stats:
+            metrics.disable()
+            print(metrics.summary(time.perf_counter() - start), file=sys.stderr)
+        if profiler is not None:
+            write_profile(profiler, args.profile)
+
+def write_profile(profiler, path):
+    """Save cProfile statistics to path and their collapsed stacks to path + '.folded'."""
+    import pstats
+    try:
+        profiler.dump_stats(path)
+        metrics.write_collapsed(pstats.Stats(profiler), path + '.folded')
+    except OSError as e:
+        print(f"Error writing profile: {e}", file=sys.stderr)
         sys.exit(1)
-    
+    print(f"Profile written to {path} and {path}.folded", file=sys.stderr)
+
+def run_job_file(args):
+    lines = (format_job_result(*result) for result in
+             run_jobs(read_jobs(read_lines(args.input_file)), args.jobs, args.chunk_size))
+    write_output(lines, args.output_file)
+
+def run_document(args):
+    """Encrypt or decrypt the input file as one document, on ``--jobs`` processes."""
+    from ciphers.parallel import parallel_transform, parallel_transform_file
+    try:
+        compiled = CIPHERS[args.cipher].compile(args.key)
+    except InvalidKeyError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    to_stdout = args.output_file in (None, '-')
+    try:
+        sink = sys.stdout.buffer if to_stdout else open(args.output_file, 'wb')
+        try:
+            if args.input_file == '-':
+                sink.write(parallel_transform(compiled, args.mode, sys.stdin.buffer.read(), args.jobs))
+            else:
+                parallel_transform_file(compiled, args.mode, args.input_file, sink, args.jobs)
+            sink.flush()
+        finally:
+            if not to_stdout:
+                sink.close()
+    except (OSError, InvalidTextError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+def run_cipher(args):
+    if args.document:
+        run_document(args)
+        return
+    cipher = CIPHERS[args.cipher]
+    texts = read_texts(args)
+
     # Process
-    results = process_texts(cipher, args.mode, texts, args.key, args.verbose)
-    
-    # Output
-    output_lines = []
-    for inp, out in results:
-        if out is not None:
-            output_lines.append(f"Input: {inp} -> Output: {out}")
+    if args.mode == 'crack':
+        options = {name: getattr(args, name) for name in CRACKERS[args.cipher][3] if getattr(args, name) is not None}
+        results = crack_texts(args.cipher, texts, args.top, args.method, **options)
+        write_output((format_candidates(args.format, *result) for result in _report(results)), args.output_file)
+        return
+    cache = open_result_cache(args) if args.cache else None
+    try:
+        if args.jobs > 1:
+            results = process_texts_parallel(args.cipher, args.mode, texts, args.key, args.verbose, args.jobs,
+                                             args.chunk_size, cache)
         else:
-            output_lines.append(f"Input: {inp} -> Error: Invalid key")
-    output = '\n'.join(output_lines)
-    if args.output_file:
-        try:
-            with open(args.output_file, 'w', encoding='utf-8') as f:
-                f.write(output + '\n')
-        except Exception as e:
-            print(f"Error writing output file: {e}", file=sys.stderr)
-            sys.exit(1)
-    else:
-        print(output)
+            results = process_texts(cipher, args.mode, texts, args.key, args.verbose, cache)
+        write_output((format_result(args.format, *result) for result in results), args.output_file)
+    finally:
+        if cache is not None:
+            cache.close()
+            if args.stats or args.verbose:
+                print(cache.summary(), file=sys.stderr)
+
+def open_result_cache(args):
+    """Create the --cache result cache; exits with status 1 if --cache-file cannot be opened."""
+    import sqlite3
+    from ciphers.resultcache import ResultCache
+    try:
+        return ResultCache(args.cache_mb << 20, args.cache_file)
+    except (OSError, sqlite3.Error) as e:
+        print(f"Error opening cache file: {e}", file=sys.stderr)
+        sys.exit(1)
+
+def write_output(lines, output_file):
+    """Write lines to a file or, for None or '-', stdout; exits with status 1 on failure."""
+    to_stdout = output_file in (None, '-')
+    try:
+        out_file = sys.stdout if to_stdout else open(output_file, 'w', encoding='utf-8')
+    except OSError as e:
+        print(f"Error writing output file: {e}", file=sys.stderr)
+        sys.exit(1)
+    try:
+        write_lines(lines, out_file)
+        out_file.flush()
+    except OSError as e:
+        print(f"Error writing output file: {e}", file=sys.stderr)
+        sys.exit(1)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if not to_stdout:
+            out_file.close()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
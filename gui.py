@@ -1,20 +1,22 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from ciphers.caesar import CaesarCipher
-from ciphers.vigenere import VigenereCipher
-from ciphers.playfair import PlayfairCipher
-from ciphers.substitution import SubstitutionCipher
-from ciphers.hill import HillCipher
 from ciphers import InvalidKeyError
-import numpy as np
-
-CIPHERS = {
-    'Caesar': CaesarCipher(),
-    'Vigenère': VigenereCipher(),
-    'Playfair': PlayfairCipher(),
-    'Substitution': SubstitutionCipher(),
-    'Hill': HillCipher(),
+from ciphers.incremental import live_preview
+from ciphers.registry import available_ciphers, get_cipher
+import functools
+import queue
+import threading
+
+# Display name -> registry name; each cipher module is imported when first used.
+CIPHER_NAMES = {
+    'Caesar': 'caesar',
+    'Vigenère': 'vigenere',
+    'Playfair': 'playfair',
+    'Substitution': 'substitution',
+    'Hill': 'hill',
 }
+# Installed plugin ciphers are listed under their registry names.
+CIPHER_NAMES.update({name: name for name in available_ciphers() if name not in CIPHER_NAMES.values()})
 
 KEY_HINTS = {
     'Caesar': 'Integer (e.g., 3)',
@@ -24,6 +26,15 @@ KEY_HINTS = {
     'Hill': 'Perfect square length (e.g., 4, 9, 16) alphabetic',
 }
 
+# Characters handed to the cipher at a time by the background worker.
+CHUNK_SIZE = 1 << 16
+# Most characters shown in a text widget; longer texts are kept in memory only.
+PREVIEW_CHARS = 100_000
+# Milliseconds between checks for worker progress.
+POLL_INTERVAL = 50
+# Milliseconds of quiet after an edit before the live preview updates.
+LIVE_DELAY = 150
+
 BG_COLOR = '#232946'
 HEADER_COLOR = '#121629'
 ACCENT_COLOR = '#eebbc3'
@@ -35,6 +46,68 @@ FONT = ('Segoe UI', 12)
 HEADER_FONT = ('Segoe UI', 18, 'bold')
 HIST_FONT = ('Segoe UI', 10)
 
+class CipherJob(threading.Thread):
+    """
+    Encrypts or decrypts a text chunk by chunk off the Tk thread.
+
+    Progress is reported through ``events`` as ('output', text, done),
+    then one of ('done', None, done), ('cancelled', None, done) or
+    ('error', exception, done); the GUI polls the queue with ``after()``.
+    """
+
+    def __init__(self, compiled, mode, text, chunk_size=CHUNK_SIZE):
+        super().__init__(daemon=True)
+        self.compiled = compiled
+        self.mode = mode
+        self.text = text
+        self.chunk_size = chunk_size
+        self.events = queue.Queue()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """Stop before the next chunk."""
+        self._cancelled.set()
+
+    def run(self):
+        transform = self.compiled.encryptor() if self.mode == 'Encrypt' else self.compiled.decryptor()
+        done = 0
+        try:
+            while done < len(self.text):
+                if self._cancelled.is_set():
+                    self.events.put(('cancelled', None, done))
+                    return
+                chunk = self.text[done:done + self.chunk_size]
+                done += len(chunk)
+                self.events.put(('output', transform.update(chunk), done))
+            self.events.put(('output', transform.finalize(), done))
+        except Exception as e:
+            self.events.put(('error', e, done))
+            return
+        self.events.put(('done', None, done))
+
+@functools.lru_cache(maxsize=64)
+def key_visualization(cipher, key):
+    """
+    Describe the key-derived grid shown for a cipher and key.
+
+    Returns:
+        tuple: (label, grid text); both empty for ciphers without a grid.
+    """
+    if cipher == 'Playfair':
+        try:
+            square = get_cipher('playfair')._generate_square(key)
+        except Exception:
+            return 'Invalid key for Playfair grid.', ''
+        return 'Playfair 5x5 Grid:', '\n'.join(' '.join(row) for row in square)
+    if cipher == 'Hill':
+        try:
+            matrix = get_cipher('hill')._key_to_matrix(key)
+        except Exception:
+            return 'Invalid key for Hill matrix.', ''
+        return (f'Hill Matrix ({matrix.shape[0]}x{matrix.shape[1]}):',
+                '\n'.join(' '.join(f'{int(num):2d}' for num in row) for row in matrix))
+    return '', ''
+
 class CipherGUI(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -43,6 +116,16 @@ class CipherGUI(tk.Tk):
         self.resizable(False, False)
         self.configure(bg=BG_COLOR)
         self.history = []
+        self.job = None
+        self.job_entry = None
+        # Full texts behind the bounded previews in the input and result widgets.
+        self.loaded_text = None
+        self.loaded_preview = None
+        self.result_chunks = []
+        self.result_shown = 0
+        self.live = None
+        self.live_after = None
+        self.visual_shown = None
         self.create_widgets()
 
     def create_widgets(self):
@@ -58,7 +141,7 @@ class CipherGUI(tk.Tk):
         # Cipher selection
         tk.Label(main, text='Cipher:', bg=BG_COLOR, fg=TEXT_COLOR, font=FONT).grid(row=0, column=0, sticky='w', pady=(0, 10))
         self.cipher_var = tk.StringVar(value='Caesar')
-        cipher_menu = ttk.Combobox(main, textvariable=self.cipher_var, values=list(CIPHERS.keys()), state='readonly', font=FONT, width=18)
+        cipher_menu = ttk.Combobox(main, textvariable=self.cipher_var, values=list(CIPHER_NAMES), state='readonly', font=FONT, width=18)
         cipher_menu.grid(row=0, column=1, sticky='w', pady=(0, 10))
         cipher_menu.bind('<<ComboboxSelected>>', self.update_key_hint_and_visual)
 
@@ -73,23 +156,33 @@ class CipherGUI(tk.Tk):
         self.encrypt_btn.bind('<Button-1>', lambda e: self.set_mode('Encrypt'))
         self.decrypt_btn.bind('<Button-1>', lambda e: self.set_mode('Decrypt'))
         self.update_mode_buttons()
+        self.live_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(main, text='Live preview', variable=self.live_var, command=self.schedule_live_preview, bg=BG_COLOR, fg=TEXT_COLOR, selectcolor=ENTRY_BG, activebackground=BG_COLOR, activeforeground=ACCENT_COLOR, font=('Segoe UI', 10)).grid(row=1, column=2, padx=10, sticky='w')
 
         # Text input
         tk.Label(main, text='Text:', bg=BG_COLOR, fg=TEXT_COLOR, font=FONT).grid(row=2, column=0, sticky='nw')
         self.text_entry = tk.Text(main, height=4, width=40, bg=ENTRY_BG, fg=TEXT_COLOR, font=FONT, insertbackground=ACCENT_COLOR, bd=0, relief='flat')
         self.text_entry.grid(row=2, column=1, pady=5, sticky='w')
+        self.text_entry.bind('<<Modified>>', self.on_text_modified)
         tk.Button(main, text='Load from File', command=self.load_text_file, bg=BTN_COLOR, fg=BTN_TEXT, font=('Segoe UI', 10), bd=0, relief='flat', padx=10, pady=2, cursor='hand2').grid(row=2, column=2, padx=10)
 
         # Key input
         tk.Label(main, text='Key:', bg=BG_COLOR, fg=TEXT_COLOR, font=FONT).grid(row=3, column=0, sticky='w')
         self.key_entry = tk.Entry(main, width=30, bg=ENTRY_BG, fg=TEXT_COLOR, font=FONT, insertbackground=ACCENT_COLOR, bd=0, relief='flat')
         self.key_entry.grid(row=3, column=1, pady=5, sticky='w')
+        self.key_entry.bind('<KeyRelease>', self.schedule_live_preview)
         self.key_hint_var = tk.StringVar(value=KEY_HINTS['Caesar'])
         tk.Label(main, textvariable=self.key_hint_var, bg=BG_COLOR, fg=ACCENT_COLOR, font=('Segoe UI', 10, 'italic')).grid(row=4, column=1, sticky='w')
 
         # Action button
         self.action_btn = tk.Button(main, text='Run', command=self.run_cipher_action, bg=BTN_COLOR, fg=BTN_TEXT, font=FONT, activebackground=ACCENT_COLOR, activeforeground=BTN_TEXT, bd=0, relief='flat', padx=20, pady=5, cursor='hand2')
         self.action_btn.grid(row=5, column=0, columnspan=2, pady=20)
+        job_frame = tk.Frame(main, bg=BG_COLOR)
+        job_frame.grid(row=5, column=2, padx=10)
+        self.progress = ttk.Progressbar(job_frame, orient='horizontal', length=120, mode='determinate', maximum=1.0)
+        self.progress.pack(pady=(0, 5))
+        self.cancel_btn = tk.Button(job_frame, text='Cancel', command=self.cancel_job, bg=BTN_COLOR, fg=BTN_TEXT, font=('Segoe UI', 10), bd=0, relief='flat', padx=10, pady=2, cursor='hand2', state='disabled')
+        self.cancel_btn.pack()
 
         # Output
         tk.Label(main, text='Result:', bg=BG_COLOR, fg=TEXT_COLOR, font=FONT).grid(row=6, column=0, sticky='nw')
@@ -116,6 +209,7 @@ class CipherGUI(tk.Tk):
     def set_mode(self, mode):
         self.mode_var.set(mode)
         self.update_mode_buttons()
+        self.schedule_live_preview()
 
     def update_mode_buttons(self):
         if self.mode_var.get() == 'Encrypt':
@@ -129,8 +223,50 @@ class CipherGUI(tk.Tk):
         cipher = self.cipher_var.get()
         self.key_hint_var.set(KEY_HINTS.get(cipher, ''))
         self.update_visualization()
+        self.schedule_live_preview()
+
+    def on_text_modified(self, event=None):
+        # Clearing the flag fires <<Modified>> again, with the flag unset.
+        if self.text_entry.edit_modified():
+            self.text_entry.edit_modified(False)
+            self.schedule_live_preview()
+
+    def schedule_live_preview(self, event=None):
+        """Refresh the live preview once edits pause for ``LIVE_DELAY`` ms."""
+        if self.live_after is not None:
+            self.after_cancel(self.live_after)
+            self.live_after = None
+        if self.live_var.get():
+            self.live_after = self.after(LIVE_DELAY, self.refresh_live_preview)
+
+    def refresh_live_preview(self):
+        """Re-encipher only the edited region of the input into the result pane."""
+        self.live_after = None
+        if not self.live_var.get() or self.job is not None:
+            return
+        cipher = self.cipher_var.get()
+        text = self.text_entry.get('1.0', 'end-1c')
+        key = self.key_entry.get().strip()
+        self.update_visualization()
+        if not key:
+            self.clear_result()
+            return
+        try:
+            compiled = get_cipher(CIPHER_NAMES[cipher]).compile(key)
+            mode = self.mode_var.get().lower()
+            if self.live is None or self.live.compiled is not compiled or self.live.mode != mode:
+                self.live = live_preview(compiled, mode)
+            output = self.live.update(text)
+        except Exception as e:
+            self.key_hint_var.set(f'Live preview: {e}')
+            return
+        self.key_hint_var.set(KEY_HINTS.get(cipher, ''))
+        self.clear_result()
+        self.append_result(output)
 
     def run_cipher_action(self):
+        if self.job is not None:
+            return
         cipher = self.cipher_var.get()
         mode = self.mode_var.get()
         text = self.text_entry.get('1.0', 'end').strip()
@@ -141,30 +277,88 @@ class CipherGUI(tk.Tk):
         if not key:
             messagebox.showwarning('Key Required', 'Please enter a key.')
             return
-        result = self.run_cipher(cipher, mode, text, key)
-        self.result_text.config(state='normal')
-        self.result_text.delete('1.0', 'end')
-        self.result_text.insert('1.0', result)
-        self.result_text.config(state='disabled')
-        self.add_history(cipher, mode, text, key, result)
-        self.update_visualization()
-
-    def run_cipher(self, cipher_name, mode, text, key):
-        cipher = CIPHERS[cipher_name]
+        if self.loaded_text is not None and text == self.loaded_preview:
+            text = self.loaded_text
         try:
-            if mode == 'Encrypt':
-                return cipher.encrypt(text, key)
-            else:
-                return cipher.decrypt(text, key)
+            compiled = get_cipher(CIPHER_NAMES[cipher]).compile(key)
         except InvalidKeyError as e:
             messagebox.showerror('Invalid Key', str(e))
-            return ''
+            return
         except Exception as e:
             messagebox.showerror('Error', str(e))
-            return ''
+            return
+        self.clear_result()
+        self.progress['value'] = 0
+        self.action_btn.config(state='disabled')
+        self.cancel_btn.config(state='normal')
+        self.job = CipherJob(compiled, mode, text)
+        self.job_entry = (cipher, mode, text, key)
+        self.job.start()
+        self.after(POLL_INTERVAL, self.poll_job)
+
+    def cancel_job(self):
+        if self.job is not None:
+            self.job.cancel()
+
+    def poll_job(self):
+        """Move worker output into the result preview and finish the job when it ends."""
+        job = self.job
+        while True:
+            try:
+                kind, value, done = job.events.get_nowait()
+            except queue.Empty:
+                self.after(POLL_INTERVAL, self.poll_job)
+                return
+            self.progress['value'] = done / max(len(job.text), 1)
+            if kind == 'output':
+                self.append_result(value)
+                continue
+            self.job = None
+            self.action_btn.config(state='normal')
+            self.cancel_btn.config(state='disabled')
+            if kind == 'error':
+                title = 'Invalid Key' if isinstance(value, InvalidKeyError) else 'Error'
+                messagebox.showerror(title, str(value))
+                self.clear_result()
+            elif kind == 'cancelled':
+                self.clear_result()  # So Copy and Save cannot export a partial result.
+            elif kind == 'done':
+                self.add_history(*self.job_entry, self.full_result())
+                self.update_visualization()
+            self.job_entry = None
+            return
+
+    def clear_result(self):
+        self.result_chunks = []
+        self.result_shown = 0
+        self.result_text.config(state='normal')
+        self.result_text.delete('1.0', 'end')
+        self.result_text.config(state='disabled')
+
+    def append_result(self, output):
+        """Keep worker output and show it until the preview is full."""
+        if not output:
+            return
+        self.result_chunks.append(output)
+        if self.result_shown > PREVIEW_CHARS:
+            return  # Preview already truncated.
+        room = PREVIEW_CHARS - self.result_shown
+        self.result_text.config(state='normal')
+        self.result_text.insert('end', output[:room])
+        if len(output) > room:
+            self.result_text.insert('end', '\n[Preview truncated; copy or save for the full result]')
+            self.result_shown = PREVIEW_CHARS + 1
+        else:
+            self.result_shown += len(output)
+        self.result_text.config(state='disabled')
+
+    def full_result(self):
+        if len(self.result_chunks) > 1:
+            self.result_chunks = [''.join(self.result_chunks)]
+        return self.result_chunks[0] if self.result_chunks else ''
 
     def copy_result(self):
-        result = self.result_text.get('1.0', 'end').strip()
+        result = self.full_result().strip()
         if result:
             self.clipboard_clear()
             self.clipboard_append(result)
@@ -176,13 +370,17 @@ class CipherGUI(tk.Tk):
             try:
                 with open(path, 'r', encoding='utf-8') as f:
                     content = f.read()
+                # Large files are processed in full but only previewed in the widget.
+                large = len(content) > PREVIEW_CHARS
+                self.loaded_text = content if large else None
+                self.loaded_preview = content[:PREVIEW_CHARS].strip() if large else None
                 self.text_entry.delete('1.0', 'end')
-                self.text_entry.insert('1.0', content)
+                self.text_entry.insert('1.0', content[:PREVIEW_CHARS])
             except Exception as e:
                 messagebox.showerror('File Error', f'Could not read file: {e}')
 
     def save_result_file(self):
-        result = self.result_text.get('1.0', 'end').strip()
+        result = self.full_result().strip()
         if not result:
             messagebox.showwarning('No Result', 'No result to save.')
             return
@@ -196,37 +394,24 @@ class CipherGUI(tk.Tk):
                 messagebox.showerror('File Error', f'Could not save file: {e}')
 
     def add_history(self, cipher, mode, text, key, result):
+        """Record a finished job; like the widgets, history keeps only previews of long texts."""
         entry = f'{cipher} | {mode} | Text: {text[:20]}... | Key: {key} | Result: {result[:20]}...'
-        self.history.insert(0, (cipher, mode, text, key, result))
+        self.history.insert(0, (cipher, mode, text[:PREVIEW_CHARS], key, result[:PREVIEW_CHARS]))
         self.history_list.insert(0, entry)
         if self.history_list.size() > 50:
             self.history_list.delete(50, 'end')
             self.history = self.history[:50]
 
     def update_visualization(self):
-        cipher = self.cipher_var.get()
-        key = self.key_entry.get().strip()
-        self.visual_label.config(text='')
+        shown = (self.cipher_var.get(), self.key_entry.get().strip())
+        if shown == self.visual_shown:
+            return
+        self.visual_shown = shown
+        label, grid = key_visualization(*shown) if shown[1] else ('', '')
+        self.visual_label.config(text=label)
         self.visual_matrix.config(state='normal')
         self.visual_matrix.delete('1.0', 'end')
-        if cipher == 'Playfair' and key:
-            try:
-                pf = CIPHERS['Playfair']
-                square = pf._generate_square(key)
-                self.visual_label.config(text='Playfair 5x5 Grid:')
-                grid_str = '\n'.join(' '.join(row) for row in square)
-                self.visual_matrix.insert('1.0', grid_str)
-            except Exception:
-                self.visual_label.config(text='Invalid key for Playfair grid.')
-        elif cipher == 'Hill' and key:
-            try:
-                hc = CIPHERS['Hill']
-                matrix = hc._key_to_matrix(key)
-                self.visual_label.config(text=f'Hill Matrix ({matrix.shape[0]}x{matrix.shape[1]}):')
-                mat_str = '\n'.join(' '.join(f'{int(num):2d}' for num in row) for row in matrix)
-                self.visual_matrix.insert('1.0', mat_str)
-            except Exception:
-                self.visual_label.config(text='Invalid key for Hill matrix.')
+        self.visual_matrix.insert('1.0', grid)
         self.visual_matrix.config(state='disabled')
 
 if __name__ == '__main__':
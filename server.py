@@ -0,0 +1,376 @@
+"""
+Long-running cipher service speaking newline-delimited JSON over TCP or a Unix socket.
+
+Each request is one JSON object per line and gets one JSON line back with
+the same ``id``; responses are written as requests complete, so clients
+can pipeline:
+
+    {"id": 1, "cipher": "caesar", "mode": "encrypt", "key": "3", "text": "Hello"}
+    {"id": 1, "output": "Khoor"}
+    {"id": 2, "cipher": "vigenere", "mode": "crack", "text": "...", "top": 2}
+    {"id": 2, "candidates": [{"key": "LEMON", "score": 0.99, "output": "..."}, ...]}
+    {"id": 3, "cipher": "hill", "mode": "encrypt", "key": "AAAA", "text": "x"}
+    {"id": 3, "error": "Key matrix is not invertible modulo 26."}
+    {"mode": "stats"}
+    {"stats": {"requests": 3, "batches": 2, ...}}
+
+Requests with the same cipher, mode and key that arrive within
+``--batch-delay`` seconds are processed as one batch with one compiled key.
+Small batches run on the event loop; large batches and crack requests run
+on a process pool. At most ``--max-pending`` requests are in flight;
+beyond that the server stops reading from its sockets until work
+completes. SIGINT or SIGTERM stops accepting connections, finishes the
+requests already read and then exits.
+
+Usage:
+    python server.py --port 8765 --jobs 4
+    python server.py --unix /tmp/ciphers.sock
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from ciphers import InvalidKeyError, InvalidTextError
+from ciphers.cracking import CRACKERS, crack_texts
+from ciphers.registry import registry
+
+# Seconds a batch stays open for more requests with the same key.
+BATCH_DELAY = 0.002
+# Requests processed together at most; a full batch is flushed at once.
+MAX_BATCH = 256
+# Batches with fewer characters than this run on the event loop.
+INLINE_CHARS = 1 << 16
+# Requests read but not yet answered, over all connections.
+MAX_PENDING = 4096
+# Longest request line in bytes.
+MAX_LINE = 1 << 24
+# Upper bounds on the work a crack request may ask for; larger values are clamped.
+MAX_TOP = 20
+MAX_RESTARTS = 64
+# Seconds given to in-flight requests on shutdown.
+SHUTDOWN_TIMEOUT = 30.0
+# Errors reported back to the client; anything else is a server bug.
+REQUEST_ERRORS = (InvalidKeyError, InvalidTextError, ValueError, TypeError)
+
+def process_batch(cipher_name, mode, key, texts):
+    """
+    Encrypt or decrypt texts with one key; runs inline or in a worker process.
+
+    The compiled key comes from the process-wide key cache, so a key stays
+    warm across batches in each process.
+
+    Returns:
+        list[tuple]: (output, error) per text, with output None on error.
+    """
+    try:
+        compiled = registry[cipher_name].compile(key)
+    except InvalidKeyError as e:
+        return [(None, str(e))] * len(texts)
+    transform = compiled.encrypt if mode == 'encrypt' else compiled.decrypt
+    results = []
+    for text in texts:
+        try:
+            results.append((transform(text), None))
+        except REQUEST_ERRORS as e:
+            results.append((None, str(e)))
+    return results
+
+def crack(cipher_name, text, top, method, options):
+    """Recover the key of one ciphertext; returns candidate dicts as sent to clients."""
+    if not text:
+        return []
+    [(_, candidates, error)] = crack_texts(cipher_name, [text], top, method, **options)
+    if error is not None:
+        raise InvalidTextError(error)
+    return [{'key': c.key, 'score': round(c.score, 4), 'output': c.plaintext} for c in candidates]
+
+class RequestError(Exception):
+    """Raised for a malformed request; the message is sent to the client."""
+    pass
+
+class CipherServer:
+    """
+    Serves cipher requests, batching those that share a key.
+
+    Args:
+        jobs (int): Worker processes for large batches and crack requests;
+            0 runs batches on the event loop and cracks on a thread.
+        batch_delay (float): Seconds a batch waits for more requests.
+        max_batch (int): Requests per batch at most.
+        inline_chars (int): Batches smaller than this skip the pool.
+        max_pending (int): Requests in flight before reading pauses.
+    """
+
+    def __init__(self, jobs=1, batch_delay=BATCH_DELAY, max_batch=MAX_BATCH,
+                 inline_chars=INLINE_CHARS, max_pending=MAX_PENDING):
+        self.pool = ProcessPoolExecutor(jobs) if jobs > 0 else None
+        self.batch_delay = batch_delay
+        self.max_batch = max_batch
+        self.inline_chars = inline_chars
+        self.stats = {'requests': 0, 'errors': 0, 'batches': 0, 'pooled_batches': 0, 'cracks': 0,
+                      'connections': 0}
+        self._slots = asyncio.Semaphore(max_pending)
+        self._batches = {}
+        self._tasks = set()
+        self._connections = set()
+        self._server = None
+
+    async def start(self, host='127.0.0.1', port=0, path=None):
+        """
+        Start listening on a TCP port or, if path is given, a Unix socket.
+
+        Returns:
+            asyncio.base_events.Server: The listening server.
+        """
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle, path, limit=MAX_LINE)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port, limit=MAX_LINE)
+        return self._server
+
+    async def close(self, timeout=SHUTDOWN_TIMEOUT):
+        """Stop accepting, answer the requests already read, then release the pool."""
+        if self._server is not None:
+            self._server.close()
+        # End every read loop; each connection closes once its responses are written.
+        # Reading is paused first so that no data arrives after the end of stream.
+        for reader, writer in list(self._connections):
+            writer.transport.pause_reading()
+            reader.feed_eof()
+        for batch_key, batch in list(self._batches.items()):
+            self._flush(batch_key, batch)
+        # Connection handlers and batches are tracked together; batches still
+        # waiting for their delay are spawned while the handlers drain.
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while self._tasks and loop.time() < deadline:
+            await asyncio.wait(list(self._tasks), timeout=deadline - loop.time())
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+    def _spawn(self, coro):
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _handle(self, reader, writer):
+        self.stats['connections'] += 1
+        self._tasks.add(asyncio.current_task())
+        asyncio.current_task().add_done_callback(self._tasks.discard)
+        connection = (reader, writer)
+        self._connections.add(connection)
+        lock = asyncio.Lock()
+        responses = set()
+        try:
+            while True:
+                # Backpressure: no more reads while too many requests are in flight.
+                await self._slots.acquire()
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError) as e:
+                    self._slots.release()
+                    if isinstance(e, ValueError):
+                        await self._write(writer, lock, {'error': f"Request line longer than {MAX_LINE} bytes."})
+                    break
+                if not line:
+                    self._slots.release()
+                    break
+                if not line.strip():
+                    self._slots.release()
+                    continue
+                task = self._spawn(self._respond(line, writer, lock))
+                responses.add(task)
+                task.add_done_callback(responses.discard)
+            if responses:
+                await asyncio.wait(list(responses))
+        finally:
+            self._connections.discard(connection)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _write(self, writer, lock, response):
+        async with lock:
+            if writer.is_closing():
+                return
+            writer.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+
+    async def _respond(self, line, writer, lock):
+        request_id = None
+        try:
+            self.stats['requests'] += 1
+            try:
+                request = json.loads(line)
+            except ValueError:
+                raise RequestError("Request is not valid JSON.")
+            if not isinstance(request, dict):
+                raise RequestError("Request must be a JSON object.")
+            request_id = request.get('id')
+            response = await self.dispatch(request)
+        except (RequestError,) + REQUEST_ERRORS as e:
+            self.stats['errors'] += 1
+            response = {'error': str(e)}
+        except Exception as e:
+            self.stats['errors'] += 1
+            response = {'error': f"Internal error: {type(e).__name__}: {e}"}
+        finally:
+            self._slots.release()
+        if request_id is not None:
+            response = {'id': request_id, **response}
+        await self._write(writer, lock, response)
+
+    async def dispatch(self, request):
+        """
+        Answer one decoded request.
+
+        Returns:
+            dict: The response body without the id.
+        Raises:
+            RequestError: If the request is malformed.
+        """
+        mode = request.get('mode')
+        if mode == 'stats':
+            return {'stats': dict(self.stats)}
+        cipher_name = request.get('cipher')
+        if not isinstance(cipher_name, str) or cipher_name not in registry:
+            raise RequestError(f"Unknown cipher {cipher_name!r}.")
+        text = request.get('text')
+        if not isinstance(text, str):
+            raise RequestError("Field 'text' must be a string.")
+        if mode == 'crack':
+            return {'candidates': await self._crack(cipher_name, text, request)}
+        if mode not in ('encrypt', 'decrypt'):
+            raise RequestError("Field 'mode' must be 'encrypt', 'decrypt', 'crack' or 'stats'.")
+        key = request.get('key')
+        if isinstance(key, int) and not isinstance(key, bool):
+            key = str(key)
+        if not isinstance(key, str):
+            raise RequestError("Field 'key' must be a string.")
+        output, error = await self.submit(cipher_name, mode, key, text)
+        if error is not None:
+            raise RequestError(error)
+        return {'output': output}
+
+    async def submit(self, cipher_name, mode, key, text):
+        """
+        Queue one text into the open batch for its cipher, mode and key.
+
+        Returns:
+            tuple: (output, error) with output None on error.
+        """
+        loop = asyncio.get_running_loop()
+        batch_key = (cipher_name, mode, key)
+        batch = self._batches.get(batch_key)
+        if batch is None:
+            batch = self._batches[batch_key] = []
+            loop.call_later(self.batch_delay, self._flush, batch_key, batch)
+        future = loop.create_future()
+        batch.append((text, future))
+        if len(batch) >= self.max_batch:
+            self._flush(batch_key, batch)
+        return await future
+
+    def _flush(self, batch_key, batch):
+        if self._batches.get(batch_key) is batch:
+            del self._batches[batch_key]
+            self._spawn(self._run_batch(batch_key, batch))
+
+    async def _run_batch(self, batch_key, batch):
+        texts = [text for text, _ in batch]
+        self.stats['batches'] += 1
+        try:
+            if self.pool is not None and sum(map(len, texts)) >= self.inline_chars:
+                self.stats['pooled_batches'] += 1
+                loop = asyncio.get_running_loop()
+                results = await loop.run_in_executor(self.pool, process_batch, *batch_key, texts)
+            else:
+                results = process_batch(*batch_key, texts)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _crack(self, cipher_name, text, request):
+        if cipher_name not in CRACKERS:
+            raise RequestError(f"crack is supported for: {', '.join(CRACKERS)}")
+        _, _, methods, option_names = CRACKERS[cipher_name]
+        method = request.get('method') or methods[0]
+        if method not in methods:
+            raise RequestError(f"{cipher_name} crack supports method {', '.join(methods)}")
+        top = request.get('top', 3)
+        if not isinstance(top, int) or isinstance(top, bool) or top < 1:
+            raise RequestError("Field 'top' must be a positive integer.")
+        top = min(top, MAX_TOP)
+        # Restarts already run in this pool, so 'jobs' is not taken from requests.
+        options = {name: request[name] for name in option_names
+                   if name != 'jobs' and request.get(name) is not None}
+        if 'restarts' in options:
+            restarts = options['restarts']
+            if not isinstance(restarts, int) or isinstance(restarts, bool) or restarts < 1:
+                raise RequestError("Field 'restarts' must be a positive integer.")
+            options['restarts'] = min(restarts, MAX_RESTARTS)
+        self.stats['cracks'] += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.pool, crack, cipher_name, text, top, method, options)
+
+async def serve(args):
+    server = CipherServer(args.jobs, args.batch_delay, args.max_batch, args.inline_chars, args.max_pending)
+    listener = await server.start(args.host, args.port, args.unix)
+    where = args.unix or ', '.join(f'{s.getsockname()[0]}:{s.getsockname()[1]}' for s in listener.sockets)
+    print(f"Serving on {where}", file=sys.stderr, flush=True)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows: Ctrl+C still stops the loop, without draining.
+    await stop.wait()
+    print("Shutting down", file=sys.stderr, flush=True)
+    await server.close()
+    if args.unix:
+        try:
+            os.unlink(args.unix)
+        except OSError:
+            pass
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Classical ciphers NDJSON service')
+    parser.add_argument('--host', default='127.0.0.1', help='TCP address to bind (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='TCP port (default: 8765)')
+    parser.add_argument('--unix', help='Listen on this Unix socket path instead of TCP')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes for large batches and crack requests; 0 for none (default: CPU count)')
+    parser.add_argument('--batch-delay', type=float, default=BATCH_DELAY,
+                        help=f'Seconds a batch waits for requests with the same key (default: {BATCH_DELAY})')
+    parser.add_argument('--max-batch', type=int, default=MAX_BATCH, help=f'Requests per batch (default: {MAX_BATCH})')
+    parser.add_argument('--inline-chars', type=int, default=INLINE_CHARS,
+                        help=f'Batches with fewer characters run without the pool (default: {INLINE_CHARS})')
+    parser.add_argument('--max-pending', type=int, default=MAX_PENDING,
+                        help=f'Requests in flight before the server stops reading (default: {MAX_PENDING})')
+    args = parser.parse_args(argv)
+    if args.jobs < 0:
+        parser.error("--jobs must be at least 0")
+    if args.max_batch < 1 or args.max_pending < 1:
+        parser.error("--max-batch and --max-pending must be at least 1")
+    return args
+
+def main(argv=None):
+    asyncio.run(serve(parse_args(argv)))
+
+if __name__ == '__main__':
+    main()
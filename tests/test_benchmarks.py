@@ -0,0 +1,32 @@
+import io
+import unittest
+from benchmarks import suite
+from ciphers.hill import HillCipher
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def test_parse_size(self):
+        self.assertEqual(suite.parse_size('100'), 100)
+        self.assertEqual(suite.parse_size('10KB'), 10_000)
+        self.assertEqual(suite.parse_size('100mb'), 100_000_000)
+
+    def test_hill_keys_are_invertible(self):
+        for n in range(2, 11):
+            key = suite.hill_key(n)
+            self.assertEqual(HillCipher().compile(key).size, n)
+
+    def test_compare_flags_regressions(self):
+        baseline = {'a': {'mb_per_s': 100.0, 'peak_bytes': 1}, 'b': {'mb_per_s': 100.0, 'peak_bytes': 1}}
+        results = {'a': {'mb_per_s': 85.0, 'peak_bytes': 1}, 'b': {'mb_per_s': 75.0, 'peak_bytes': 1},
+                   'c': {'mb_per_s': 1.0, 'peak_bytes': 1}}
+        failures = suite.compare(results, baseline, max_regression=20)
+        self.assertEqual(len(failures), 1)
+        self.assertTrue(failures[0].startswith('b:'))
+
+    def test_run_small(self):
+        results = suite.run({'caesar', 'playfair'}, [100], repeat=1, out=io.StringIO())
+        self.assertEqual(set(results), {'caesar/encrypt/shift3/100', 'caesar/decrypt/shift3/100',
+                                        'playfair/encrypt/keyword/100', 'playfair/decrypt/keyword/100'})
+        self.assertTrue(all(r['mb_per_s'] > 0 for r in results.values()))
+
+if __name__ == '__main__':
+    unittest.main()
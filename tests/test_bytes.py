@@ -0,0 +1,65 @@
+import unittest
+from ciphers.caesar import CaesarCipher
+from ciphers.hill import HillCipher
+from ciphers.playfair import PlayfairCipher
+from ciphers.substitution import SubstitutionCipher
+from ciphers.vigenere import VigenereCipher
+
+class TestBytesAPI(unittest.TestCase):
+    CASES = [
+        (CaesarCipher(), '3'),
+        (VigenereCipher(), 'lemon'),
+        (PlayfairCipher(), 'keyword'),
+        (SubstitutionCipher(), 'QWERTYUIOPASDFGHJKLZXCVBNM'),
+        (HillCipher(), 'GYBNQKURP'),
+    ]
+    TEXT = 'Hello, World! The quick brown fox jumps over the lazy dog.\n' * 20
+
+    def test_bytes_match_str(self):
+        data = self.TEXT.encode('ascii')
+        for cipher, key in self.CASES:
+            for payload in (data, bytearray(data), memoryview(data)):
+                encrypted = cipher.encrypt(payload, key)
+                self.assertIsInstance(encrypted, bytes)
+                self.assertEqual(encrypted, cipher.encrypt(self.TEXT, key).encode('ascii'))
+                decrypted = cipher.decrypt(encrypted, key)
+                self.assertEqual(decrypted, cipher.decrypt(encrypted.decode('ascii'), key).encode('ascii'))
+
+    def test_non_ascii_bytes_pass_through(self):
+        data = 'Héllo'.encode('utf-8')
+        self.assertEqual(CaesarCipher().encrypt(data, '1'), b'I\xc3\xa9mmp')
+        self.assertEqual(VigenereCipher().encrypt(data, 'b'), b'I\xc3\xa9mmp')
+
+    def test_encrypt_into(self):
+        for cipher, key in self.CASES[:2] + self.CASES[3:4]:
+            buffer = bytearray(self.TEXT.encode('ascii') * 100)
+            expected = cipher.encrypt(bytes(buffer), key)
+            cipher.encrypt_into(buffer, key)
+            self.assertEqual(bytes(buffer), expected)
+            cipher.decrypt_into(memoryview(buffer), key)
+            self.assertEqual(buffer.decode('ascii'), self.TEXT * 100)
+
+    def test_encrypt_into_slice(self):
+        buffer = bytearray(b'xxHello, World!xx')
+        VigenereCipher().encrypt_into(memoryview(buffer)[2:-2], 'key')
+        self.assertEqual(buffer, bytearray(b'xxRijvs, Uyvjn!xx'))
+
+    def test_encrypt_into_rejects_read_only(self):
+        with self.assertRaises(TypeError):
+            CaesarCipher().encrypt_into(b'abc', '3')
+
+    def test_encrypt_into_not_length_preserving(self):
+        with self.assertRaises(TypeError):
+            HillCipher().encrypt_into(bytearray(b'HELP'), 'HILL')
+        with self.assertRaises(TypeError):
+            PlayfairCipher().encrypt_into(bytearray(b'HELP'), 'keyword')
+
+    def test_byte_streams(self):
+        import io
+        for cipher, key in self.CASES:
+            sink = io.BytesIO()
+            cipher.encrypt_stream(io.BytesIO(self.TEXT.encode('ascii')), sink, key, chunk_size=7)
+            self.assertEqual(sink.getvalue(), cipher.encrypt(self.TEXT, key).encode('ascii'))
+
+if __name__ == '__main__':
+    unittest.main()
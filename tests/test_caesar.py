@@ -26,5 +26,16 @@ class TestCaesarCipher(unittest.TestCase):
         self.assertEqual(self.cipher.encrypt('', '3'), '')
         self.assertEqual(self.cipher.decrypt('', '3'), '')
 
+    def test_large_input_round_trip(self):
+        text = 'Hello, World! ' * 100000
+        encrypted = self.cipher.encrypt(text, '7')
+        self.assertEqual(encrypted[:14], 'Olssv, Dvysk! ')
+        self.assertEqual(self.cipher.decrypt(encrypted, '7'), text)
+
+    def test_non_ascii_letters(self):
+        # Non-ASCII letters keep the original code-point arithmetic.
+        self.assertEqual(self.cipher.encrypt('Héllo', '5'), 'Mlqqt')
+        self.assertEqual(self.cipher.encrypt('naïve – ok', '1'), 'obnwf – pl')
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
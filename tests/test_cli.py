@@ -0,0 +1,172 @@
+import glob
+import io
+import json
+import os
+import shlex
+import unittest
+import cli
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def documented_commands():
+    """Argument lists of the 'python cli.py' commands in the README, the docs and the --help examples."""
+    with open(os.path.join(ROOT, 'README.md'), encoding='utf-16') as f:
+        sources = [f.read(), cli.EXAMPLES]
+    for path in sorted(glob.glob(os.path.join(ROOT, 'docs', '*.md'))):
+        with open(path, encoding='utf-8') as f:
+            sources.append(f.read())
+    for source in sources:
+        for line in source.splitlines():
+            if 'python cli.py ' not in line or '`' in line:
+                continue
+            argv = shlex.split(line.split('python cli.py ', 1)[1], comments=True)
+            if '>' in argv:
+                argv = argv[:argv.index('>')]  # Shell redirection of the output.
+            if argv[0] != 'jobs':
+                yield argv
+
+class TestParseArgs(unittest.TestCase):
+    def test_documented_commands_parse(self):
+        commands = list(documented_commands())
+        self.assertGreater(len(commands), 20)
+        for argv in commands:
+            with self.subTest(command=' '.join(argv)):
+                args = cli.parse_args(argv)
+                if args.mode != 'crack':
+                    self.assertIsNotNone(args.key)
+
+    def test_key_before_or_after_options(self):
+        for argv in (['caesar', 'encrypt', '5', '--input-file', 'in.txt'],
+                     ['caesar', 'encrypt', '--input-file', 'in.txt', '--output-file', 'out.txt', '5'],
+                     ['caesar', 'encrypt', '--input-file', 'in.txt', '--jobs', '2', '--chunk-size', '2', '5']):
+            args = cli.parse_args(argv)
+            self.assertEqual((args.key, args.text, args.input_file), ('5', None, 'in.txt'))
+        args = cli.parse_args(['vigenere', 'encrypt', '--text', 'Hello', '--text', 'World', 'key'])
+        self.assertEqual((args.texts, args.key), (['Hello', 'World'], 'key'))
+        args = cli.parse_args(['caesar', 'encrypt', 'Hello', '3'])
+        self.assertEqual((args.text, args.key), ('Hello', '3'))
+
+class TestParallelProcessing(unittest.TestCase):
+    def test_results_keep_input_order(self):
+        texts = [f'line {i} hello' for i in range(250)]
+        results = list(cli.process_texts_parallel('caesar', 'encrypt', texts, '3', False, jobs=3, chunk_size=7))
+        expected = [(t, cli.CIPHERS['caesar'].encrypt(t, '3'), None) for t in texts]
+        self.assertEqual(results, expected)
+
+    def test_matches_serial_processing(self):
+        texts = ['Attack at dawn', '', 'Hello, World!', 'xyz']
+        serial = list(cli.process_texts(cli.CIPHERS['vigenere'], 'decrypt', texts, 'lemon', False))
+        parallel = list(cli.process_texts_parallel('vigenere', 'decrypt', texts, 'lemon', False, jobs=2, chunk_size=1))
+        self.assertEqual(parallel, serial)
+
+    def test_invalid_key_yields_error(self):
+        results = list(cli.process_texts_parallel('caesar', 'encrypt', ['abc', 'def'], 'x', False, jobs=2, chunk_size=1))
+        self.assertEqual([(text, output) for text, output, _ in results], [('abc', None), ('def', None)])
+        self.assertIn('integer', results[0][2])
+
+    def test_invalid_text_yields_error(self):
+        texts = ['Hell', 'abc', 'Café']
+        serial = list(cli.process_texts(cli.CIPHERS['playfair'], 'decrypt', texts, 'keyword', False))
+        self.assertEqual([output is None for _, output, _ in serial], [False, True, True])
+        self.assertIn('even number', serial[1][2])
+        parallel = list(cli.process_texts_parallel('playfair', 'decrypt', texts, 'keyword', False, jobs=2, chunk_size=2))
+        self.assertEqual(parallel, serial)
+
+class TestOutputPipeline(unittest.TestCase):
+    def test_formats(self):
+        self.assertEqual(cli.format_result('annotated', 'abc', 'def', None), 'Input: abc -> Output: def')
+        self.assertEqual(cli.format_result('annotated', 'abc', None, 'bad'), 'Input: abc -> Error: bad')
+        self.assertEqual(cli.format_result('raw', 'abc', 'def', None), 'def')
+        self.assertEqual(cli.format_result('raw', 'abc', None, 'bad'), '')
+        self.assertEqual(json.loads(cli.format_result('jsonl', 'abc', 'def', None)), {'input': 'abc', 'output': 'def'})
+        self.assertEqual(json.loads(cli.format_result('jsonl', 'abc', None, 'bad')), {'input': 'abc', 'error': 'bad'})
+
+    def test_write_lines_buffers(self):
+        class CountingWriter(io.StringIO):
+            writes = 0
+            def write(self, s):
+                self.writes += 1
+                return super().write(s)
+        out = CountingWriter()
+        lines = [f'line {i}' for i in range(1000)]
+        cli.write_lines(iter(lines), out, buffer_size=1024)
+        self.assertEqual(out.getvalue(), '\n'.join(lines) + '\n')
+        self.assertLess(out.writes, 20)
+
+    def test_process_texts_is_lazy(self):
+        def texts():
+            yield 'abc'
+            raise AssertionError('read past first result')
+        results = cli.process_texts(cli.CIPHERS['caesar'], 'encrypt', texts(), '1', False)
+        self.assertEqual(next(results), ('abc', 'bcd', None))
+
+class TestCrackMode(unittest.TestCase):
+    def test_crack_texts(self):
+        texts = ['Wkh vhfuhw phhwlqj lv dw qrrq wrgdb', 'Dwwdfn dw gdzq']
+        results = list(cli.crack_texts('caesar', texts, top=2))
+        self.assertEqual([text for text, _, _ in results], texts)
+        self.assertEqual(results[0][1][0].plaintext, 'The secret meeting is at noon today')
+        self.assertEqual(len(results[0][1]), 2)
+
+    def test_format_candidates(self):
+        (text, candidates, _), = cli.crack_texts('caesar', ['Wkh vhfuhw phhwlqj lv dw qrrq wrgdb'], top=2)
+        self.assertEqual(cli.format_candidates('raw', text, candidates), 'The secret meeting is at noon today')
+        record = json.loads(cli.format_candidates('jsonl', text, candidates))
+        self.assertEqual(record['candidates'][0]['key'], '3')
+        self.assertTrue(cli.format_candidates('annotated', text, candidates).startswith(f'Input: {text} -> Key: 3'))
+
+    def test_crack_vigenere_lines_share_key(self):
+        lines = [cli.CIPHERS['vigenere'].encrypt(t, 'LEMON') for t in (
+            'It is a truth universally acknowledged that a single man in possession of a good fortune must be in want of a wife',
+            'However little known the feelings or views of such a man may be on his first entering a neighbourhood',
+        )]
+        results = list(cli.crack_texts('vigenere', lines, top=1))
+        self.assertEqual([candidates[0].key for _, candidates, _ in results], ['LEMON', 'LEMON'])
+
+    def test_invalid_text_fails_alone(self):
+        texts = [cli.CIPHERS['playfair'].encrypt('The secret meeting is at noon today', 'keyword'), 'ABC', 'Café']
+        results = list(cli.crack_texts('playfair', texts, top=1, restarts=1, seed=1))
+        self.assertEqual([text for text, _, _ in results], texts)
+        self.assertIsNone(results[0][2])
+        self.assertEqual([candidates for _, candidates, _ in results[1:]], [[], []])
+        self.assertIn('even number', results[1][2])
+        self.assertEqual(cli.format_candidates('annotated', *results[1]), f'Input: ABC -> Error: {results[1][2]}')
+        self.assertEqual(json.loads(cli.format_candidates('jsonl', *results[2])), {'input': 'Café', 'error': results[2][2]})
+
+class TestJobs(unittest.TestCase):
+    JOBS = [
+        {'id': 1, 'cipher': 'vigenere', 'mode': 'encrypt', 'key': 'lemon', 'text': 'Attack at dawn'},
+        {'id': 2, 'cipher': 'caesar', 'mode': 'decrypt', 'key': 3, 'text': 'Khoor'},
+        {'id': 3, 'cipher': 'vigenere', 'mode': 'decrypt', 'key': 'lemon', 'text': 'Lxfopv ef rnhr'},
+        {'id': 4, 'cipher': 'hill', 'mode': 'encrypt', 'key': 'AAAA', 'text': 'help'},
+        {'id': 5, 'cipher': 'playfair', 'mode': 'decrypt', 'key': 'keyword', 'text': 'abc'},
+        {'id': 6, 'cipher': 'rot13', 'mode': 'encrypt', 'key': '1', 'text': 'abc'},
+    ]
+
+    def run_lines(self, lines, **kwargs):
+        return [json.loads(cli.format_job_result(*result)) for result in cli.run_jobs(cli.read_jobs(lines), **kwargs)]
+
+    def test_results_keep_order_with_per_record_errors(self):
+        lines = [json.dumps(job) for job in self.JOBS] + ['', 'not json']
+        results = self.run_lines(lines)
+        self.assertEqual(results[:3], [{'id': 1, 'output': 'Lxfopv ef rnhr'}, {'id': 2, 'output': 'Hello'},
+                                       {'id': 3, 'output': 'Attack at dawn'}])
+        self.assertIn('invertible', results[3]['error'])
+        self.assertIn('even number', results[4]['error'])
+        self.assertEqual(results[5], {'id': 6, 'error': "Line 6: unknown cipher 'rot13'"})
+        self.assertEqual(results[6], {'error': 'Line 8: not valid JSON'})
+
+    def test_parallel_matches_serial(self):
+        lines = [json.dumps(dict(job, id=i, text=f'{job["text"]} {i}')) for i, job in enumerate(self.JOBS * 30)]
+        serial = self.run_lines(lines, window=50)
+        self.assertEqual(self.run_lines(lines, workers=2, chunk_size=7, window=50), serial)
+
+    def test_groups_compile_each_key_once(self):
+        jobs = cli.read_jobs(json.dumps(job) for job in self.JOBS * 3)
+        slots, work = cli._job_window(jobs, chunk_size=1000)
+        self.assertEqual(len(slots), 18)
+        self.assertEqual(sorted(args[:2] for _, args in work),
+                         [('caesar', '3'), ('hill', 'AAAA'), ('playfair', 'keyword'), ('vigenere', 'lemon')])
+
+if __name__ == '__main__':
+    unittest.main()
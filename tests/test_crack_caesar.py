@@ -0,0 +1,59 @@
+import unittest
+import numpy as np
+from ciphers.caesar import CaesarCipher
+from ciphers.analysis import crack_caesar
+from ciphers.analysis.scoring import letter_histograms, shift_scores
+
+PLAINTEXTS = [
+    'Attack at dawn, the enemy is weak on the eastern flank.',
+    'Meet me at the old bridge tonight and bring the documents.',
+    'The quick brown fox jumps over the lazy dog while the farmer sleeps.',
+    'It was the best of times, it was the worst of times.',
+]
+
+class TestCaesarCrack(unittest.TestCase):
+    def setUp(self):
+        self.cipher = CaesarCipher()
+        self.shifts = [7, 19, 0, 25]
+        self.ciphertexts = [self.cipher.encrypt(p, str(s)) for p, s in zip(PLAINTEXTS, self.shifts)]
+
+    def test_recovers_batch(self):
+        for method in ('chi2', 'loglik'):
+            results = crack_caesar(self.ciphertexts, top=3, method=method)
+            self.assertEqual(len(results), len(PLAINTEXTS))
+            for candidates, plaintext, shift in zip(results, PLAINTEXTS, self.shifts):
+                self.assertEqual(len(candidates), 3)
+                self.assertEqual(candidates[0].key, str(shift))
+                self.assertEqual(candidates[0].plaintext, plaintext)
+
+    def test_candidates_are_ranked(self):
+        chi2 = crack_caesar(self.ciphertexts[:1], top=26)[0]
+        self.assertEqual(sorted(c.score for c in chi2), [c.score for c in chi2])
+        loglik = crack_caesar(self.ciphertexts[:1], top=26, method='loglik')[0]
+        self.assertEqual(sorted((c.score for c in loglik), reverse=True), [c.score for c in loglik])
+
+    def test_histograms(self):
+        hist = letter_histograms(['abA!', '', 'zz'])
+        self.assertEqual(hist.shape, (3, 26))
+        self.assertEqual(hist[0, 0], 2)
+        self.assertEqual(hist[0, 1], 1)
+        self.assertEqual(hist[1].sum(), 0)
+        self.assertEqual(hist[2, 25], 2)
+
+    def test_scores_match_shifted_histograms(self):
+        hist = letter_histograms(self.ciphertexts)
+        scores = shift_scores(hist, 'loglik')
+        for shift in (0, 5, 19):
+            decrypted = letter_histograms([self.cipher.decrypt(self.ciphertexts[1], str(shift))])[0]
+            expected = shift_scores(decrypted[None, :], 'loglik')[0, 0]
+            self.assertAlmostEqual(scores[1, shift], expected)
+
+    def test_empty_batch(self):
+        self.assertEqual(crack_caesar([]), [])
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            crack_caesar(['abc'], method='bogus')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import string
+import unittest
+import numpy as np
+from ciphers import InvalidTextError
+from ciphers.hill import HillCipher, _inverse_mod26, _letters
+from ciphers.analysis import crack_hill, crack_hill_known_plaintext, crack_texts
+from ciphers.analysis.hill import _invertible, crack_hill_batch, known_plaintext_keys, row_scores
+from tests.test_crack_vigenere import PLAINTEXT
+
+class TestHillKnownPlaintext(unittest.TestCase):
+    def setUp(self):
+        self.cipher = HillCipher()
+
+    def test_recovers_2x2_key_at_any_alignment(self):
+        ciphertext = self.cipher.encrypt(PLAINTEXT, 'HILL')
+        for crib in ('acknowledged', 'universally', 'single man'):
+            best = crack_hill_known_plaintext(ciphertext, crib, n=2)[0]
+            self.assertEqual(best.key, 'HILL')
+
+    def test_recovers_3x3_key(self):
+        ciphertext = self.cipher.encrypt(PLAINTEXT, 'GYBNQKURP')
+        self.assertIn('GYBNQKURP', known_plaintext_keys(ciphertext, 'a truth universally', 3))
+        best = crack_hill_known_plaintext(ciphertext, 'a truth universally')[0]
+        self.assertEqual(best.key, 'GYBNQKURP')
+        self.assertEqual(best.plaintext, self.cipher.decrypt(ciphertext, 'GYBNQKURP'))
+
+    def test_recovers_12x12_key(self):
+        rng = np.random.default_rng(7)
+        crib = ''.join(string.ascii_lowercase[v] for v in _letters(PLAINTEXT)[36:336])
+        for _ in range(3):
+            matrix = rng.integers(0, 26, (12, 12))
+            if _inverse_mod26(matrix) is None:
+                continue
+            key = ''.join(string.ascii_uppercase[v] for v in matrix.ravel())
+            ciphertext = self.cipher.encrypt(PLAINTEXT, key)
+            self.assertIn(key, known_plaintext_keys(ciphertext, crib, 12))
+
+    def test_invertible_is_exact(self):
+        matrices = np.random.default_rng(1).integers(0, 26, (300, 12, 12))
+        expected = [_inverse_mod26(m) is not None for m in matrices]
+        self.assertEqual(_invertible(matrices).tolist(), expected)
+
+    def test_absent_crib(self):
+        ciphertext = self.cipher.encrypt(PLAINTEXT, 'HILL')
+        self.assertEqual(known_plaintext_keys(ciphertext, 'zebra quagga', 2), [])
+
+    def test_wrong_block_size(self):
+        with self.assertRaises(InvalidTextError):
+            known_plaintext_keys('ABC', 'abcd', 2)
+
+class TestHillCiphertextOnly(unittest.TestCase):
+    def setUp(self):
+        self.cipher = HillCipher()
+
+    def test_recovers_2x2_key(self):
+        for key in ('HILL', 'DDCF'):
+            ciphertext = self.cipher.encrypt(PLAINTEXT, key)
+            for method in ('loglik', 'chi2'):
+                best = crack_hill(ciphertext, 2, method=method)[0]
+                self.assertEqual(best.key, key)
+
+    def test_recovers_3x3_key(self):
+        ciphertext = self.cipher.encrypt(PLAINTEXT, 'GYBNQKURP')
+        candidates = crack_hill(ciphertext, 3, top=2)
+        self.assertEqual(candidates[0].key, 'GYBNQKURP')
+        self.assertGreater(candidates[0].score, candidates[1].score)
+
+    def test_row_scores_cover_row_space(self):
+        blocks = np.arange(20).reshape(10, 2) % 26
+        rows, scores = row_scores(blocks)
+        self.assertEqual(rows.shape[1], 2)
+        self.assertEqual(len(rows), len(scores))
+        # Rows whose entries are all even or all multiples of 13 never appear in an invertible key.
+        self.assertFalse(any((r % 2 == 0).all() or (r % 13 == 0).all() for r in rows))
+        self.assertEqual(len(rows), 676 - 169 - 4 + 1)
+
+    def test_unsupported_size(self):
+        with self.assertRaises(ValueError):
+            crack_hill('ABCDEFGHIJKLMNOP', 4)
+
+    def test_batch(self):
+        sentences = [s.strip() for s in PLAINTEXT.split('.') if s.strip()]
+        ciphertexts = [self.cipher.encrypt(s, 'HILL') for s in sentences]
+        results = crack_hill_batch(ciphertexts, top=1)
+        self.assertEqual([r[0].plaintext for r in results], [self.cipher.decrypt(c, 'HILL') for c in ciphertexts])
+        results = crack_hill_batch(ciphertexts, top=1, crib='single man')
+        self.assertEqual(results[0][0].key, 'HILL')
+
+    def test_batch_with_bad_line(self):
+        sentences = [s.strip() for s in PLAINTEXT.split('.') if s.strip()]
+        ciphertexts = [self.cipher.encrypt(s, 'HILL') for s in sentences]
+        with self.assertRaises(InvalidTextError):
+            crack_hill_batch(ciphertexts[:1] + ['ABC'] + ciphertexts[1:], top=1)
+        results = list(crack_texts('hill', ciphertexts[:1] + ['ABC'] + ciphertexts[1:], top=1))
+        self.assertEqual([error is None for _, _, error in results], [True, False] + [True] * (len(ciphertexts) - 1))
+        self.assertIn('multiple of the block size', results[1][2])
+        self.assertEqual([candidates[0].key for _, candidates, error in results if error is None],
+                         ['HILL'] * len(ciphertexts))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+import numpy as np
+from ciphers import InvalidTextError
+from ciphers.playfair import PlayfairCipher, _letter_values
+from ciphers.analysis import crack_playfair
+from ciphers.analysis.playfair import _Problem, _ALPHABET, _PERMS, _PERM_WEIGHTS, crack_playfair_batch
+from ciphers.analysis.scoring import english_quadgrams, quadgram_scores
+from tests.test_crack_vigenere import PLAINTEXT
+
+def _square(key):
+    rows = PlayfairCipher().compile(key).rows
+    return np.frombuffer(''.join(rows).encode('ascii'), dtype=np.uint8).astype(np.intp) - ord('A')
+
+class TestPlayfairCrack(unittest.TestCase):
+    def setUp(self):
+        self.cipher = PlayfairCipher()
+        self.ciphertext = self.cipher.encrypt(PLAINTEXT, 'MONARCHY')
+
+    def test_score_matches_decryption(self):
+        problem = _Problem(_letter_values(self.ciphertext), english_quadgrams())
+        rng = np.random.default_rng(0)
+        squares = np.array([_square('MONARCHY')] + [rng.permutation(_ALPHABET) for _ in range(4)])
+        scores = problem.score(squares)
+        for square, score in zip(squares, scores):
+            key = ''.join(chr(ord('A') + v) for v in square)
+            plaintext = _letter_values(self.cipher.decrypt(self.ciphertext, key))
+            self.assertAlmostEqual(score / problem.quads, float(quadgram_scores(plaintext)), places=4)
+        self.assertEqual(int(np.argmax(scores)), 0)
+
+    def test_mutations_are_permutations(self):
+        self.assertTrue((np.sort(_PERMS, axis=1) == np.arange(25)).all())
+        self.assertAlmostEqual(_PERM_WEIGHTS.sum(), 1.0)
+
+    def test_recovers_from_nearby_square(self):
+        square = _square('MONARCHY')
+        square[[0, 7]] = square[[7, 0]]
+        square[[3, 19]] = square[[19, 3]]
+        start = ''.join(chr(ord('A') + v) for v in square)
+        best = crack_playfair(self.ciphertext, chains=1, iterations=20000, seed=1, start=start)[0]
+        self.assertEqual(best.plaintext, self.cipher.decrypt(self.ciphertext, 'MONARCHY'))
+
+    def test_seed_is_deterministic(self):
+        first = crack_playfair(self.ciphertext, chains=2, iterations=2000, seed=5)
+        self.assertEqual(first, crack_playfair(self.ciphertext, chains=2, iterations=2000, seed=5))
+        self.assertEqual(first, crack_playfair(self.ciphertext, chains=2, iterations=2000, seed=5, jobs=2))
+
+    def test_odd_ciphertext(self):
+        with self.assertRaises(InvalidTextError):
+            crack_playfair('ABC')
+
+    def test_batch_method(self):
+        with self.assertRaises(ValueError):
+            crack_playfair_batch(['AB'], method='chi2')
+        self.assertEqual(crack_playfair_batch([]), [])
+
+if __name__ == '__main__':
+    unittest.main()
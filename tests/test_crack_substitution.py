@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from ciphers.substitution import SubstitutionCipher
+from ciphers.analysis import crack_substitution, load_quadgrams
+from ciphers.analysis.substitution import crack_substitution_batch, english_quadgrams, _solve
+from tests.test_crack_vigenere import PLAINTEXT
+
+KEY = 'QWERTYUIOPASDFGHJKLZXCVBNM'
+
+class TestSubstitutionCrack(unittest.TestCase):
+    def setUp(self):
+        self.ciphertext = SubstitutionCipher().encrypt(PLAINTEXT, KEY)
+
+    def test_recovers_plaintext(self):
+        best = crack_substitution(self.ciphertext, restarts=4, seed=1)[0]
+        self.assertEqual(best.plaintext, PLAINTEXT)
+        self.assertEqual(SubstitutionCipher().encrypt(PLAINTEXT, best.key), self.ciphertext)
+
+    def test_seed_is_deterministic(self):
+        first = _solve(self.ciphertext, 3, 2, 1, 42, None, None)
+        self.assertEqual(first, _solve(self.ciphertext, 3, 2, 1, 42, None, None))
+        self.assertEqual(first, _solve(self.ciphertext, 3, 2, 2, 42, None, None))
+
+    def test_threshold_stops_early(self):
+        results = _solve(self.ciphertext, 10, 10, 1, 1, -5.0, None)
+        self.assertLess(len(results), 10)
+        self.assertGreaterEqual(results[-1][1], -5.0)
+
+    def test_candidates_distinct_and_ranked(self):
+        candidates = crack_substitution(self.ciphertext, top=3, restarts=6, kicks=0, seed=3)
+        self.assertEqual(len({c.key for c in candidates}), len(candidates))
+        scores = [c.score for c in candidates]
+        self.assertEqual(sorted(scores, reverse=True), scores)
+
+    def test_batch(self):
+        sentences = [s.strip() + '.' for s in PLAINTEXT.split('.') if s.strip()]
+        ciphertexts = [SubstitutionCipher().encrypt(s, KEY) for s in sentences]
+        results = crack_substitution_batch(ciphertexts, top=1, restarts=4, seed=1)
+        self.assertEqual([r[0].plaintext for r in results], sentences)
+        with self.assertRaises(ValueError):
+            crack_substitution_batch(ciphertexts, method='chi2')
+
+    def test_too_short(self):
+        self.assertEqual(crack_substitution('ab!'), [])
+
+    def test_load_quadgrams(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'quads.txt')
+            with open(path, 'w') as f:
+                f.write('TION 3\nthat 1\n')
+            table = load_quadgrams(path)
+            self.assertEqual(table.shape, (26 ** 4,))
+            self.assertAlmostEqual(float(table[19 * 17576 + 8 * 676 + 14 * 26 + 13]), np.log10(0.75), places=5)
+            self.assertLess(table[0], table[19 * 17576 + 7 * 676 + 0 * 26 + 19])
+            with open(path, 'w') as f:
+                f.write('TOOLONG 3\n')
+            with self.assertRaises(ValueError):
+                load_quadgrams(path)
+
+    def test_english_table(self):
+        table = english_quadgrams()
+        self.assertEqual(table.dtype, np.float32)
+        self.assertGreater(table[19 * 17576 + 7 * 676 + 4 * 26 + 17], table[25 * 17576 + 16 * 676 + 23 * 26 + 9])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+import numpy as np
+from ciphers.vigenere import VigenereCipher
+from ciphers.analysis import crack_vigenere, key_length_scores
+from ciphers.analysis.vigenere import crack_vigenere_batch
+
+PLAINTEXT = (
+    "It is a truth universally acknowledged, that a single man in possession of a good fortune, "
+    "must be in want of a wife. However little known the feelings or views of such a man may be "
+    "on his first entering a neighbourhood, this truth is so well fixed in the minds of the "
+    "surrounding families, that he is considered the rightful property of some one or other of "
+    "their daughters. My dear Mr. Bennet, said his lady to him one day, have you heard that "
+    "Netherfield Park is let at last? Mr. Bennet replied that he had not. But it is, returned she; "
+    "for Mrs. Long has just been here, and she told me all about it. Mr. Bennet made no answer. "
+    "Do you not want to know who has taken it? cried his wife impatiently. You want to tell me, "
+    "and I have no objection to hearing it. This was invitation enough."
+)
+
+class TestVigenereCrack(unittest.TestCase):
+    def setUp(self):
+        self.cipher = VigenereCipher()
+
+    def test_recovers_key(self):
+        for key in ('LEMON', 'CRYPTOGRAPHY', 'K'):
+            ciphertext = self.cipher.encrypt(PLAINTEXT, key)
+            for method in ('chi2', 'loglik'):
+                best = crack_vigenere(ciphertext, top=3, method=method)[0]
+                self.assertEqual(best.key, key)
+                self.assertEqual(best.plaintext, PLAINTEXT)
+                self.assertGreater(best.score, 0.5)
+
+    def test_candidates_ranked_with_confidence(self):
+        candidates = crack_vigenere(self.cipher.encrypt(PLAINTEXT, 'LEMON'), top=3)
+        self.assertEqual(len(candidates), 3)
+        scores = [c.score for c in candidates]
+        self.assertEqual(sorted(scores, reverse=True), scores)
+        self.assertLessEqual(sum(scores), 1.0 + 1e-9)
+        self.assertEqual(len({c.key for c in candidates}), 3)
+
+    def test_repeated_key_is_reduced(self):
+        best = crack_vigenere(self.cipher.encrypt(PLAINTEXT, 'ABCABC'))[0]
+        self.assertEqual(best.key, 'ABC')
+
+    def test_key_length_scores(self):
+        scores = key_length_scores([self.cipher.encrypt(PLAINTEXT, 'CIPHER')], max_key_length=20)
+        self.assertEqual(scores.shape, (20,))
+        self.assertEqual(int(np.argmax(scores)) + 1, 6)
+
+    def test_bytes_input(self):
+        ciphertext = self.cipher.encrypt(PLAINTEXT.encode('ascii'), 'LEMON')
+        best = crack_vigenere(ciphertext)[0]
+        self.assertEqual(best.key, 'LEMON')
+        self.assertEqual(best.plaintext, PLAINTEXT.encode('ascii'))
+
+    def test_batch_shares_key(self):
+        sentences = [s.strip() + '.' for s in PLAINTEXT.split('.') if s.strip()]
+        ciphertexts = [self.cipher.encrypt(s, 'LEMON') for s in sentences]
+        results = crack_vigenere_batch(ciphertexts)
+        self.assertEqual(len(results), len(sentences))
+        for candidates, sentence in zip(results, sentences):
+            self.assertEqual(candidates[0].key, 'LEMON')
+            self.assertEqual(candidates[0].plaintext, sentence)
+
+    def test_no_letters(self):
+        self.assertEqual(crack_vigenere('123 !?'), [])
+        self.assertEqual(crack_vigenere_batch([]), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+from ciphers import InvalidKeyError, get_cipher
+
+try:
+    import gui
+except ImportError:  # Tk is not installed.
+    gui = None
+
+def events(job):
+    job.join()
+    result = []
+    while not job.events.empty():
+        result.append(job.events.get())
+    return result
+
+@unittest.skipIf(gui is None, 'tkinter is not available')
+class TestCipherJob(unittest.TestCase):
+    def test_chunks_match_one_shot(self):
+        text = 'Hide the gold in the tree stump. ' * 50
+        for name, key in (('vigenere', 'lemon'), ('playfair', 'keyword'), ('hill', 'HILL')):
+            compiled = get_cipher(name).compile(key)
+            for mode, expected in (('Encrypt', compiled.encrypt(text)), ('Decrypt', compiled.decrypt(text))):
+                job = gui.CipherJob(compiled, mode, text, chunk_size=7)
+                job.start()
+                result = events(job)
+                self.assertEqual(''.join(v for kind, v, _ in result if kind == 'output'), expected)
+                self.assertEqual(result[-1], ('done', None, len(text)))
+                progress = [done for _, _, done in result]
+                self.assertEqual(progress, sorted(progress))
+
+    def test_cancel(self):
+        job = gui.CipherJob(get_cipher('caesar').compile('3'), 'Encrypt', 'abc' * 100, chunk_size=10)
+        job.cancel()
+        job.start()
+        self.assertEqual(events(job), [('cancelled', None, 0)])
+
+    def test_error_is_reported(self):
+        job = gui.CipherJob(get_cipher('playfair').compile('keyword'), 'Decrypt', 'ABC')
+        job.start()
+        kind, error, _ = events(job)[-1]
+        self.assertEqual(kind, 'error')
+        self.assertIsInstance(error, Exception)
+        self.assertNotIsInstance(error, InvalidKeyError)
+
+if __name__ == '__main__':
+    unittest.main()
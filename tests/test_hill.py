@@ -38,5 +38,22 @@ class TestHillCipher(unittest.TestCase):
         self.assertEqual(self.cipher.encrypt('', 'HILL'), '')
         self.assertEqual(self.cipher.decrypt('', 'HILL'), '')
 
+    def test_even_determinant(self):
+        # det = -8 has no inverse modulo 26
+        with self.assertRaises(InvalidKeyError):
+            self.cipher.encrypt('HELP', 'ACEG')
+
+    def test_large_keys_round_trip(self):
+        text = 'THEQUICKBROWNFOXJUMPSOVERTHELAZYDOG' * 20
+        for key in ('MBHBREJNERDSJRVF', 'CZXMOMXCXFFEAESOZUETTPVLERREAAZXUDQXENGGAIGJQHYSKIRNEBXLOVSQNQEREQQAOYFTAYZEFEPTXDRBKVQQRPZYDRBHGIBY'):
+            n = int(len(key) ** 0.5)
+            matrix = self.cipher._key_to_matrix(key)
+            self.assertEqual(matrix.shape, (n, n))
+            padded = text + 'X' * ((-len(text)) % n)
+            self.assertEqual(self.cipher.decrypt(self.cipher.encrypt(text, key), key), padded)
+
+    def test_process_text(self):
+        self.assertEqual(self.cipher._process_text('Hi there!', 3), 'HITHEREXX')
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
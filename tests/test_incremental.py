@@ -0,0 +1,75 @@
+import random
+import unittest
+from ciphers import InvalidTextError, get_cipher
+from ciphers.incremental import LivePreview, live_preview
+
+KEYS = [('caesar', '3'), ('substitution', 'QWERTYUIOPASDFGHJKLZXCVBNM'), ('vigenere', 'lemon'),
+        ('hill', 'HILL'), ('hill', 'GYBNQKURP'), ('playfair', 'keyword')]
+TEXT = 'Hide the gold in the tree stump, balloons and all! ' * 40
+
+class Rot13Key:
+    def encrypt(self, text):
+        return get_cipher('caesar').encrypt(text, '13')
+
+class TestLivePreview(unittest.TestCase):
+    def test_random_edits_match_one_shot(self):
+        self.check_random_edits('abcdeloXX ,.\n')
+
+    def test_non_ascii_edits_match_one_shot(self):
+        # Uppercasing turns 'ß' and 'ﬁ' into two letters each.
+        self.check_random_edits('abcßﬁéX ,')
+
+    def check_random_edits(self, alphabet):
+        rng = random.Random(0)
+        for name, key in KEYS:
+            compiled = get_cipher(name).compile(key)
+            for mode in ('encrypt', 'decrypt'):
+                preview = live_preview(compiled, mode)
+                text = ''
+                for _ in range(150):
+                    i = rng.randint(0, len(text))
+                    j = min(len(text), i + rng.choice([0, 0, 1, 3]))
+                    edited = text[:i] + ''.join(rng.choice(alphabet) for _ in range(rng.choice([0, 1, 2, 5]))) + text[j:]
+                    try:
+                        expected = compiled.encrypt(edited) if mode == 'encrypt' else compiled.decrypt(edited)
+                    except InvalidTextError:
+                        with self.assertRaises(InvalidTextError):
+                            preview.update(edited)
+                        continue
+                    self.assertEqual(preview.update(edited), expected, (name, mode, edited))
+                    text = edited
+
+    def test_local_edit_recomputes_little(self):
+        for name, key in KEYS:
+            compiled = get_cipher(name).compile(key)
+            preview = live_preview(compiled)
+            preview.update(TEXT)
+            middle = len(TEXT) // 2
+            # Replacing a letter keeps the key position and the block alignment.
+            edited = TEXT[:middle] + 'q' + TEXT[middle + 1:]
+            self.assertTrue(TEXT[middle].isalpha())
+            self.assertEqual(preview.update(edited), compiled.encrypt(edited))
+            self.assertLessEqual(preview.recomputed, 4, name)
+
+    def test_vigenere_insert_moves_key_position(self):
+        compiled = get_cipher('vigenere').compile('lemon')
+        preview = live_preview(compiled)
+        preview.update(TEXT)
+        shifted = TEXT[:10] + 'ab' + TEXT[10:]
+        self.assertEqual(preview.update(shifted), compiled.encrypt(shifted))
+        self.assertGreater(preview.recomputed, len(TEXT) // 2)
+        # A whole key period of letters leaves the rest in place.
+        period = shifted[:10] + 'abcde' + shifted[10:]
+        self.assertEqual(preview.update(period), compiled.encrypt(period))
+        self.assertEqual(preview.recomputed, 5)
+
+    def test_other_keys_recompute_everything(self):
+        preview = live_preview(Rot13Key())
+        self.assertIs(type(preview), LivePreview)
+        self.assertEqual(preview.update('Hello'), 'Uryyb')
+        self.assertEqual(preview.recomputed, 5)
+        with self.assertRaises(ValueError):
+            live_preview(Rot13Key(), 'reverse')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import dataclasses
+from ciphers.caesar import CaesarCipher
+from ciphers.hill import HillCipher
+from ciphers.playfair import PlayfairCipher
+from ciphers.substitution import SubstitutionCipher
+from ciphers.vigenere import VigenereCipher
+from ciphers.keycache import KeyCache
+from ciphers import InvalidKeyError, key_cache_info, set_key_cache_size, clear_key_cache
+
+class TestCompiledKeys(unittest.TestCase):
+    CASES = [
+        (CaesarCipher(), '3'),
+        (VigenereCipher(), 'key'),
+        (PlayfairCipher(), 'keyword'),
+        (SubstitutionCipher(), 'QWERTYUIOPASDFGHJKLZXCVBNM'),
+        (HillCipher(), 'HILL'),
+    ]
+
+    def test_compiled_matches_string_key(self):
+        for cipher, key in self.CASES:
+            compiled = cipher.compile(key)
+            self.assertEqual(compiled.encrypt('Hello, World'), cipher.encrypt('Hello, World', key))
+            self.assertEqual(compiled.decrypt('ABCDEF'), cipher.decrypt('ABCDEF', key))
+
+    def test_compiled_key_is_immutable(self):
+        for cipher, key in self.CASES:
+            with self.assertRaises(dataclasses.FrozenInstanceError):
+                cipher.compile(key).key = 'other'
+
+    def test_invalid_key(self):
+        with self.assertRaises(InvalidKeyError):
+            CaesarCipher().compile('abc')
+        with self.assertRaises(InvalidKeyError):
+            HillCipher().compile('AAAA')
+
+class TestKeyCache(unittest.TestCase):
+    def setUp(self):
+        clear_key_cache()
+
+    def tearDown(self):
+        set_key_cache_size(256)
+        clear_key_cache()
+
+    def test_hits_and_misses(self):
+        cipher = VigenereCipher()
+        first = cipher.compile('lemon')
+        self.assertIs(cipher.compile('lemon'), first)
+        cipher.encrypt('attack', 'lemon')
+        info = key_cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (2, 1, 1))
+
+    def test_keys_are_per_cipher(self):
+        self.assertIsNot(CaesarCipher().compile('3'), VigenereCipher().compile('abc'))
+        self.assertEqual(key_cache_info().currsize, 2)
+
+    def test_lru_eviction(self):
+        set_key_cache_size(2)
+        cipher = CaesarCipher()
+        one = cipher.compile('1')
+        cipher.compile('2')
+        cipher.compile('1')
+        cipher.compile('3')  # evicts '2'
+        self.assertIs(cipher.compile('1'), one)
+        self.assertEqual(key_cache_info().currsize, 2)
+        misses = key_cache_info().misses
+        cipher.compile('2')
+        self.assertEqual(key_cache_info().misses, misses + 1)
+
+    def test_invalid_keys_are_not_cached(self):
+        cache = KeyCache(maxsize=4)
+        with self.assertRaises(InvalidKeyError):
+            cache.get(CaesarCipher(), 'x')
+        self.assertEqual(cache.info().currsize, 0)
+
+    def test_zero_size_disables_cache(self):
+        cache = KeyCache(maxsize=0)
+        cipher = CaesarCipher()
+        self.assertIsNot(cache.get(cipher, '3'), cache.get(cipher, '3'))
+        self.assertEqual(cache.info().misses, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import numpy as np
+from ciphers import InvalidKeyError, InvalidTextError
+from ciphers.caesar import CaesarCipher
+from ciphers.hill import HillCipher
+from ciphers.playfair import PlayfairCipher
+from ciphers.substitution import SubstitutionCipher
+from ciphers.vigenere import VigenereCipher
+
+class TestEncryptMany(unittest.TestCase):
+    CASES = [
+        (CaesarCipher(), ['3', '-1', '25', '0']),
+        (VigenereCipher(), ['lemon', 'a', 'KeyWord', 'abcdefghijklmnopqrstuvwxyz' * 3]),
+        (PlayfairCipher(), ['keyword', 'playfair example', 'z']),
+        (SubstitutionCipher(), ['QWERTYUIOPASDFGHJKLZXCVBNM', 'zyxwvutsrqponmlkjihgfedcba']),
+        (HillCipher(), ['HILL', 'DDCF']),
+        (HillCipher(), ['GYBNQKURP', 'ALPHABETS']),
+    ]
+    TEXT = 'Hello, World! The balloon jumps over the lazy dog.\n' * 20
+
+    def test_matches_one_key_at_a_time(self):
+        for cipher, keys in self.CASES:
+            for text in (self.TEXT, self.TEXT.encode('ascii'), ''):
+                encrypted = cipher.encrypt_many(text, keys)
+                self.assertEqual(encrypted, [cipher.encrypt(text, key) for key in keys])
+                self.assertEqual(cipher.decrypt_many(encrypted[0], keys),
+                                 [cipher.decrypt(encrypted[0], key) for key in keys])
+
+    def test_as_array(self):
+        for cipher, keys in self.CASES:
+            array = cipher.encrypt_many(self.TEXT, keys, as_array=True)
+            self.assertEqual(array.dtype, np.uint8)
+            self.assertEqual([row.tobytes().decode('ascii') for row in array],
+                             [cipher.encrypt(self.TEXT, key) for key in keys])
+        self.assertEqual(CaesarCipher().encrypt_many('abc', [], as_array=True).shape, (0, 0))
+
+    def test_non_ascii_text_falls_back(self):
+        text = 'Café Straße'
+        for cipher, keys in self.CASES[:2] + self.CASES[3:4]:
+            self.assertEqual(cipher.encrypt_many(text, keys), [cipher.encrypt(text, key) for key in keys])
+        # Substitution keeps non-ASCII letters, which an array of ASCII codes cannot hold.
+        with self.assertRaises(ValueError):
+            SubstitutionCipher().encrypt_many(text, ['QWERTYUIOPASDFGHJKLZXCVBNM'], as_array=True)
+
+    def test_mixed_hill_sizes(self):
+        keys = ['HILL', 'GYBNQKURP']
+        self.assertEqual(HillCipher().encrypt_many('attacks', keys), ['WBDBQCYJ', 'HAKGCCHAE'])
+        with self.assertRaises(ValueError):
+            HillCipher().encrypt_many('attacks', keys, as_array=True)
+
+    def test_errors(self):
+        with self.assertRaises(InvalidKeyError):
+            VigenereCipher().encrypt_many('abc', ['lemon', 'l3mon'])
+        with self.assertRaises(InvalidTextError):
+            PlayfairCipher().decrypt_many('abc', ['keyword'])
+
+if __name__ == '__main__':
+    unittest.main()
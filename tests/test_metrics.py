@@ -0,0 +1,89 @@
+import cProfile
+import os
+import pstats
+import subprocess
+import sys
+import tempfile
+import unittest
+from ciphers import get_cipher, metrics
+from ciphers.hill import HillKey
+from ciphers import hill
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        metrics.reset()
+
+    def tearDown(self):
+        metrics.disable()
+        metrics.reset()
+
+    def test_disabled_is_a_no_op(self):
+        encrypt, letters = HillKey.encrypt, hill._letters
+        metrics.enable()
+        self.assertIsNot(HillKey.encrypt, encrypt)
+        metrics.disable()
+        self.assertIs(HillKey.encrypt, encrypt)
+        self.assertIs(hill._letters, letters)
+        get_cipher('hill').encrypt('help', 'HILL')
+        with metrics.timed('io', 'cli', 'read', 10):
+            pass
+        self.assertEqual(metrics.snapshot(), {})
+
+    def test_phases_per_cipher_and_mode(self):
+        metrics.enable()
+        key = get_cipher('hill').compile('DDCF')
+        for _ in range(3):
+            self.assertEqual(key.decrypt(key.encrypt('Attack at dawn')), 'ATTACKATDAWN')
+        get_cipher('caesar').encrypt('Hello', '3')
+        stats = metrics.snapshot()
+        transform = stats[('hill', 'encrypt', 'transform')]
+        self.assertEqual((transform.calls, transform.items), (3, 14 * 3))
+        self.assertEqual(stats[('hill', 'decrypt', 'blocks')].calls, 3)
+        self.assertEqual(stats[('hill', 'encrypt', 'normalize')].calls, 3)
+        self.assertEqual(stats[('caesar', 'encrypt', 'transform')].items, 5)
+        self.assertLessEqual(transform.p50_ns, transform.max_ns)
+        self.assertIn('hill          encrypt  transform', metrics.summary())
+
+    def test_plugin_classes_are_instrumented(self):
+        from ciphers.base import Cipher, CompiledKey
+
+        class ReverseKey(CompiledKey):
+            def encrypt(self, plaintext):
+                return plaintext[::-1]
+
+            def decrypt(self, ciphertext):
+                return ciphertext[::-1]
+
+        class ReverseCipher(Cipher):
+            def _compile_key(self, key):
+                return ReverseKey(key)
+
+        metrics.enable()
+        ReverseCipher()._compile_key('k').encrypt('abc')
+        self.assertEqual(metrics.snapshot()[('reverse', 'encrypt', 'transform')].items, 3)
+
+    def test_collapsed_stacks(self):
+        profiler = cProfile.Profile()
+        profiler.runcall(get_cipher('vigenere').encrypt, 'Attack at dawn' * 1000, 'lemon')
+        stacks = metrics.collapsed_stacks(pstats.Stats(profiler))
+        self.assertTrue(stacks)
+        self.assertTrue(all(';' in stack or 'encrypt' in stack for stack in stacks))
+        self.assertTrue(all(isinstance(micros, int) and micros > 0 for micros in stacks.values()))
+
+    def test_cli_stats_and_profile(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            profile = os.path.join(tmp, 'cli.prof')
+            result = subprocess.run([sys.executable, 'cli.py', 'vigenere', 'encrypt', 'Attack at dawn', 'lemon',
+                                     '--stats', '--profile', profile], cwd=ROOT, capture_output=True, text=True,
+                                    check=True)
+            self.assertEqual(result.stdout, 'Input: Attack at dawn -> Output: Lxfopv ef rnhr\n')
+            self.assertIn('vigenere      encrypt  transform', result.stderr)
+            self.assertIn('Key cache: 0 hits, 1 misses', result.stderr)
+            self.assertTrue(os.path.getsize(profile))
+            with open(profile + '.folded', encoding='utf-8') as f:
+                self.assertIn('run_cipher', f.read())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import io
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import unittest
+from ciphers import InvalidTextError, get_cipher
+from ciphers.parallel import _align, parallel_transform, parallel_transform_file, split_points
+from ciphers.textform import ascii_letter_count
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def make_document(words, seed=1):
+    rng = random.Random(seed)
+    pieces = [b'Hello', b'World', b'the', b'balloon', b'x', b'!!', b'12', b'\n', b'\xc3\xa9t\xc3\xa9', b'AAA']
+    return b' '.join(rng.choice(pieces) for _ in range(words))
+
+class TestParallelTransform(unittest.TestCase):
+    KEYS = [('caesar', '3'), ('vigenere', 'lemon'), ('substitution', 'QWERTYUIOPASDFGHJKLZXCVBNM'),
+            ('hill', 'DDCF'), ('hill', 'GYBNQKURP'), ('playfair', 'keyword')]
+    DOCUMENT = make_document(20000)
+
+    def serial(self, compiled, mode, data):
+        try:
+            return compiled.encrypt(data) if mode == 'encrypt' else compiled.decrypt(data)
+        except InvalidTextError:
+            return InvalidTextError
+
+    def parallel(self, compiled, mode, data):
+        try:
+            return parallel_transform(compiled, mode, data, workers=3, min_segment=1000)
+        except InvalidTextError:
+            return InvalidTextError
+
+    def test_matches_serial(self):
+        for name, key in self.KEYS:
+            compiled = get_cipher(name).compile(key)
+            for mode in ('encrypt', 'decrypt'):
+                for data in (self.DOCUMENT, self.DOCUMENT[:-3], b'', b'abc'):
+                    with self.subTest(cipher=name, key=key, mode=mode, size=len(data)):
+                        self.assertEqual(self.parallel(compiled, mode, data), self.serial(compiled, mode, data))
+
+    def test_cuts_land_on_block_boundaries(self):
+        # The cuts fall in long runs without letters; moving them to a 9-letter
+        # boundary passes the later cuts and the end of the document.
+        data = b'ab' + b'.' * 3000 + b'c' + b'.' * 3000 + b'defgh'
+        compiled = get_cipher('hill').compile('GYBNQKURP')
+        self.assertEqual(parallel_transform(compiled, 'encrypt', data, workers=4, min_segment=1000),
+                         compiled.encrypt(data))
+
+    def test_aligned_segments_keep_their_size(self):
+        data = make_document(40000, seed=2)
+        cuts = split_points(len(data), 8, min_segment=1000)
+        before = [ascii_letter_count(data[:cut]) for cut in cuts]
+        for block in (2, 3):
+            aligned, aligned_before = _align(data, cuts, before, block)
+            self.assertEqual(len(aligned), 9)
+            for cut, new_cut, letters in zip(cuts[1:-1], aligned[1:-1], aligned_before[1:-1]):
+                # A cut moves past fewer than block letters, so only a few bytes.
+                self.assertLess(new_cut - cut, 40)
+                self.assertEqual(letters % block, 0)
+                self.assertEqual(letters, ascii_letter_count(data[:new_cut]))
+
+    def test_split_points(self):
+        self.assertEqual(split_points(10, 4, min_segment=3), [0, 3, 6, 10])
+        self.assertEqual(split_points(10, 4, min_segment=100), [0, 10])
+
+    def test_file(self):
+        compiled = get_cipher('vigenere').compile('lemon')
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'doc.txt')
+            with open(path, 'wb') as f:
+                f.write(self.DOCUMENT)
+            sink = io.BytesIO()
+            written = parallel_transform_file(compiled, 'encrypt', path, sink, workers=2, min_segment=1000)
+            self.assertEqual(sink.getvalue(), compiled.encrypt(self.DOCUMENT))
+            self.assertEqual(written, len(self.DOCUMENT))
+
+    def test_cli_document(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'doc.txt')
+            with open(path, 'wb') as f:
+                f.write(b'Attack at dawn!\nMeet me at the old bridge.\n')
+            result = subprocess.run([sys.executable, 'cli.py', 'vigenere', 'encrypt', 'lemon', '--input-file', path,
+                                     '--document', '--jobs', '2'], cwd=ROOT, capture_output=True, check=True)
+            self.assertEqual(result.stdout, b'Lxfopv ef rnhr!\nYsre qq og elq cyo fdwqri.\n')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 from ciphers.playfair import PlayfairCipher
-from ciphers import InvalidKeyError
+from ciphers import InvalidKeyError, InvalidTextError
 
 class TestPlayfairCipher(unittest.TestCase):
     def setUp(self):
@@ -24,5 +24,25 @@ class TestPlayfairCipher(unittest.TestCase):
         self.assertEqual(self.cipher.encrypt('', 'keyword'), '')
         self.assertEqual(self.cipher.decrypt('', 'keyword'), '')
 
+    def test_process_text(self):
+        self.assertEqual(self.cipher._process_text('balloon'), 'BALXLOON')
+        self.assertEqual(self.cipher._process_text('aaa'), 'AXAXAX')
+        self.assertEqual(self.cipher._process_text('abba x'), 'ABBAXX')
+        self.assertEqual(self.cipher._process_text('ab bb'), 'ABBXBX')
+
+    def test_j_shares_cell_with_i(self):
+        self.assertEqual(self.cipher.encrypt('jump', 'keyword'), self.cipher.encrypt('iump', 'keyword'))
+
+    def test_odd_ciphertext(self):
+        with self.assertRaises(InvalidTextError):
+            self.cipher.decrypt('ABC', 'keyword')
+
+    def test_round_trip_long_text(self):
+        text = 'THEQUICKBROWNFOXJUMPSOVERTHELAZYDOG' * 1000
+        encrypted = self.cipher.encrypt(text, 'playfair')
+        self.assertEqual(len(encrypted) % 2, 0)
+        decrypted = self.cipher.decrypt(encrypted, 'playfair')
+        self.assertEqual(decrypted.replace('X', ''), text.replace('J', 'I').replace('X', ''))
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+import unittest
+from ciphers import get_cipher, available_ciphers
+from ciphers.caesar import CaesarCipher
+from ciphers.registry import CipherRegistry
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class Rot13:
+    def encrypt(self, text, key):
+        return get_cipher('caesar').encrypt(text, '13')
+
+class TestCipherRegistry(unittest.TestCase):
+    def test_builtin_lookup(self):
+        self.assertEqual(available_ciphers()[:5], ['caesar', 'vigenere', 'playfair', 'substitution', 'hill'])
+        self.assertIsInstance(get_cipher('caesar'), CaesarCipher)
+        self.assertIs(get_cipher('caesar'), get_cipher('caesar'))
+
+    def test_unknown_name(self):
+        registry = CipherRegistry(group=None)
+        self.assertNotIn('rot13', registry)
+        with self.assertRaises(KeyError):
+            registry['rot13']
+
+    def test_register(self):
+        registry = CipherRegistry({'caesar': 'ciphers.caesar:CaesarCipher'}, group=None)
+        registry.register('rot13', Rot13)
+        self.assertEqual(list(registry), ['caesar', 'rot13'])
+        self.assertEqual(registry.loaded(), [])
+        self.assertEqual(registry['rot13'].encrypt('Hello', None), 'Uryyb')
+        self.assertEqual(registry.loaded(), ['rot13'])
+
+    def test_lookup_imports_only_its_module(self):
+        code = ("import sys, cli; assert 'numpy' not in sys.modules; "
+                "cli.CIPHERS['caesar'].encrypt('a', '1'); assert 'numpy' not in sys.modules; "
+                "cli.CIPHERS['hill']; assert 'numpy' in sys.modules")
+        subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import stat
+import tempfile
+import unittest
+import sqlite3
+from ciphers.resultcache import ENTRY_OVERHEAD, ResultCache, text_digest
+import cli
+
+class TestResultCache(unittest.TestCase):
+    def test_memory_hits_and_types(self):
+        cache = ResultCache()
+        self.assertIsNone(cache.get('caesar', 'encrypt', '3', 'abc'))
+        cache.put('caesar', 'encrypt', '3', 'abc', 'def')
+        cache.put('caesar', 'encrypt', '3', b'abc', b'def')
+        self.assertEqual(cache.get('caesar', 'encrypt', '3', 'abc'), 'def')
+        self.assertEqual(cache.get('caesar', 'encrypt', '3', b'abc'), b'def')
+        self.assertIsNone(cache.get('caesar', 'decrypt', '3', 'abc'))
+        self.assertIsNone(cache.get('caesar', 'encrypt', '4', 'abc'))
+        self.assertEqual(cache.info()[:3], (2, 0, 3))
+        self.assertIn('40.0% hit rate', cache.summary())
+
+    def test_evicts_by_bytes(self):
+        cache = ResultCache(max_bytes=2 * (ENTRY_OVERHEAD + 10))
+        for text in ('a', 'b', 'c'):
+            cache.put('caesar', 'encrypt', '3', text, text * 10)
+        cache.get('caesar', 'encrypt', '3', 'b')
+        cache.put('caesar', 'encrypt', '3', 'd', 'd' * 10)
+        self.assertIsNone(cache.get('caesar', 'encrypt', '3', 'a'))
+        self.assertIsNone(cache.get('caesar', 'encrypt', '3', 'c'))
+        self.assertEqual(cache.get('caesar', 'encrypt', '3', 'b'), 'b' * 10)
+        self.assertEqual(cache.info().bytes, 2 * (ENTRY_OVERHEAD + 10))
+        cache.put('caesar', 'encrypt', '3', 'big', 'x' * 1000)
+        self.assertIsNone(cache.get('caesar', 'encrypt', '3', 'big'))
+
+    def test_disk_tier_persists_without_keys(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'results.sqlite')
+            with ResultCache(path=path) as cache:
+                cache.put('vigenere', 'encrypt', 'secretkeyword', 'attack', 'lxfopv')
+            with ResultCache(path=path) as cache:
+                self.assertEqual(cache.get('vigenere', 'encrypt', 'secretkeyword', 'attack'), 'lxfopv')
+                self.assertEqual(cache.info().disk_hits, 1)
+            with open(path, 'rb') as f:
+                self.assertNotIn(b'secretkeyword', f.read())
+            with ResultCache(max_bytes=0, path=path) as cache:
+                cache.put('vigenere', 'encrypt', 'secretkeyword', 'attack at dawn', 'lxfopv ef rnhr')
+                self.assertEqual(cache.get('vigenere', 'encrypt', 'secretkeyword', 'attack at dawn'), 'lxfopv ef rnhr')
+                # Served from the results waiting to be written, not from disk.
+                self.assertEqual(cache.info()[:2], (1, 0))
+                self.assertNotIn('secretkeyword', repr(vars(cache)))
+            self.assertEqual(stat.S_IMODE(os.stat(path + '.secret').st_mode), 0o600)
+            self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o600)
+            # Text digests are keyed, so a guessed input cannot be checked against the file.
+            db = sqlite3.connect(path)
+            stored = {row[0] for row in db.execute('SELECT text_digest FROM results')}
+            db.close()
+            self.assertNotIn(text_digest('attack'), stored)
+            # Another secret gives other fingerprints, so nothing matches.
+            with ResultCache(path=path, secret=b'other') as cache:
+                self.assertIsNone(cache.get('vigenere', 'encrypt', 'secretkeyword', 'attack'))
+
+class TestCliCache(unittest.TestCase):
+    TEXTS = ['Hello there', 'Attack', 'Hello there', '', 'Hello there']
+
+    def test_serial_and_parallel_match_uncached(self):
+        cipher = cli.CIPHERS['vigenere']
+        expected = list(cli.process_texts(cipher, 'encrypt', self.TEXTS, 'lemon', False))
+        cache = ResultCache()
+        self.assertEqual(list(cli.process_texts(cipher, 'encrypt', self.TEXTS, 'lemon', False, cache)), expected)
+        self.assertEqual(cache.info()[:3], (2, 0, 2))
+        cache = ResultCache()
+        parallel = cli.process_texts_parallel('vigenere', 'encrypt', self.TEXTS * 10, 'lemon', False, jobs=2,
+                                              chunk_size=4, cache=cache)
+        self.assertEqual(list(parallel), expected * 10)
+        self.assertGreater(cache.info().hits, 0)
+
+    def test_errors_are_not_cached(self):
+        cache = ResultCache()
+        results = list(cli.process_texts(cli.CIPHERS['caesar'], 'encrypt', ['abc', 'abc'], 'x', False, cache))
+        self.assertEqual([output for _, output, _ in results], [None, None])
+        self.assertEqual(cache.info().entries, 0)
+
+if __name__ == '__main__':
+    unittest.main()
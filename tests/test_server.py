@@ -0,0 +1,87 @@
+import asyncio
+import json
+import unittest
+from benchmarks.loadgen import run_load
+from server import MAX_TOP, CipherServer
+
+class TestCipherServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = CipherServer(jobs=0, batch_delay=0.01)
+        listener = await self.server.start('127.0.0.1', 0)
+        self.port = listener.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        await self.server.close(timeout=5)
+
+    async def request_all(self, requests):
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+        for request in requests:
+            writer.write((request if isinstance(request, str) else json.dumps(request)).encode('utf-8') + b'\n')
+        await writer.drain()
+        responses = [json.loads(await reader.readline()) for _ in requests]
+        writer.close()
+        await writer.wait_closed()
+        return responses
+
+    async def test_encrypt_and_decrypt(self):
+        responses = await self.request_all([
+            {'id': 1, 'cipher': 'caesar', 'mode': 'encrypt', 'key': '3', 'text': 'Hello'},
+            {'id': 2, 'cipher': 'caesar', 'mode': 'decrypt', 'key': 3, 'text': 'Khoor'},
+            {'id': 3, 'cipher': 'vigenere', 'mode': 'encrypt', 'key': 'lemon', 'text': 'attackatdawn'},
+        ])
+        by_id = {r['id']: r for r in responses}
+        self.assertEqual(by_id[1], {'id': 1, 'output': 'Khoor'})
+        self.assertEqual(by_id[2], {'id': 2, 'output': 'Hello'})
+        self.assertEqual(by_id[3], {'id': 3, 'output': 'lxfopvefrnhr'})
+
+    async def test_errors(self):
+        responses = await self.request_all([
+            'not json',
+            {'id': 1, 'cipher': 'rot13', 'mode': 'encrypt', 'key': '3', 'text': 'x'},
+            {'id': 2, 'cipher': 'hill', 'mode': 'encrypt', 'key': 'AAAA', 'text': 'x'},
+            {'id': 3, 'cipher': 'caesar', 'mode': 'reverse', 'key': '3', 'text': 'x'},
+            {'id': 4, 'cipher': 'caesar', 'mode': 'encrypt', 'key': '3', 'text': 'ok'},
+        ])
+        by_id = {r.get('id'): r for r in responses}
+        self.assertIn('error', by_id[None])
+        for request_id in (1, 2, 3):
+            self.assertIn('error', by_id[request_id])
+        self.assertEqual(by_id[4]['output'], 'rn')
+
+    async def test_same_key_is_batched(self):
+        requests = [{'id': i, 'cipher': 'vigenere', 'mode': 'encrypt', 'key': 'lemon', 'text': 'attack'}
+                    for i in range(20)]
+        responses = await self.request_all(requests)
+        self.assertEqual({r['output'] for r in responses}, {'lxfopv'})
+        [stats] = await self.request_all([{'mode': 'stats'}])
+        self.assertEqual(stats['stats']['requests'], 21)
+        self.assertLess(stats['stats']['batches'], 20)
+
+    async def test_crack(self):
+        ciphertext = 'Wkh txlfn eurzq ira mxpsv ryhu wkh odcb grj'
+        [response] = await self.request_all([{'id': 1, 'cipher': 'caesar', 'mode': 'crack', 'text': ciphertext,
+                                              'top': 2}])
+        self.assertEqual(len(response['candidates']), 2)
+        self.assertEqual(response['candidates'][0]['key'], '3')
+        self.assertEqual(response['candidates'][0]['output'], 'The quick brown fox jumps over the lazy dog')
+
+    async def test_crack_limits(self):
+        ciphertext = 'Wkh txlfn eurzq ira mxpsv ryhu wkh odcb grj'
+        responses = await self.request_all([
+            {'id': 1, 'cipher': 'caesar', 'mode': 'crack', 'text': ciphertext, 'top': 10 ** 9},
+            {'id': 2, 'cipher': 'playfair', 'mode': 'crack', 'text': 'ABCD', 'restarts': 'many'},
+            {'id': 3, 'cipher': 'playfair', 'mode': 'crack', 'text': 'ABC'},
+        ])
+        by_id = {r['id']: r for r in responses}
+        self.assertEqual(len(by_id[1]['candidates']), MAX_TOP)
+        self.assertIn('restarts', by_id[2]['error'])
+        self.assertIn('even number', by_id[3]['error'])
+
+    async def test_load_generator(self):
+        result = await run_load(lambda: asyncio.open_connection('127.0.0.1', self.port),
+                                requests=200, connections=2, pipeline=8, keys=5)
+        self.assertEqual(result['requests'], 200)
+        self.assertEqual(result['errors'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
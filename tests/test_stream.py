@@ -0,0 +1,74 @@
+import io
+import random
+import unittest
+from ciphers.caesar import CaesarCipher
+from ciphers.hill import HillCipher
+from ciphers.playfair import PlayfairCipher
+from ciphers.substitution import SubstitutionCipher
+from ciphers.vigenere import VigenereCipher
+from ciphers import InvalidTextError
+
+def random_chunks(text, rng, max_size=7):
+    pos = 0
+    while pos < len(text):
+        size = rng.randint(1, max_size)
+        yield text[pos:pos + size]
+        pos += size
+
+class TestStreaming(unittest.TestCase):
+    CASES = [
+        (CaesarCipher(), '3'),
+        (VigenereCipher(), 'lemon'),
+        (PlayfairCipher(), 'keyword'),
+        (SubstitutionCipher(), 'QWERTYUIOPASDFGHJKLZXCVBNM'),
+        (HillCipher(), 'GYBNQKURP'),
+    ]
+    TEXT = 'Hello, World! Balloons ll aa x.\nThe quick brown fox jumps over the lazy dog; EE ee. ' * 3
+
+    def test_matches_one_shot_for_random_chunking(self):
+        rng = random.Random(42)
+        for cipher, key in self.CASES:
+            expected = cipher.encrypt(self.TEXT, key)
+            for _ in range(20):
+                sink = io.StringIO()
+                cipher.encrypt_stream(random_chunks(self.TEXT, rng), sink, key)
+                self.assertEqual(sink.getvalue(), expected, type(cipher).__name__)
+
+    def test_decrypt_stream(self):
+        rng = random.Random(7)
+        for cipher, key in self.CASES:
+            ciphertext = cipher.encrypt(self.TEXT, key)
+            expected = cipher.decrypt(ciphertext, key)
+            sink = io.StringIO()
+            cipher.decrypt_stream(random_chunks(ciphertext, rng), sink, key)
+            self.assertEqual(sink.getvalue(), expected, type(cipher).__name__)
+
+    def test_file_like_source(self):
+        for cipher, key in self.CASES:
+            sink = io.StringIO()
+            written = cipher.encrypt_stream(io.StringIO(self.TEXT), sink, key, chunk_size=5)
+            self.assertEqual(sink.getvalue(), cipher.encrypt(self.TEXT, key))
+            self.assertEqual(written, len(sink.getvalue()))
+
+    def test_playfair_double_letter_across_chunks(self):
+        cipher = PlayfairCipher()
+        sink = io.StringIO()
+        cipher.encrypt_stream(['BAL', 'LOO', 'N'], sink, 'playfair')
+        self.assertEqual(sink.getvalue(), cipher.encrypt('BALLOON', 'playfair'))
+
+    def test_playfair_odd_ciphertext_stream(self):
+        with self.assertRaises(InvalidTextError):
+            PlayfairCipher().decrypt_stream(['AB', 'C'], io.StringIO(), 'keyword')
+
+    def test_empty_stream(self):
+        for cipher, key in self.CASES:
+            sink = io.StringIO()
+            self.assertEqual(cipher.encrypt_stream([], sink, key), 0)
+            self.assertEqual(sink.getvalue(), '')
+
+    def test_compiled_key_iterator(self):
+        key = VigenereCipher().compile('key')
+        self.assertEqual(''.join(key.iter_encrypt(['Hel', 'lo, ', 'World!'])), 'Rijvs, Uyvjn!')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -27,5 +27,12 @@ class TestSubstitutionCipher(unittest.TestCase):
         self.assertEqual(self.cipher.encrypt('', self.key), '')
         self.assertEqual(self.cipher.decrypt('', self.key), '')
 
+    def test_punctuation_and_case(self):
+        self.assertEqual(self.cipher.encrypt('Hello, World!', self.key), 'Itssg, Vgksr!')
+        self.assertEqual(self.cipher.decrypt('Itssg, Vgksr!', self.key), 'Hello, World!')
+
+    def test_lowercase_key(self):
+        self.assertEqual(self.cipher.encrypt('Hello', self.key.lower()), 'Itssg')
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,61 @@
+import unittest
+import numpy as np
+from ciphers import InvalidTextError, NormalizedText, get_cipher
+from ciphers.analysis.caesar import crack_caesar
+from ciphers.analysis.vigenere import crack_vigenere
+
+class TestNormalizedText(unittest.TestCase):
+    KEYS = [('caesar', '3'), ('vigenere', 'lemon'), ('substitution', 'QWERTYUIOPASDFGHJKLZXCVBNM'),
+            ('hill', 'DDCF'), ('playfair', 'keyword')]
+    TEXTS = ['Hello, World!  The 12 balloons jump.\n' * 5, 'abc', '', '?!', b'Bytes too: \xff\x00ok']
+
+    def test_parts(self):
+        text = NormalizedText('Hi, yoU!')
+        self.assertEqual(text.letters.tolist(), [7, 8, 24, 14, 20])
+        self.assertEqual(text.upper().tolist(), [True, False, False, False, True])
+        self.assertEqual(text.gaps.tolist(), [[2, 4], [7, 8]])
+        self.assertEqual(text.letter_mask().tolist(), [True, True, False, False, True, True, True, False])
+        self.assertEqual((len(text), text.text), (8, 'Hi, yoU!'))
+
+    def test_restore(self):
+        for source in self.TEXTS:
+            text = NormalizedText(source)
+            self.assertEqual(text.restore(text.letters), source)
+        text = NormalizedText('Ab-c')
+        self.assertEqual(text.restore(np.array([25, 0, 1], dtype=np.uint8)), 'Za-b')
+        with self.assertRaises(ValueError):
+            text.restore(np.zeros(2, dtype=np.uint8))
+
+    def test_ciphers_match_plain_text(self):
+        for source in self.TEXTS:
+            text = NormalizedText(source)
+            for name, key in self.KEYS:
+                compiled = get_cipher(name).compile(key)
+                try:
+                    expected = compiled.encrypt(source)
+                except InvalidTextError:
+                    self.assertRaises(InvalidTextError, compiled.encrypt, text)
+                    continue
+                self.assertEqual(compiled.encrypt(text), expected)
+                self.assertEqual(compiled.decrypt(NormalizedText(expected)), compiled.decrypt(expected))
+
+    def test_encrypt_many(self):
+        text = NormalizedText(self.TEXTS[0])
+        for name, key in self.KEYS:
+            cipher = get_cipher(name)
+            self.assertEqual(cipher.encrypt_many(text, [key]), cipher.encrypt_many(self.TEXTS[0], [key]))
+
+    def test_cracking_tools(self):
+        plaintext = 'The quick brown fox jumps over the lazy dog and keeps running far away'
+        ciphertext = get_cipher('caesar').encrypt(plaintext, '7')
+        [[best, *_]] = crack_caesar([NormalizedText(ciphertext)])
+        self.assertEqual((best.key, best.plaintext), ('7', plaintext))
+        ciphertext = get_cipher('vigenere').encrypt(plaintext * 4, 'key')
+        self.assertEqual(crack_vigenere(NormalizedText(ciphertext)), crack_vigenere(ciphertext))
+
+    def test_non_ascii_str_is_rejected(self):
+        with self.assertRaises(ValueError):
+            NormalizedText('Café')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -30,5 +30,23 @@ class TestVigenereCipher(unittest.TestCase):
         self.assertEqual(self.cipher.encrypt('', 'abc'), '')
         self.assertEqual(self.cipher.decrypt('', 'abc'), '')
 
+    def test_key_skips_non_letters(self):
+        self.assertEqual(self.cipher.encrypt('a-b c!!d', 'bcd'), 'b-d f!!e')
+        self.assertEqual(self.cipher.encrypt('123 ...', 'key'), '123 ...')
+
+    def test_non_ascii_text(self):
+        # Non-ASCII letters consume the key and use code-point arithmetic.
+        self.assertEqual(self.cipher.encrypt('Émile, ça va', 'key'), 'Qqgvi, ck zy')
+
+    def test_long_key(self):
+        self.assertEqual(self.cipher.encrypt('Hello, World!', 'b' * 100), 'Ifmmp, Xpsme!')
+        self.assertEqual(self.cipher.decrypt('Ifmmp, Xpsme!', 'b' * 100), 'Hello, World!')
+
+    def test_long_text_round_trip(self):
+        text = 'Attack at dawn; retreat at dusk. ' * 50000
+        encrypted = self.cipher.encrypt(text, 'LEMON')
+        self.assertEqual(encrypted[:33], 'Lxfopv ef rnhr; dsgcimh ne hggx. ')
+        self.assertEqual(self.cipher.decrypt(encrypted, 'LEMON'), text)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file